@@ -4,10 +4,12 @@ Advanced collision detection for various shape types including circles, polygons
 """
 
 import math
+import numpy as np
 import pygame
 from typing import List, Optional, Tuple, Dict
 from vector2d import Vector2D
-from physics_body import PhysicsBody
+from physics_body import PhysicsBody, gather_aabbs
+from numba_support import NUMBA_AVAILABLE, njit
 
 
 class CollisionManifold:
@@ -86,7 +88,7 @@ class CollisionDetector:
         Circle-circle collision detection
         """
         distance_vec = body_b.position - body_a.position
-        distance = distance_vec.magnitude
+        distance = distance_vec.magnitude()
         radius_sum = body_a.radius + body_b.radius
         
         if distance < radius_sum and distance > 0:
@@ -288,9 +290,9 @@ class CollisionDetector:
             manifold.contact_points = [collision_point]
             
             # Calculate normal (simplified - use direction between centers)
-            direction = body_b.position - body_a.position
-            if direction.magnitude > 0:
-                manifold.normal = direction.normalize()
+            distance, direction = (body_b.position - body_a.position).magnitude_and_direction()
+            if distance > 0:
+                manifold.normal = direction
             else:
                 manifold.normal = Vector2D(1, 0)
             
@@ -319,6 +321,67 @@ class CollisionDetector:
             del self.pixel_surfaces[id(body)]
 
 
+# Multipliers for hashing a cell's (x, y) into a bucket. Cells that land in
+# the same bucket are told apart by the coordinates stored with each entry.
+_CELL_HASH_PRIME_X = 73856093
+_CELL_HASH_PRIME_Y = 19349663
+
+
+@njit(cache=True)
+def _fill_cell_lists(min_cx, min_cy, max_cx, max_cy, head, next_entry,
+                     entry_body, entry_cx, entry_cy):
+    """Push one entry per (body, covered cell) onto its bucket's linked list"""
+    mask = head.shape[0] - 1
+    head[:] = -1
+    e = 0
+    for b in range(min_cx.shape[0]):
+        for cx in range(min_cx[b], max_cx[b] + 1):
+            for cy in range(min_cy[b], max_cy[b] + 1):
+                bucket = ((cx * _CELL_HASH_PRIME_X) ^ (cy * _CELL_HASH_PRIME_Y)) & mask
+                entry_body[e] = b
+                entry_cx[e] = cx
+                entry_cy[e] = cy
+                next_entry[e] = head[bucket]
+                head[bucket] = e
+                e += 1
+
+
+@njit(cache=True)
+def _cell_list_pairs(head, next_entry, entry_body, entry_cx, entry_cy,
+                     min_cx, min_cy, movable, pairs):
+    """
+    Write every pair of bodies sharing a cell into pairs, lower index first
+    
+    Returns the number of pairs found; if that exceeds the capacity of pairs,
+    only the first pairs were written.
+    """
+    capacity = pairs.shape[0]
+    count = 0
+    for bucket in range(head.shape[0]):
+        e = head[bucket]
+        while e != -1:
+            cx = entry_cx[e]
+            cy = entry_cy[e]
+            f = next_entry[e]
+            while f != -1:
+                if entry_cx[f] == cx and entry_cy[f] == cy:
+                    a = entry_body[e]
+                    b = entry_body[f]
+                    if a > b:
+                        a, b = b, a
+                    # Bodies sharing several cells are reported only from the
+                    # first cell of their overlap
+                    if (movable[a] or movable[b]) and \
+                            cx == max(min_cx[a], min_cx[b]) and cy == max(min_cy[a], min_cy[b]):
+                        if count < capacity:
+                            pairs[count, 0] = a
+                            pairs[count, 1] = b
+                        count += 1
+                f = next_entry[f]
+            e = next_entry[e]
+    return count
+
+
 class SpatialHash:
     """
     Spatial partitioning for efficient broad-phase collision detection
@@ -328,6 +391,15 @@ class SpatialHash:
         self.cell_size = cell_size
         self.grid = {}
         self.bodies = set()
+        
+        # Compiled path storage: per-bucket linked lists of (body, cell)
+        # entries, kept between frames and grown only when outgrown
+        self.head = np.empty(0, dtype=np.int32)
+        self.next = np.empty(0, dtype=np.int32)
+        self.entry_body = np.empty(0, dtype=np.int32)
+        self.entry_cx = np.empty(0, dtype=np.int64)
+        self.entry_cy = np.empty(0, dtype=np.int64)
+        self.pairs = np.empty((0, 2), dtype=np.int32)
     
     def clear(self) -> None:
         """Clear the spatial hash"""
@@ -337,6 +409,9 @@ class SpatialHash:
     def insert(self, body: PhysicsBody) -> None:
         """Insert a body into the spatial hash"""
         self.bodies.add(body)
+        if NUMBA_AVAILABLE:
+            # Cells are assigned in one compiled pass when pairs are requested
+            return
         
         min_pos, max_pos = body.get_aabb()
         
@@ -359,6 +434,12 @@ class SpatialHash:
         Returns:
             List of body pairs that might be colliding
         """
+        if NUMBA_AVAILABLE:
+            bodies = np.empty(len(self.bodies), dtype=object)
+            bodies[:] = list(self.bodies)
+            pairs = self.get_pair_indices(bodies)
+            return list(zip(bodies[pairs[:, 0]].tolist(), bodies[pairs[:, 1]].tolist()))
+        
         potential_pairs = set()
         
         for cell_bodies in self.grid.values():
@@ -367,11 +448,62 @@ class SpatialHash:
                 for i in range(len(bodies_list)):
                     for j in range(i + 1, len(bodies_list)):
                         body_a, body_b = bodies_list[i], bodies_list[j]
+                        # Bodies sharing several cells may come out in either
+                        # order, so key each pair consistently to dedupe it
+                        if id(body_a) > id(body_b):
+                            body_a, body_b = body_b, body_a
                         if not (body_a.is_static and body_b.is_static):
                             potential_pairs.add((body_a, body_b))
         
         return list(potential_pairs)
     
+    def get_cell_ranges(self, bodies: List[PhysicsBody]) -> Tuple[np.ndarray, ...]:
+        """
+        Get the range of grid cells each body's bounding box covers
+        
+        Returns:
+            Arrays of min cell x, min cell y, max cell x and max cell y
+        """
+        min_x, min_y, max_x, max_y = gather_aabbs(bodies)
+        
+        # floor_divide floors like the // used for single bodies
+        cell_size = self.cell_size
+        return (np.floor_divide(min_x, cell_size).astype(np.int64),
+                np.floor_divide(min_y, cell_size).astype(np.int64),
+                np.floor_divide(max_x, cell_size).astype(np.int64),
+                np.floor_divide(max_y, cell_size).astype(np.int64))
+    
+    def get_pair_indices(self, bodies: List[PhysicsBody]) -> np.ndarray:
+        """
+        Get index pairs of bodies sharing a cell using the compiled storage
+        
+        Returns:
+            Array of shape (pairs, 2), lower index first. It is a view of a
+            reused buffer, valid until the next call.
+        """
+        min_cx, min_cy, max_cx, max_cy = self.get_cell_ranges(bodies)
+        entry_count = int(((max_cx - min_cx + 1) * (max_cy - min_cy + 1)).sum())
+        
+        # Keep the table at most half full, sized to a power of two for masking
+        bucket_count = 1 << max(4, (2 * entry_count - 1).bit_length())
+        if len(self.head) < bucket_count:
+            self.head = np.empty(bucket_count, dtype=np.int32)
+        if len(self.next) < entry_count:
+            self.next = np.empty(2 * entry_count, dtype=np.int32)
+            self.entry_body = np.empty(2 * entry_count, dtype=np.int32)
+            self.entry_cx = np.empty(2 * entry_count, dtype=np.int64)
+            self.entry_cy = np.empty(2 * entry_count, dtype=np.int64)
+        
+        _fill_cell_lists(min_cx, min_cy, max_cx, max_cy, self.head, self.next,
+                         self.entry_body, self.entry_cx, self.entry_cy)
+        movable = np.array([not body.is_static for body in bodies])
+        while True:
+            count = _cell_list_pairs(self.head, self.next, self.entry_body, self.entry_cx,
+                                     self.entry_cy, min_cx, min_cy, movable, self.pairs)
+            if count <= len(self.pairs):
+                return self.pairs[:count]
+            self.pairs = np.empty((2 * count, 2), dtype=np.int32)
+    
     def rebuild(self, bodies: List[PhysicsBody]) -> None:
         """Rebuild the spatial hash with new body positions"""
         self.clear()
@@ -164,7 +164,7 @@ class CollisionResolver:
         # Calculate tangent vector (perpendicular to normal)
         tangent = relative_velocity - normal * relative_velocity.dot(normal)
         
-        if tangent.magnitude_squared < 1e-6:
+        if tangent.magnitude_squared() < 1e-6:
             return  # No relative tangential motion
         
         tangent = tangent.normalize()
@@ -270,13 +270,11 @@ class DistanceJoint(Joint):
         
         # Calculate current distance and direction
         diff = self.body_b.position - self.body_a.position
-        current_distance = diff.magnitude
+        current_distance, direction = diff.magnitude_and_direction()
         
         if current_distance < 1e-6:
             return
         
-        direction = diff.normalize()
-        
         # Calculate constraint violation
         violation = current_distance - self.rest_distance
         
@@ -323,13 +321,11 @@ class SpringJoint(Joint):
         
         # Calculate spring vector
         spring_vector = self.body_b.position - self.body_a.position
-        current_length = spring_vector.magnitude
+        current_length, direction = spring_vector.magnitude_and_direction()
         
         if current_length < 1e-6:
             return
         
-        direction = spring_vector.normalize()
-        
         # Hooke's law: F = -k * x
         extension = current_length - self.rest_length
         spring_force_magnitude = -self.spring_constant * extension
@@ -374,7 +370,7 @@ class RevoluteJoint(Joint):
         # Calculate constraint violation
         constraint_violation = world_anchor_b - world_anchor_a
         
-        if constraint_violation.magnitude_squared < 1e-6:
+        if constraint_violation.magnitude_squared() < 1e-6:
             return
         
         # Apply position correction
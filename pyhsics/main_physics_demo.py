@@ -145,7 +145,7 @@ class PhysicsDemo:
         self.vehicles.clear()
         self.fluid_system.particles.clear()
         self.orbital_system.bodies.clear()
-        self.projectile_system.projectiles.clear()
+        self.projectile_system.clear()
         self.platformer_world.platforms.clear()
         self.platformer_world.characters.clear()
         
@@ -370,7 +370,7 @@ class PhysicsDemo:
         
         for obstacle in obstacles:
             obstacle.color = (100, 100, 100)
-            self.projectile_system.obstacles.append(obstacle)
+            self.projectile_system.add_obstacle(obstacle)
         
         # Add gravity wells
         self.projectile_system.add_gravity_well(Vector2D(400, 300), 50000, 100)
@@ -550,9 +550,7 @@ class PhysicsDemo:
         
         # Integrate physics
         for body in self.physics_bodies:
-            body.integrate_forces(dt)
-            body.integrate_velocity(dt)
-            body.clear_forces()
+            body.integrate(dt)
         
         # Solve constraints
         self.constraint_solver.solve_constraints(dt)
@@ -756,9 +754,7 @@ class PhysicsDemo:
             sin_a = math.sin(vehicle.angle)
             world_corners = []
             for corner in corners:
-                rotated_x = corner.x * cos_a - corner.y * sin_a
-                rotated_y = corner.x * sin_a + corner.y * cos_a
-                world_corner = vehicle.position + Vector2D(rotated_x, rotated_y)
+                world_corner = vehicle.position + corner.rotate_precomputed(cos_a, sin_a)
                 world_corners.append(world_corner.to_int_tuple())
             
             pygame.draw.polygon(self.screen, vehicle.color, world_corners)
@@ -821,12 +817,14 @@ class PhysicsDemo:
         if len(trail_points) < 2:
             return
         
-        for i in range(len(trail_points) - 1):
-            start_pos = trail_points[i].to_int_tuple()
-            end_pos = trail_points[i + 1].to_int_tuple()
+        # Trails may be deques; convert them once instead of indexing into them
+        screen_points = [point.to_int_tuple() for point in trail_points]
+        for i in range(len(screen_points) - 1):
+            start_pos = screen_points[i]
+            end_pos = screen_points[i + 1]
             
             # Fade trail
-            trail_alpha = int(alpha * (i + 1) / len(trail_points))
+            trail_alpha = int(alpha * (i + 1) / len(screen_points))
             trail_color = (*color, trail_alpha)
             
             pygame.draw.line(self.screen, color, start_pos, end_pos, 2)
@@ -6,7 +6,11 @@ Advanced particle simulation with fluid behavior, viscosity, density, surface te
 import math
 import random
 from typing import List, Dict, Tuple
-from vector2d import Vector2D
+
+import numpy as np
+
+from vector2d import Vector2D, ZERO
+from vector2d_batch import Vector2DArray, VECTOR_DTYPE
 from physics_body import PhysicsBody
 
 
@@ -118,7 +122,7 @@ class FluidSystem:
     
     def add_boundary_particle(self, position: Vector2D) -> Particle:
         """Add a boundary particle (static)"""
-        particle = Particle(position, Vector2D.zero(), 1.0)
+        particle = Particle(position, ZERO, 1.0)
         particle.is_boundary = True
         self.boundary_particles.append(particle)
         return particle
@@ -133,38 +137,200 @@ class FluidSystem:
         self.solid_bodies.append(body)
     
     def update(self, dt: float) -> None:
-        """Update the fluid simulation"""
-        # Build spatial grid for neighbor search
-        self.build_spatial_grid()
-        
-        # Find neighbors for each particle
-        for particle in self.particles:
-            self.find_neighbors(particle)
-        
-        # Calculate density and pressure
-        for particle in self.particles:
-            self.calculate_density(particle)
-            self.calculate_pressure(particle)
+        """Update the fluid simulation on batched particle state"""
+        particles = self.particles
+        all_particles = particles + self.boundary_particles
+        count = len(particles)
+        if not all_particles:
+            return
         
-        # Calculate forces
-        for particle in self.particles:
-            self.calculate_forces(particle)
+        # Gather positions, velocities and masses into contiguous batches
+        positions = Vector2DArray.from_vectors(p.position for p in all_particles)
+        velocities = Vector2DArray.from_vectors(p.velocity for p in all_particles)
+        mass = np.fromiter((p.mass for p in all_particles), VECTOR_DTYPE, len(all_particles))
+        mobile = np.fromiter((p.is_active for p in particles), bool, count)
+        
+        # Neighbor pairs (i, j) within the smoothing radius
+        i, j, distance = self.find_neighbor_pairs(positions)
+        
+        # Density and pressure
+        density, pressure = self.calculate_densities(i, j, distance, mass)
+        
+        # Forces
+        forces = self.calculate_batch_forces(i, j, distance, positions, velocities,
+                                             mass, density, pressure, count)
+        
+        # Integrate fluid particles; boundary and inactive particles stay put
+        xs, ys = positions.xs[:count], positions.ys[:count]
+        vxs, vys = velocities.xs[:count], velocities.ys[:count]
+        for position, velocity, force in ((xs, vxs, forces.xs[:count]),
+                                          (ys, vys, forces.ys[:count])):
+            step = force / mass[:count]
+            step *= dt
+            step += velocity
+            step *= self.damping
+            np.copyto(velocity, step, where=mobile)
+            position += np.where(mobile, velocity * dt, 0.0)
+        
+        # Trails record the integrated positions, before boundary clamping
+        trail_xs = xs.tolist()
+        trail_ys = ys.tolist()
+        
+        # Handle boundaries
+        for position, velocity, low, high in ((xs, vxs, self.min_x, self.max_x),
+                                              (ys, vys, self.min_y, self.max_y)):
+            outside = (position < low) | (position > high)
+            np.clip(position, low, high, out=position)
+            velocity[outside] *= -self.bounds_damping
+        
+        # Handle collisions with solid bodies
+        self.handle_solid_body_batch(positions, velocities, forces, mass, density, count)
+        
+        # Color by speed (blue to white) and alpha by density
+        speed_factor = np.minimum(velocities.magnitude()[:count] / 200.0, 1.0)
+        red = (100 + 155 * speed_factor).astype(np.int64)
+        green = (150 + 105 * speed_factor).astype(np.int64)
+        alpha = (50 + 205 * np.minimum(density[:count] / self.rest_density, 1.0)).astype(np.int64)
+        
+        # Scatter the results back and finish the per-particle work
+        for index, (particle, x, y, vx, vy, fx, fy, rho, p, r, g, a) in enumerate(zip(
+                particles, xs.tolist(), ys.tolist(), vxs.tolist(), vys.tolist(),
+                forces.xs.tolist(), forces.ys.tolist(), density.tolist(), pressure.tolist(),
+                red.tolist(), green.tolist(), alpha.tolist())):
+            if mobile[index]:
+                particle.trail_points.append(Vector2D(trail_xs[index], trail_ys[index]))
+                if len(particle.trail_points) > particle.max_trail_length:
+                    particle.trail_points.pop(0)
+            
+            particle.position.set(x, y)
+            particle.velocity.set(vx, vy)
+            particle.force = Vector2D(fx, fy)
+            particle.density = rho
+            particle.pressure = p
+            
+            particle.life_time += dt
+            particle.color[0] = r
+            particle.color[1] = g
+            particle.color[2] = 255
+            particle.alpha = a
         
-        # Integrate
-        for particle in self.particles:
-            self.integrate_particle(particle, dt)
+        # Remove dead particles
+        self.particles = [p for p in self.particles if p.is_active and p.life_time < p.max_life_time]
+    
+    def find_neighbor_pairs(self, positions: Vector2DArray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find every ordered pair of particles within the smoothing radius
         
-        # Handle boundaries and collisions
-        for particle in self.particles:
-            self.handle_boundaries(particle)
-            self.handle_solid_body_collisions(particle)
+        Particles are sorted by grid cell, and each particle's 3x3 cell
+        neighbourhood is located with binary searches over the sorted keys.
+        """
+        # Cell coordinates, shifted so every neighbouring cell index is non-negative
+        cell_x = np.floor_divide(positions.xs, self.grid_size).astype(np.int64)
+        cell_y = np.floor_divide(positions.ys, self.grid_size).astype(np.int64)
+        cell_x -= cell_x.min() - 1
+        cell_y -= cell_y.min() - 1
+        stride = int(cell_y.max()) + 2
+        keys = cell_x * stride + cell_y
+        
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        owners = np.arange(len(keys))
+        
+        pair_i = []
+        pair_j = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                target = keys + (dx * stride + dy)
+                start = np.searchsorted(sorted_keys, target, side='left')
+                counts = np.searchsorted(sorted_keys, target, side='right') - start
+                
+                # Expand each particle's run of candidates in the target cell
+                total = int(counts.sum())
+                run_start = np.repeat(np.cumsum(counts) - counts, counts)
+                pair_i.append(np.repeat(owners, counts))
+                pair_j.append(order[np.repeat(start, counts) + np.arange(total) - run_start])
+        
+        i = np.concatenate(pair_i)
+        j = np.concatenate(pair_j)
+        
+        # Keep distinct pairs that fall inside the smoothing radius
+        dx = positions.xs[i] - positions.xs[j]
+        dy = positions.ys[i] - positions.ys[j]
+        distance_sq = dx * dx + dy * dy
+        keep = (i != j) & (distance_sq < self.smoothing_radius_sq)
+        
+        return i[keep], j[keep], np.sqrt(distance_sq[keep])
+    
+    def calculate_densities(self, i: np.ndarray, j: np.ndarray, distance: np.ndarray,
+                            mass: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate the density and pressure of every particle from its neighbor pairs"""
+        # Self contribution plus the poly6-weighted neighbor masses
+        density = mass * self.poly6_kernel(0.0)
+        density += np.bincount(i, weights=mass[j] * self.poly6_kernels(distance),
+                               minlength=len(mass))
         
-        # Update particle properties
-        for particle in self.particles:
-            self.update_particle_properties(particle, dt)
+        # Ideal gas state equation
+        pressure = self.gas_constant * (density - self.rest_density)
+        return density, pressure
+    
+    def calculate_batch_forces(self, i: np.ndarray, j: np.ndarray, distance: np.ndarray,
+                               positions: Vector2DArray, velocities: Vector2DArray,
+                               mass: np.ndarray, density: np.ndarray, pressure: np.ndarray,
+                               count: int) -> Vector2DArray:
+        """Calculate the total force on every particle from its neighbor pairs
+        
+        Indices below ``count`` are fluid particles; the rest are boundary
+        particles, which only feel the uniform forces.
+        """
+        total = len(mass)
+        h = self.smoothing_radius
         
-        # Remove dead particles
-        self.particles = [p for p in self.particles if p.is_active and p.life_time < p.max_life_time]
+        # Gravity, wind and external forces all scale with mass
+        uniform = self.gravity + self.wind_force
+        for ext_force in self.external_forces:
+            uniform += ext_force
+        forces = Vector2DArray.from_arrays(mass * uniform.x, mass * uniform.y)
+        
+        # Pair terms only act on fluid particles
+        fluid_i = i < count
+        i, j, distance = i[fluid_i], j[fluid_i], distance[fluid_i]
+        fluid_pair = j < count
+        
+        # Unit direction from neighbor to particle (zero for coincident pairs)
+        inv_distance = np.zeros_like(distance)
+        np.divide(1.0, distance, out=inv_distance, where=distance > 0)
+        offsets = Vector2DArray.from_arrays(positions.xs[i] - positions.xs[j],
+                                            positions.ys[i] - positions.ys[j])
+        directions = offsets.mul(inv_distance, out=offsets)
+        
+        # Neighbor volume m_j / rho_j weights every pair term
+        volume = mass[j] / density[j]
+        inside = distance < h
+        
+        # Symmetric pressure (spiky gradient) and viscosity (laplacian), fluid neighbors only
+        pressure_scale = (mass[j] * (pressure[i] + pressure[j]) / (2.0 * density[j]) *
+                          np.where(inside, self.spiky_constant * (h - distance) ** 2, 0.0))
+        viscosity_scale = (self.viscosity * volume *
+                           np.where(inside, self.viscosity_constant * (h - distance), 0.0))
+        pressure_scale *= fluid_pair
+        viscosity_scale *= fluid_pair
+        velocity_diff = Vector2DArray.from_arrays(velocities.xs[j] - velocities.xs[i],
+                                                  velocities.ys[j] - velocities.ys[i])
+        pair_forces = directions.mul(pressure_scale).add(velocity_diff.mul(viscosity_scale))
+        
+        # Surface tension along the normalized color field gradient
+        diff = np.where(inside, self.smoothing_radius_sq - distance * distance, 0.0)
+        gradient = volume * self.poly6_constant * 3.0 * diff ** 2 * (-2.0 * distance)
+        color_field = Vector2DArray.from_arrays(
+            np.bincount(i, weights=directions.xs * gradient, minlength=total),
+            np.bincount(i, weights=directions.ys * gradient, minlength=total))
+        curvature = np.bincount(
+            i, weights=volume * self.poly6_constant * 6.0 * diff * (3.0 * distance * distance - diff),
+            minlength=total)
+        surface_tension = color_field.normalize(out=color_field).mul(-self.surface_tension * curvature)
+        
+        forces.xs += np.bincount(i, weights=pair_forces.xs, minlength=total) + surface_tension.xs
+        forces.ys += np.bincount(i, weights=pair_forces.ys, minlength=total) + surface_tension.ys
+        return forces
     
     def build_spatial_grid(self) -> None:
         """Build spatial grid for efficient neighbor search"""
@@ -250,7 +416,7 @@ class FluidSystem:
         for i, neighbor in enumerate(particle.neighbors):
             if neighbor.is_boundary:
                 continue
-                
+            
             distance = particle.neighbor_distances[i]
             if distance > 0:
                 direction = (particle.position - neighbor.position) / distance
@@ -266,7 +432,7 @@ class FluidSystem:
         for i, neighbor in enumerate(particle.neighbors):
             if neighbor.is_boundary:
                 continue
-                
+            
             distance = particle.neighbor_distances[i]
             velocity_diff = neighbor.velocity - particle.velocity
             
@@ -293,10 +459,8 @@ class FluidSystem:
                 particle.color_field += direction * gradient_magnitude
         
         # Apply surface tension
-        color_field_magnitude = particle.color_field.magnitude
+        color_field_magnitude, normal = particle.color_field.magnitude_and_direction()
         if color_field_magnitude > 0:
-            normal = particle.color_field.normalize()
-            
             # Calculate curvature (simplified)
             curvature = 0.0
             for i, neighbor in enumerate(particle.neighbors):
@@ -341,14 +505,48 @@ class FluidSystem:
             particle.position.y = self.max_y
             particle.velocity.y *= -self.bounds_damping
     
+    def handle_solid_body_batch(self, positions: Vector2DArray, velocities: Vector2DArray,
+                                forces: Vector2DArray, mass: np.ndarray, density: np.ndarray,
+                                count: int) -> None:
+        """Push the first ``count`` particles out of solid bodies (see handle_solid_body_collisions)"""
+        if not self.solid_bodies:
+            return
+        
+        xs, ys = positions.xs[:count], positions.ys[:count]
+        vxs, vys = velocities.xs[:count], velocities.ys[:count]
+        radius = np.fromiter((p.radius for p in self.particles), xs.dtype, count)
+        
+        for body in self.solid_bodies:
+            dx = xs - body.position.x
+            dy = ys - body.position.y
+            length = np.sqrt(dx * dx + dy * dy)
+            hit = np.flatnonzero(body.contains_points(xs, ys) & (length > 0))
+            if not len(hit):
+                continue
+            
+            # Push particle outside the body
+            nx = dx[hit] / length[hit]
+            ny = dy[hit] / length[hit]
+            reach = body.radius + radius[hit]
+            xs[hit] = body.position.x + nx * reach
+            ys[hit] = body.position.y + ny * reach
+            
+            # Reflect velocity
+            twice_dot = 2.0 * (vxs[hit] * nx + vys[hit] * ny)
+            vxs[hit] = (vxs[hit] - twice_dot * nx) * 0.5
+            vys[hit] = (vys[hit] - twice_dot * ny) * 0.5
+            
+            # Apply buoyancy if body is less dense than fluid
+            buoyant = hit[body.density < density[hit]]
+            forces.ys[buoyant] -= self.gravity.y * 0.1 * mass[buoyant]
+    
     def handle_solid_body_collisions(self, particle: Particle) -> None:
         """Handle collisions with solid bodies"""
         for body in self.solid_bodies:
             if body.contains_point(particle.position):
                 # Simple repulsion force
-                direction = particle.position - body.position
-                if direction.magnitude > 0:
-                    direction = direction.normalize()
+                distance, direction = (particle.position - body.position).magnitude_and_direction()
+                if distance > 0:
                     # Push particle outside the body
                     particle.position = body.position + direction * (body.radius + particle.radius)
                     
@@ -365,7 +563,7 @@ class FluidSystem:
         particle.life_time += dt
         
         # Update color based on velocity
-        speed = particle.velocity.magnitude
+        speed = particle.velocity.magnitude()
         max_speed = 200.0
         speed_factor = min(speed / max_speed, 1.0)
         
@@ -379,6 +577,12 @@ class FluidSystem:
         particle.alpha = int(50 + 205 * density_factor)
     
     # SPH Kernel functions
+    def poly6_kernels(self, distance: np.ndarray) -> np.ndarray:
+        """Poly6 kernel evaluated over an array of distances"""
+        diff = np.where(distance < self.smoothing_radius,
+                        self.smoothing_radius_sq - distance * distance, 0.0)
+        return self.poly6_constant * diff ** 3
+    
     def poly6_kernel(self, distance: float) -> float:
         """Poly6 kernel for density calculation"""
         if distance >= self.smoothing_radius:
@@ -422,7 +626,7 @@ class FluidSystem:
                           spacing: float = 4.0, initial_velocity: Vector2D = None) -> List[Particle]:
         """Create a rectangular block of fluid particles"""
         particles = []
-        vel = initial_velocity if initial_velocity else Vector2D.zero()
+        vel = initial_velocity if initial_velocity else ZERO
         
         for x in range(width):
             for y in range(height):
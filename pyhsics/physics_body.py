@@ -4,15 +4,53 @@ Contains the core PhysicsBody class that represents objects in the physics simul
 """
 
 import math
+from itertools import chain
 from typing import List, Optional, Tuple
+
+import numpy as np
+
 from vector2d import Vector2D
 
 
+# Capability flags for code that handles several kinds of body, one per
+# optional member; body classes declare theirs in caps so callers skip the probing
+BODY_HAS_FORCE = 1  # accumulated_force
+BODY_HAS_BBOX = 2  # get_bounding_box()
+BODY_HAS_SLEEP = 4  # is_sleeping
+_CAPABILITY_MEMBERS = ((BODY_HAS_FORCE, 'accumulated_force'),
+                       (BODY_HAS_BBOX, 'get_bounding_box'),
+                       (BODY_HAS_SLEEP, 'is_sleeping'))
+
+
+def probe_caps(body) -> int:
+    """Work out a body's capability flags from the members it has"""
+    caps = 0
+    for flag, member in _CAPABILITY_MEMBERS:
+        if hasattr(body, member):
+            caps |= flag
+    return caps
+
+
+def body_caps(body) -> int:
+    """Capability flags of any body: its stored caps, or probed if it keeps none"""
+    caps = getattr(body, 'caps', None)
+    return probe_caps(body) if caps is None else caps
+
+
 class PhysicsBody:
     """
     Core physics body class representing objects in the physics simulation
     """
     
+    # Capability flags of the optional members. Subclasses declare the ones
+    # their instances carry; members defined on the class are added for them
+    caps = 0
+    
+    def __init_subclass__(cls, **kwargs):
+        """Add the flags of optional members the subclass defines itself"""
+        super().__init_subclass__(**kwargs)
+        cls.caps |= probe_caps(cls)
+    
     def __init__(self, 
                  position: Vector2D = None,
                  velocity: Vector2D = None,
@@ -116,6 +154,25 @@ class PhysicsBody:
             r = point - self.position
             self.angular_velocity += r.cross(impulse) * self.inv_inertia
     
+    @staticmethod
+    def batch_apply_impulse(bodies: List['PhysicsBody'], impulses: np.ndarray) -> None:
+        """
+        Apply one impulse per body through their centers of mass
+        
+        Args:
+            bodies: Bodies to push
+            impulses: Array of shape (N, 2), one impulse per body
+        """
+        # Static bodies have zero inverse mass, so their change is zero too
+        inv_mass = np.fromiter((body.inv_mass for body in bodies), float, len(bodies))
+        deltas = np.asarray(impulses, dtype=float) * inv_mass[:, None]
+        
+        for body, (dvx, dvy) in zip(bodies, deltas.tolist()):
+            if body.is_static:
+                continue
+            velocity = body.velocity
+            body.velocity = Vector2D(velocity.x + dvx, velocity.y + dvy)
+    
     def clear_forces(self) -> None:
         """Clear all accumulated forces and torques"""
         self.force = Vector2D.zero()
@@ -163,6 +220,45 @@ class PhysicsBody:
         # Check for sleep
         self.update_sleep_state(dt)
     
+    def integrate(self, dt: float) -> None:
+        """
+        Integrate forces and velocity in one pass, then clear the forces
+        
+        Equivalent to integrate_forces, integrate_velocity and clear_forces in
+        sequence, but each component is read and written once.
+        
+        Args:
+            dt: Time step
+        """
+        if self.is_static:
+            self.clear_forces()
+            return
+        
+        damping = 0.999
+        inv_mass = self.inv_mass
+        force = self.force
+        velocity = self.velocity
+        position = self.position
+        
+        # Update linear motion
+        ax = force.x * inv_mass
+        ay = force.y * inv_mass
+        vx = velocity.x + ax * dt
+        vy = velocity.y + ay * dt
+        self.position = Vector2D(position.x + vx * dt, position.y + vy * dt)
+        self.velocity = Vector2D(vx * damping, vy * damping)
+        self.acceleration = Vector2D(ax, ay)
+        
+        # Update angular motion
+        self.angular_acceleration = self.torque * self.inv_inertia
+        self.angular_velocity += self.angular_acceleration * dt
+        self.angle += self.angular_velocity * dt
+        self.angular_velocity *= damping
+        
+        self.clear_forces()
+        self.update_trail()
+        self.update_sleep_state(dt)
+    
     def update_trail(self) -> None:
         """Update the trail points for visual effects"""
         self.trail_points.append(self.position.copy())
@@ -171,7 +267,7 @@ class PhysicsBody:
     
     def update_sleep_state(self, dt: float) -> None:
         """Update sleep state based on movement"""
-        kinetic_energy = 0.5 * self.mass * self.velocity.magnitude_squared
+        kinetic_energy = 0.5 * self.mass * self.velocity.magnitude_squared()
         rotational_energy = 0.5 * self.moment_of_inertia * self.angular_velocity * self.angular_velocity
         
         if kinetic_energy + rotational_energy < self.sleep_threshold:
@@ -207,9 +303,7 @@ class PhysicsBody:
         
         for vertex in self.local_vertices:
             # Rotate and translate vertex
-            rotated_x = vertex.x * cos_a - vertex.y * sin_a
-            rotated_y = vertex.x * sin_a + vertex.y * cos_a
-            world_vertex = Vector2D(rotated_x, rotated_y) + self.position
+            world_vertex = vertex.rotate_precomputed(cos_a, sin_a) + self.position
             self.vertices.append(world_vertex)
     
     def calculate_polygon_properties(self) -> None:
@@ -291,15 +385,100 @@ class PhysicsBody:
         
         return False
     
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Check which of a batch of points are inside the body
+        
+        Args:
+            xs: X coordinates of the points
+            ys: Y coordinates of the points
+        
+        Returns:
+            Boolean array, True where the point is inside (see contains_point)
+        """
+        if self.body_type == "circle":
+            dx = xs - self.position.x
+            dy = ys - self.position.y
+            return np.sqrt(dx * dx + dy * dy) <= self.radius
+        elif self.body_type == "polygon" and len(self.vertices) >= 3:
+            # Ray casting, one edge at a time across all points
+            inside = np.zeros(len(xs), dtype=bool)
+            j = len(self.vertices) - 1
+            
+            for i in range(len(self.vertices)):
+                v1 = self.vertices[j]
+                v2 = self.vertices[i]
+                
+                # Horizontal edges never straddle a point's ray
+                if v1.y != v2.y:
+                    straddles = (v1.y > ys) != (v2.y > ys)
+                    crossing_x = (v2.x - v1.x) * (ys - v1.y) / (v2.y - v1.y) + v1.x
+                    inside ^= straddles & (xs < crossing_x)
+                j = i
+            
+            return inside
+        
+        return np.zeros(len(xs), dtype=bool)
+    
     def get_kinetic_energy(self) -> float:
         """Get total kinetic energy of the body"""
-        linear_ke = 0.5 * self.mass * self.velocity.magnitude_squared
+        linear_ke = 0.5 * self.mass * self.velocity.magnitude_squared()
         angular_ke = 0.5 * self.moment_of_inertia * self.angular_velocity * self.angular_velocity
         return linear_ke + angular_ke
     
     def get_potential_energy(self, gravity: Vector2D) -> float:
         """Get gravitational potential energy"""
-        return self.mass * abs(gravity.magnitude) * abs(self.position.y)
+        return self.mass * abs(gravity.magnitude()) * abs(self.position.y)
     
     def __repr__(self) -> str:
         return f"PhysicsBody(pos={self.position}, vel={self.velocity}, mass={self.mass})"
+
+
+def integrate_array(forces: np.ndarray, velocities: np.ndarray, positions: np.ndarray,
+                    inv_masses: np.ndarray, dt: float, damping: float = 0.999) -> None:
+    """
+    Integrate many bodies stored as (N, 2) arrays in place
+    
+    The array form of PhysicsBody.integrate's linear part. Static bodies are
+    expected to carry zero inverse mass and zero velocity.
+    
+    Args:
+        forces: Accumulated force per body
+        velocities: Velocity per body, updated in place
+        positions: Position per body, updated in place
+        inv_masses: Inverse mass per body, shape (N,)
+        dt: Time step
+        damping: Velocity damping factor per step
+    """
+    velocities += forces * (inv_masses * dt)[:, None]
+    positions += velocities * dt
+    velocities *= damping
+
+
+def gather_aabbs(bodies: List[PhysicsBody]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gather the axis-aligned bounding boxes of many bodies into arrays
+    
+    Returns:
+        Arrays of min x, min y, max x and max y, one entry per body
+    """
+    count = len(bodies)
+    min_x = np.empty(count)
+    min_y = np.empty(count)
+    max_x = np.empty(count)
+    max_y = np.empty(count)
+    for i, body in enumerate(bodies):
+        min_pos, max_pos = body.get_aabb()
+        min_x[i] = min_pos.x
+        min_y[i] = min_pos.y
+        max_x[i] = max_pos.x
+        max_y[i] = max_pos.y
+    return min_x, min_y, max_x, max_y
+
+
+def gather_positions(bodies: List[PhysicsBody]) -> np.ndarray:
+    """
+    Gather the positions of many bodies into an (N, 2) array
+    """
+    coords = chain.from_iterable((body.position.x, body.position.y) for body in bodies)
+    return np.fromiter(coords, dtype=float, count=2 * len(bodies)).reshape(-1, 2)
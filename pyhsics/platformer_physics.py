@@ -4,21 +4,64 @@ Handles character movement, slope collision, moving platforms, and platformer-sp
 """
 
 import math
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+
 from vector2d import Vector2D, clamp
 from physics_body import PhysicsBody
 
 
+# Storage precision for array-backed platformer state. Single precision keeps
+# sub-pixel accuracy at screen scale while halving memory traffic.
+STATE_DTYPE = np.float32
+
+# Local bindings for math functions called every frame (avoids module attribute lookups)
+_copysign = math.copysign
+_sqrt = math.sqrt
+
+# Character state bits packed into PlatformerCharacter.flags
+F_GROUNDED = 1
+F_ON_SLOPE = 2
+F_AGAINST_WALL = 4
+F_JUMPING = 8
+F_FACING_RIGHT = 16
+
+
+def _flag_property(mask: int, doc: str) -> property:
+    """Expose one bit of a character's flags as a boolean attribute"""
+    def getter(self) -> bool:
+        return bool(self.flags & mask)
+    
+    def setter(self, value: bool) -> None:
+        if value:
+            self.flags |= mask
+        else:
+            self.flags &= ~mask
+    
+    return property(getter, setter, doc=doc)
+
+
 class PlatformerCharacter:
     """
     Platformer character with specialized movement physics
     """
     
+    is_grounded = _flag_property(F_GROUNDED, "Standing on a platform")
+    is_on_slope = _flag_property(F_ON_SLOPE, "Standing on a slope")
+    is_against_wall = _flag_property(F_AGAINST_WALL, "Touching a wall")
+    is_jumping = _flag_property(F_JUMPING, "Jump is being held for extra height")
+    facing_right = _flag_property(F_FACING_RIGHT, "Facing direction")
+    
     def __init__(self, position: Vector2D, size: Vector2D = None):
         self.position = position.copy()
         self.velocity = Vector2D.zero()
         self.size = size if size else Vector2D(16, 24)  # Width, Height
         
+        # Scratch vector for the tentative position, swapped with position each step
+        self._next_position = Vector2D.zero()
+        
         # Movement properties
         self.max_speed = 200.0
         self.acceleration = 800.0
@@ -27,18 +70,14 @@ class PlatformerCharacter:
         self.gravity = 1200.0
         self.max_fall_speed = 600.0
         
-        # State
-        self.is_grounded = False
-        self.is_on_slope = False
-        self.is_against_wall = False
-        self.can_wall_jump = False
+        # State (see the F_* bits; starts facing right)
+        self.flags = F_FACING_RIGHT
         self.on_moving_platform = None
         self.platform_velocity = Vector2D.zero()
         
         # Jump mechanics
         self.jump_time = 0.0
         self.max_jump_time = 0.25
-        self.is_jumping = False
         self.coyote_time = 0.1
         self.coyote_timer = 0.0
         self.jump_buffer_time = 0.1
@@ -66,10 +105,12 @@ class PlatformerCharacter:
         
         # Visual properties
         self.color = (100, 200, 100)
-        self.facing_right = True
         
-        # Collision boxes
-        self.collision_box = None
+        # Collision boxes (main box stored as scalar bounds)
+        self.cb_min_x = 0.0
+        self.cb_min_y = 0.0
+        self.cb_max_x = 0.0
+        self.cb_max_y = 0.0
         self.ground_sensors = []
         self.wall_sensors = []
         
@@ -81,10 +122,10 @@ class PlatformerCharacter:
         half_height = self.size.y / 2
         
         # Main collision box
-        self.collision_box = {
-            'min': Vector2D(self.position.x - half_width, self.position.y - half_height),
-            'max': Vector2D(self.position.x + half_width, self.position.y + half_height)
-        }
+        self.cb_min_x = self.position.x - half_width
+        self.cb_min_y = self.position.y - half_height
+        self.cb_max_x = self.position.x + half_width
+        self.cb_max_y = self.position.y + half_height
         
         # Ground sensors (bottom of character)
         sensor_y = self.position.y + half_height + self.ground_check_distance
@@ -118,17 +159,23 @@ class PlatformerCharacter:
         # Handle input
         self.handle_input(dt)
         
-        # Apply gravity
-        if not self.is_grounded:
-            self.velocity.y += self.gravity * dt
-            self.velocity.y = min(self.velocity.y, self.max_fall_speed)
+        # Gravity, platform carry and movement in one pass over the scalars
+        velocity = self.velocity
+        vx = velocity.x
+        vy = velocity.y
+        if not self.flags & F_GROUNDED:
+            vy = min(vy + self.gravity * dt, self.max_fall_speed)
         
-        # Handle moving platform velocity
         if self.on_moving_platform:
-            self.velocity += self.platform_velocity
+            vx += self.platform_velocity.x
+            vy += self.platform_velocity.y
+        
+        velocity.x = vx
+        velocity.y = vy
         
-        # Apply movement
-        new_position = self.position + self.velocity * dt
+        new_position = self._next_position
+        new_position.x = self.position.x + vx * dt
+        new_position.y = self.position.y + vy * dt
         
         # Collision detection and response
         self.handle_collisions(new_position, platforms, dt)
@@ -137,11 +184,13 @@ class PlatformerCharacter:
         self.update_collision_boxes()
         
         # Update facing direction
-        if abs(self.input_x) > 0.1:
-            self.facing_right = self.input_x > 0
+        if self.input_x > 0.1:
+            self.flags |= F_FACING_RIGHT
+        elif self.input_x < -0.1:
+            self.flags &= ~F_FACING_RIGHT
         
         # Reset platform velocity after applying it
-        self.platform_velocity = Vector2D.zero()
+        self.platform_velocity.set(0, 0)
     
     def handle_input(self, dt: float) -> None:
         """Handle character input"""
@@ -151,31 +200,32 @@ class PlatformerCharacter:
             target_speed = self.input_x * self.max_speed
             
             # Different acceleration based on state
-            if self.is_grounded:
+            flags = self.flags
+            if flags & F_GROUNDED:
                 accel = self.acceleration
-            elif self.is_against_wall and self.input_x * (1 if self.facing_right else -1) < 0:
+            elif flags & F_AGAINST_WALL and self.input_x * (1 if flags & F_FACING_RIGHT else -1) < 0:
                 accel = self.acceleration * 0.5  # Reduced air control away from wall
             else:
                 accel = self.acceleration * 0.6  # Air control
             
             # Apply slope factor if on slope
-            if self.is_on_slope:
+            if flags & F_ON_SLOPE:
                 slope_factor = max(0.3, 1.0 - abs(self.slope_angle) / self.max_slope_angle)
                 accel *= slope_factor
             
             # Smooth acceleration
             speed_diff = target_speed - self.velocity.x
             if abs(speed_diff) > accel * dt:
-                self.velocity.x += math.copysign(accel * dt, speed_diff)
+                self.velocity.x += _copysign(accel * dt, speed_diff)
             else:
                 self.velocity.x = target_speed
         else:
             # Decelerate when no input
             if abs(self.velocity.x) > 0:
-                decel = self.deceleration if self.is_grounded else self.deceleration * 0.5
+                decel = self.deceleration if self.flags & F_GROUNDED else self.deceleration * 0.5
                 
                 if abs(self.velocity.x) > decel * dt:
-                    self.velocity.x -= math.copysign(decel * dt, self.velocity.x)
+                    self.velocity.x -= _copysign(decel * dt, self.velocity.x)
                 else:
                     self.velocity.x = 0
         
@@ -189,7 +239,7 @@ class PlatformerCharacter:
                 self.start_wall_jump()
         
         # Variable jump height
-        if self.is_jumping and self.jump_held:
+        if self.flags & F_JUMPING and self.jump_held:
             self.jump_time += dt
             if self.jump_time < self.max_jump_time:
                 # Continue applying jump force for smoother arc
@@ -197,51 +247,47 @@ class PlatformerCharacter:
                 self.velocity.y -= jump_force * dt
         
         if not self.jump_held or self.jump_time >= self.max_jump_time:
-            self.is_jumping = False
+            self.flags &= ~F_JUMPING
         
         # Wall sliding
-        if self.is_against_wall and not self.is_grounded and self.velocity.y > 0:
+        flags = self.flags
+        if flags & (F_AGAINST_WALL | F_GROUNDED) == F_AGAINST_WALL and self.velocity.y > 0:
             # Check if moving into wall
-            wall_direction = 1 if self.facing_right else -1
+            wall_direction = 1 if flags & F_FACING_RIGHT else -1
             if self.input_x * wall_direction > 0:
                 self.velocity.y = min(self.velocity.y, self.wall_slide_speed)
     
     def can_jump(self) -> bool:
         """Check if character can jump"""
-        return (self.is_grounded or self.coyote_timer < self.coyote_time) and self.jump_buffer_timer < self.jump_buffer_time
+        return (self.flags & F_GROUNDED or self.coyote_timer < self.coyote_time) and self.jump_buffer_timer < self.jump_buffer_time
     
     def can_wall_jump(self) -> bool:
         """Check if character can wall jump"""
-        return (self.is_against_wall and not self.is_grounded and 
+        return (self.flags & (F_AGAINST_WALL | F_GROUNDED) == F_AGAINST_WALL and 
                 self.wall_jump_timer > self.wall_jump_time and
                 self.jump_buffer_timer < self.jump_buffer_time)
     
     def start_jump(self) -> None:
         """Start a normal jump"""
         self.velocity.y = -self.jump_strength
-        self.is_jumping = True
+        self.flags = (self.flags | F_JUMPING) & ~F_GROUNDED
         self.jump_time = 0.0
-        self.is_grounded = False
         self.coyote_timer = self.coyote_time  # Prevent multiple jumps
     
     def start_wall_jump(self) -> None:
         """Start a wall jump"""
         # Wall jump pushes away from wall
-        wall_direction = -1 if self.facing_right else 1
+        wall_direction = -1 if self.flags & F_FACING_RIGHT else 1
         self.velocity.x = self.wall_jump_force.x * wall_direction
         self.velocity.y = self.wall_jump_force.y
         
-        self.is_jumping = True
+        self.flags = (self.flags | F_JUMPING) & ~(F_GROUNDED | F_AGAINST_WALL)
         self.jump_time = 0.0
         self.wall_jump_timer = 0.0
-        self.is_grounded = False
-        self.is_against_wall = False
     
     def handle_collisions(self, new_position: Vector2D, platforms: List['Platform'], dt: float) -> None:
         """Handle collisions with platforms"""
-        self.is_grounded = False
-        self.is_on_slope = False
-        self.is_against_wall = False
+        self.flags &= ~(F_GROUNDED | F_ON_SLOPE | F_AGAINST_WALL)
         self.on_moving_platform = None
         self.slope_angle = 0.0
         
@@ -251,17 +297,22 @@ class PlatformerCharacter:
                 pass  # Collision handled in check_platform_collision
         
         # Update grounded state based on ground sensors
-        if not self.is_grounded:
-            self.is_grounded = self.check_ground_sensors(platforms)
+        if not self.flags & F_GROUNDED and self.check_ground_sensors(platforms):
+            self.flags |= F_GROUNDED
         
         # Update wall detection
-        self.is_against_wall = self.check_wall_sensors(platforms)
+        if self.check_wall_sensors(platforms):
+            self.flags |= F_AGAINST_WALL
+        else:
+            self.flags &= ~F_AGAINST_WALL
         
-        # Apply final position
+        # Apply final position; the previous position becomes the next scratch vector
+        if new_position is self._next_position:
+            self._next_position = self.position
         self.position = new_position
         
         # Reset coyote timer if grounded
-        if self.is_grounded:
+        if self.flags & F_GROUNDED:
             self.coyote_timer = 0.0
     
     def check_platform_collision(self, new_position: Vector2D, platform: 'Platform', dt: float) -> bool:
@@ -289,7 +340,7 @@ class PlatformerCharacter:
             collision = self.resolve_solid_collision(new_position, platform)
             if collision and self.velocity.y >= 0:  # On top of platform
                 self.on_moving_platform = platform
-                self.platform_velocity = platform.velocity.copy()
+                self.platform_velocity.set(platform.velocity.x, platform.velocity.y)
             return collision
         
         return False
@@ -320,14 +371,14 @@ class PlatformerCharacter:
                 new_position.x = platform.position.x + platform.size.x + half_width
             
             self.velocity.x = 0
-            self.is_against_wall = True
+            self.flags |= F_AGAINST_WALL
         else:
             # Vertical collision
             if new_position.y < platform.position.y + platform.size.y / 2:
                 # Hit from above (landing on platform)
                 new_position.y = platform.position.y - half_height
                 self.velocity.y = max(0, self.velocity.y)  # Stop falling
-                self.is_grounded = True
+                self.flags |= F_GROUNDED
             else:
                 # Hit from below (hitting ceiling)
                 new_position.y = platform.position.y + platform.size.y + half_height
@@ -357,7 +408,7 @@ class PlatformerCharacter:
                 # Land on platform
                 new_position.y = platform_top - half_height
                 self.velocity.y = 0
-                self.is_grounded = True
+                self.flags |= F_GROUNDED
                 return True
         
         return False
@@ -381,8 +432,7 @@ class PlatformerCharacter:
         
         if 0 <= relative_x <= platform.size.x:
             # On the slope
-            slope_height = math.tan(slope_angle) * relative_x
-            slope_y = platform.position.y + platform.size.y - slope_height
+            slope_y = platform.position.y + platform.size.y - platform.slope_tan * relative_x
             
             char_bottom = new_position.y + self.size.y / 2
             
@@ -391,15 +441,17 @@ class PlatformerCharacter:
                 new_position.y = slope_y - self.size.y / 2
                 
                 # Adjust velocity for slope
-                if self.is_grounded:
-                    # Project velocity onto slope
-                    slope_normal = Vector2D(-math.sin(slope_angle), math.cos(slope_angle))
-                    velocity_along_slope = self.velocity.dot(slope_normal)
-                    self.velocity -= slope_normal * velocity_along_slope
+                if self.flags & F_GROUNDED:
+                    # Remove the velocity component along the slope normal
+                    normal_x = -platform.slope_sin
+                    normal_y = platform.slope_cos
+                    velocity = self.velocity
+                    velocity_along_normal = velocity.x * normal_x + velocity.y * normal_y
+                    velocity.x -= normal_x * velocity_along_normal
+                    velocity.y -= normal_y * velocity_along_normal
                 
                 self.velocity.y = max(0, self.velocity.y)
-                self.is_grounded = True
-                self.is_on_slope = True
+                self.flags |= F_GROUNDED | F_ON_SLOPE
                 self.slope_angle = slope_angle
                 return True
         
@@ -427,13 +479,20 @@ class PlatformerCharacter:
                     
                     # Determine which side the wall is on
                     if i % 2 == 0:  # Left sensors
-                        self.facing_right = False
+                        self.flags &= ~F_FACING_RIGHT
                     else:  # Right sensors
-                        self.facing_right = True
+                        self.flags |= F_FACING_RIGHT
                     
                     return True
         return False
     
+    def get_horizontal_reach(self, dt: float) -> Tuple[float, float]:
+        """Get the x-range the character's box and sensors can touch during the next update"""
+        reach = self.size.x / 2 + self.wall_check_distance
+        max_speed = max(abs(self.velocity.x) + self.acceleration * dt, abs(self.wall_jump_force.x))
+        reach += (max_speed + abs(self.platform_velocity.x)) * dt
+        return (self.position.x - reach, self.position.x + reach)
+    
     def set_input(self, input_x: float, jump_pressed: bool, jump_held: bool) -> None:
         """Set character input"""
         self.input_x = clamp(input_x, -1.0, 1.0)
@@ -463,7 +522,7 @@ class Platform:
         
         # Movement (for moving platforms)
         self.velocity = Vector2D.zero()
-        self.move_path = []
+        self.move_path = np.empty((0, 2), dtype=STATE_DTYPE)  # Waypoints as (x, y) rows
         self.current_target = 0
         self.move_speed = 50.0
         self.wait_time = 0.0
@@ -476,6 +535,19 @@ class Platform:
         
         # Visual properties
         self.color = self.get_color_for_type()
+    
+    @property
+    def slope_angle(self) -> float:
+        """Slope angle in radians (for slope platforms)"""
+        return self._slope_angle
+    
+    @slope_angle.setter
+    def slope_angle(self, angle: float) -> None:
+        # Cache the trig terms used by slope collision on every contact
+        self._slope_angle = angle
+        self.slope_sin = math.sin(angle)
+        self.slope_cos = math.cos(angle)
+        self.slope_tan = math.tan(angle)
         
     def get_color_for_type(self) -> Tuple[int, int, int]:
         """Get color based on platform type"""
@@ -491,7 +563,7 @@ class Platform:
     
     def update(self, dt: float) -> None:
         """Update platform (mainly for moving platforms)"""
-        if self.platform_type == PlatformType.MOVING and self.move_path:
+        if self.platform_type == PlatformType.MOVING and len(self.move_path):
             if self.wait_time > 0:
                 self.wait_time -= dt
             else:
@@ -499,28 +571,32 @@ class Platform:
     
     def move_along_path(self, dt: float) -> None:
         """Move platform along its defined path"""
-        if not self.move_path:
+        if not len(self.move_path):
             return
         
-        target_pos = self.move_path[self.current_target]
-        direction = target_pos - self.position
-        distance = direction.magnitude
+        target_x, target_y = self.move_path[self.current_target].tolist()
+        dx = target_x - self.position.x
+        dy = target_y - self.position.y
+        distance_sq = dx * dx + dy * dy
         
-        if distance < 5.0:  # Close enough to target
-            self.position = target_pos.copy()
-            self.velocity = Vector2D.zero()
+        if distance_sq < 25.0:  # Close enough to target (within 5 units)
+            self.position.set(target_x, target_y)
+            self.velocity.set(0, 0)
             self.wait_time = self.wait_duration
             
             # Move to next target
             self.current_target = (self.current_target + 1) % len(self.move_path)
         else:
             # Move toward target
-            self.velocity = direction.normalize() * self.move_speed
-            self.position += self.velocity * dt
+            scale = self.move_speed / _sqrt(distance_sq)
+            self.velocity.set(dx * scale, dy * scale)
+            self.position.x += self.velocity.x * dt
+            self.position.y += self.velocity.y * dt
     
     def set_move_path(self, path_points: List[Vector2D], speed: float = 50.0, wait_duration: float = 1.0) -> None:
         """Set movement path for moving platform"""
-        self.move_path = [point.copy() for point in path_points]
+        self.move_path = np.array([(point.x, point.y) for point in path_points],
+                                  dtype=STATE_DTYPE).reshape(-1, 2)
         self.move_speed = speed
         self.wait_duration = wait_duration
         self.current_target = 0
@@ -548,10 +624,56 @@ class PlatformerWorld:
         
         # Effects
         self.particle_effects = []
+        
+        # Broadphase index: positions in self.platforms of the static platforms
+        # sorted by min x, and of the moving ones, which are checked always.
+        # Rebuilt after add_platform, and by update() when the list was changed
+        self._static_order = []
+        self._static_min_x = []
+        self._max_static_width = 0.0
+        self._moving_order = []
+        self._indexed_platforms = []
+        self._platform_index_dirty = False
     
     def add_platform(self, platform: Platform) -> None:
         """Add platform to world"""
         self.platforms.append(platform)
+        self._platform_index_dirty = True
+    
+    def rebuild_platform_index(self) -> None:
+        """Rebuild the sorted broadphase index from the platform list"""
+        platforms = self.platforms
+        static_order = []
+        self._moving_order = []
+        for i, platform in enumerate(platforms):
+            if platform.platform_type == PlatformType.MOVING:
+                self._moving_order.append(i)
+            else:
+                static_order.append(i)
+        
+        static_order.sort(key=lambda i: platforms[i].position.x)
+        self._static_order = static_order
+        self._static_min_x = [platforms[i].position.x for i in static_order]
+        self._max_static_width = max((platforms[i].size.x for i in static_order), default=0.0)
+        self._indexed_platforms = list(platforms)
+        self._platform_index_dirty = False
+    
+    def get_platforms_in_range(self, min_x: float, max_x: float) -> List[Platform]:
+        """Get platforms whose horizontal extent may overlap [min_x, max_x], in list order
+        
+        After changing self.platforms other than through add_platform, call
+        rebuild_platform_index() before querying outside update().
+        """
+        if self._platform_index_dirty:
+            self.rebuild_platform_index()
+        
+        # A static platform overlaps only if min_x - widest <= its min x <= max_x
+        start = bisect_left(self._static_min_x, min_x - self._max_static_width)
+        end = bisect_right(self._static_min_x, max_x)
+        
+        # Resolve collisions in the same order as a full scan of self.platforms
+        order = sorted(self._static_order[start:end] + self._moving_order)
+        return [self._indexed_platforms[i] for i in order]
     
     def add_character(self, character: PlatformerCharacter) -> None:
         """Add character to world"""
@@ -563,9 +685,14 @@ class PlatformerWorld:
         for platform in self.platforms:
             platform.update(dt)
         
-        # Update characters
+        # Pick up platform list changes once per frame, not once per query
+        if self._platform_index_dirty or self._indexed_platforms != self.platforms:
+            self.rebuild_platform_index()
+        
+        # Update characters against the platforms within their reach
         for character in self.characters:
-            character.update(dt, self.platforms)
+            min_x, max_x = character.get_horizontal_reach(dt)
+            character.update(dt, self.get_platforms_in_range(min_x, max_x))
             
             # Apply world bounds
             self.apply_world_bounds(character)
@@ -590,7 +717,7 @@ class PlatformerWorld:
         if character.position.y + half_height > self.bounds.y:
             character.position.y = self.bounds.y - half_height
             character.velocity.y = 0
-            character.is_grounded = True
+            character.flags |= F_GROUNDED
     
     def update_particle_effects(self, dt: float) -> None:
         """Update particle effects (dust, etc.)"""
@@ -0,0 +1,93 @@
+"""
+Sweep-and-Prune Broad Phase
+Finds overlapping bounding boxes by sorting them along the x axis
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from physics_body import PhysicsBody, gather_aabbs
+
+
+def overlapping_pairs(order: np.ndarray, min_x: np.ndarray, min_y: np.ndarray,
+                      max_x: np.ndarray, max_y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sweep boxes already sorted by min x and return the index pairs that overlap
+    
+    Each box's active partners are exactly the boxes after it in sweep order
+    that start before it ends, so the sweep is one binary search per box.
+    """
+    sorted_min_x = min_x[order]
+    end = np.searchsorted(sorted_min_x, max_x[order], side='right')
+    counts = np.maximum(end - np.arange(1, len(order) + 1), 0)
+    
+    # Expand each box's run of partners in sweep order
+    total = int(counts.sum())
+    run_start = np.repeat(np.cumsum(counts) - counts, counts)
+    first = np.repeat(np.arange(len(order)), counts)
+    second = first + 1 + np.arange(total) - run_start
+    i = order[first]
+    j = order[second]
+    
+    # Pairs overlapping on x must also overlap on y
+    keep = (min_y[i] <= max_y[j]) & (min_y[j] <= max_y[i])
+    return i[keep], j[keep]
+
+
+def sweep_and_prune(bodies: List[PhysicsBody]) -> List[Tuple[PhysicsBody, PhysicsBody]]:
+    """
+    Get the pairs of bodies whose bounding boxes overlap
+    
+    Returns:
+        List of body pairs that might be colliding, skipping static pairs
+    """
+    broad_phase = SweepAndPrune()
+    broad_phase.rebuild(bodies)
+    return broad_phase.get_potential_collisions()
+
+
+class SweepAndPrune:
+    """
+    Incremental sweep-and-prune broad phase
+    
+    The sweep order is kept between frames. Bodies move little per frame, so
+    the old order is nearly sorted and a stable sort repairs it in close to
+    linear time instead of sorting from scratch.
+    """
+    
+    def __init__(self):
+        self.bodies: List[PhysicsBody] = []
+        self.order: Optional[np.ndarray] = None
+    
+    def rebuild(self, bodies: List[PhysicsBody]) -> None:
+        """Set the bodies to test on the next query"""
+        if len(bodies) != len(self.bodies) or any(a is not b for a, b in zip(bodies, self.bodies)):
+            # A different body list invalidates the kept order
+            self.order = None
+        self.bodies = list(bodies)
+    
+    def get_potential_collisions(self) -> List[Tuple[PhysicsBody, PhysicsBody]]:
+        """
+        Get list of potential collision pairs
+        
+        Returns:
+            List of body pairs whose bounding boxes overlap
+        """
+        bodies = self.bodies
+        min_x, min_y, max_x, max_y = gather_aabbs(bodies)
+        
+        # Repair last frame's order, or sort from scratch
+        if self.order is None:
+            self.order = np.argsort(min_x, kind='stable')
+        else:
+            self.order = self.order[np.argsort(min_x[self.order], kind='stable')]
+        
+        i, j = overlapping_pairs(self.order, min_x, min_y, max_x, max_y)
+        
+        movable = np.array([not body.is_static for body in bodies], dtype=bool)
+        keep = movable[i] | movable[j]
+        
+        body_array = np.empty(len(bodies), dtype=object)
+        body_array[:] = bodies
+        return list(zip(body_array[i[keep]].tolist(), body_array[j[keep]].tolist()))
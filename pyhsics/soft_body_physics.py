@@ -6,26 +6,256 @@ Implements mass-spring systems for soft body deformation and ragdoll physics wit
 import math
 import random
 from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+
 from vector2d import Vector2D
 from physics_body import PhysicsBody
 from collision_resolution import Joint, SpringJoint, DistanceJoint, RevoluteJoint
+from vector2d_kernels import rotate_kernel
+from numba_support import NUMBA_AVAILABLE, njit, prange
+
+# Storage precision for soft body point and spring state. Single precision is
+# ample for on-screen deformation and halves the memory traffic of every pass.
+STATE_DTYPE = np.float32
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _spring_force_kernel(pos_x, pos_y, vel_x, vel_y, spring_a, spring_b, rest_length,
+                         stiffness, damping, break_threshold, broken, current_force,
+                         force_x, force_y, spring_fx, spring_fy):
+    """Compute spring forces in parallel, then scatter them onto the end points
+    
+    spring_fx/spring_fy are caller-owned scratch arrays, one slot per spring.
+    """
+    count = spring_a.shape[0]
+    
+    # Each spring only writes its own slots, so this loop is race-free
+    for i in prange(count):
+        spring_fx[i] = 0.0
+        spring_fy[i] = 0.0
+        if broken[i]:
+            continue
+        a = spring_a[i]
+        b = spring_b[i]
+        dx = pos_x[b] - pos_x[a]
+        dy = pos_y[b] - pos_y[a]
+        length_sq = dx * dx + dy * dy
+        if length_sq < 1e-12:
+            continue
+        
+        # One reciprocal square root yields both the direction and the length
+        inv_length = 1.0 / math.sqrt(length_sq)
+        length = length_sq * inv_length
+        dir_x = dx * inv_length
+        dir_y = dy * inv_length
+        magnitude = (-stiffness[i] * (length - rest_length[i]) -
+                     damping[i] * ((vel_x[b] - vel_x[a]) * dir_x + (vel_y[b] - vel_y[a]) * dir_y))
+        current_force[i] = abs(magnitude)
+        if current_force[i] > break_threshold[i]:
+            broken[i] = True
+            continue
+        
+        spring_fx[i] = dir_x * magnitude
+        spring_fy[i] = dir_y * magnitude
+    
+    # Points are shared between springs, so the scatter stays serial
+    for i in range(count):
+        force_x[spring_a[i]] -= spring_fx[i]
+        force_y[spring_a[i]] -= spring_fy[i]
+        force_x[spring_b[i]] += spring_fx[i]
+        force_y[spring_b[i]] += spring_fy[i]
+
+
+@njit(fastmath=True, cache=True)
+def _soft_body_step_kernel(pos_x, pos_y, old_x, old_y, vel_x, vel_y, force_x, force_y,
+                           mass, inv_mass, active, gravity_x, gravity_y, air_resistance,
+                           spring_a, spring_b, rest_length, stiffness, damping,
+                           break_threshold, broken, current_force,
+                           center_x, center_y, pressure, dt):
+    """Accumulate all soft body forces and take a Verlet step in one compiled pass
+    
+    The next positions are written into old_x/old_y; the caller swaps the buffers.
+    Pinned points need no branches: active and inv_mass are zero for them and
+    their velocity and displacement stay zero, so every term cancels.
+    """
+    count = pos_x.shape[0]
+    
+    # Gravity and air resistance (pinned points are at rest, so drag is zero)
+    for i in range(count):
+        drag = -air_resistance * math.sqrt(vel_x[i] * vel_x[i] + vel_y[i] * vel_y[i])
+        force_x[i] = gravity_x * mass[i] * active[i] + vel_x[i] * drag
+        force_y[i] = gravity_y * mass[i] * active[i] + vel_y[i] * drag
+    
+    # Springs: Hooke's law plus damping, scattered onto both end points
+    for i in range(spring_a.shape[0]):
+        if broken[i]:
+            continue
+        a = spring_a[i]
+        b = spring_b[i]
+        dx = pos_x[b] - pos_x[a]
+        dy = pos_y[b] - pos_y[a]
+        length_sq = dx * dx + dy * dy
+        if length_sq < 1e-12:
+            continue
+        
+        # One reciprocal square root yields both the direction and the length
+        inv_length = 1.0 / math.sqrt(length_sq)
+        length = length_sq * inv_length
+        dir_x = dx * inv_length
+        dir_y = dy * inv_length
+        magnitude = (-stiffness[i] * (length - rest_length[i]) -
+                     damping[i] * ((vel_x[b] - vel_x[a]) * dir_x + (vel_y[b] - vel_y[a]) * dir_y))
+        current_force[i] = abs(magnitude)
+        if current_force[i] > break_threshold[i]:
+            broken[i] = True
+            continue
+        
+        force_x[a] -= dir_x * magnitude
+        force_y[a] -= dir_y * magnitude
+        force_x[b] += dir_x * magnitude
+        force_y[b] += dir_y * magnitude
+    
+    # Pressure along the center-to-point direction, then the Verlet step
+    dt_sq = dt * dt
+    half_inv_dt = np.float32(0.5) / dt
+    for i in range(count):
+        if pressure > 0.0:
+            dx = pos_x[i] - center_x
+            dy = pos_y[i] - center_y
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > 0.0:
+                force_x[i] += dx * (pressure * active[i] / distance)
+                force_y[i] += dy * (pressure * active[i] / distance)
+        
+        displacement_x = pos_x[i] - old_x[i]
+        displacement_y = pos_y[i] - old_y[i]
+        step_x = displacement_x + force_x[i] * inv_mass[i] * dt_sq
+        step_y = displacement_y + force_y[i] * inv_mass[i] * dt_sq
+        vel_x[i] = (displacement_x + step_x) * half_inv_dt
+        vel_y[i] = (displacement_y + step_y) * half_inv_dt
+        old_x[i] = pos_x[i] + step_x
+        old_y[i] = pos_y[i] + step_y
+
+
+@njit(fastmath=True, cache=True)
+def _ragdoll_joint_kernel(iterations, pos_x, pos_y, angle, mass, inv_inertia,
+                          joint_a, joint_b, anchor_ax, anchor_ay, anchor_bx, anchor_by,
+                          min_angle, max_angle, has_limits):
+    """Run the Gauss-Seidel joint solver over bone arrays (see RagdollJoint)"""
+    for _ in range(iterations):
+        for j in range(joint_a.shape[0]):
+            a = joint_a[j]
+            b = joint_b[j]
+            
+            # Position constraint: pull the two world anchors together
+            cos_a = math.cos(angle[a])
+            sin_a = math.sin(angle[a])
+            cos_b = math.cos(angle[b])
+            sin_b = math.sin(angle[b])
+            offset_ax, offset_ay = rotate_kernel(anchor_ax[j], anchor_ay[j], cos_a, sin_a)
+            offset_bx, offset_by = rotate_kernel(anchor_bx[j], anchor_by[j], cos_b, sin_b)
+            error_x = (pos_x[b] + offset_bx) - (pos_x[a] + offset_ax)
+            error_y = (pos_y[b] + offset_by) - (pos_y[a] + offset_ay)
+            
+            if error_x * error_x + error_y * error_y >= 1e-6:
+                inv_mass_a = 1.0 / mass[a]
+                inv_mass_b = 1.0 / mass[b]
+                total_inv_mass = inv_mass_a + inv_mass_b
+                if total_inv_mass > 0:
+                    share_a = inv_mass_a / total_inv_mass
+                    share_b = inv_mass_b / total_inv_mass
+                    pos_x[a] += error_x * 0.5 * share_a
+                    pos_y[a] += error_y * 0.5 * share_a
+                    pos_x[b] -= error_x * 0.5 * share_b
+                    pos_y[b] -= error_y * 0.5 * share_b
+            
+            # Angle constraint: clamp the relative angle into the joint limits
+            if not has_limits[j]:
+                continue
+            
+            relative_angle = angle[b] - angle[a]
+            relative_angle -= math.tau * np.rint(relative_angle / math.tau)
+            
+            angle_violation = 0.0
+            if relative_angle < min_angle[j]:
+                angle_violation = min_angle[j] - relative_angle
+            elif relative_angle > max_angle[j]:
+                angle_violation = max_angle[j] - relative_angle
+            
+            if abs(angle_violation) > 1e-6:
+                angle_correction = angle_violation * 0.3
+                total_inv_inertia = inv_inertia[a] + inv_inertia[b]
+                if total_inv_inertia > 0:
+                    angle[a] += angle_correction * inv_inertia[a] / total_inv_inertia
+                    angle[b] -= angle_correction * inv_inertia[b] / total_inv_inertia
+
+
+def _grid_spring_topology(resolution: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build the spring index pairs and stiffness scales for a square point grid
+    
+    For each point in row-major order the springs are emitted as horizontal,
+    vertical, diagonal and anti-diagonal; diagonals get half strength.
+    """
+    x = np.tile(np.arange(resolution), resolution)
+    y = np.repeat(np.arange(resolution), resolution)
+    index = y * resolution + x
+    has_right = x < resolution - 1
+    has_left = x > 0
+    has_down = y < resolution - 1
+    
+    # One column per spring kind, masked where the neighbor is off the grid
+    targets = np.stack([index + 1, index + resolution,
+                        index + resolution + 1, index + resolution - 1], axis=1)
+    valid = np.stack([has_right, has_down, has_right & has_down, has_left & has_down], axis=1)
+    scales = np.broadcast_to(np.array([1.0, 1.0, 0.5, 0.5]), targets.shape)
+    
+    spring_a = np.broadcast_to(index[:, None], targets.shape)[valid].astype(np.int32)
+    spring_b = targets[valid].astype(np.int32)
+    return spring_a, spring_b, scales[valid]
+
+
+def _grid_boundary_ring(resolution: int) -> np.ndarray:
+    """Indices of a square point grid's perimeter, in order around the outline"""
+    last = resolution - 1
+    top = np.arange(resolution)
+    right = np.arange(1, resolution) * resolution + last
+    bottom = last * resolution + np.arange(last - 1, -1, -1)
+    left = np.arange(last - 1, 0, -1) * resolution
+    return np.concatenate([top, right, bottom, left]).astype(np.int32)
+
+
+def _point_vector_property(x_field: str, y_field: str, doc: str) -> property:
+    """Expose a pair of SoftBody point arrays as a Vector2D attribute of a MassPoint"""
+    def getter(self) -> Vector2D:
+        body = self.body
+        return Vector2D(float(getattr(body, x_field)[self.index]),
+                        float(getattr(body, y_field)[self.index]))
+    
+    def setter(self, value: Vector2D) -> None:
+        body = self.body
+        getattr(body, x_field)[self.index] = value.x
+        getattr(body, y_field)[self.index] = value.y
+    
+    return property(getter, setter, doc=doc)
 
 
 class MassPoint:
     """
     Individual mass point in soft body system
+    
+    The point state is stored in the owning SoftBody's arrays; a MassPoint is a
+    view onto one index of those arrays.
     """
     
-    def __init__(self, position: Vector2D, mass: float = 1.0, pinned: bool = False):
-        self.position = position.copy()
-        self.old_position = position.copy()
-        self.velocity = Vector2D.zero()
-        self.acceleration = Vector2D.zero()
-        self.force = Vector2D.zero()
-        
-        self.mass = mass
-        self.inv_mass = 1.0 / mass if not pinned else 0.0
-        self.pinned = pinned
+    position = _point_vector_property('pos_x', 'pos_y', "Current position")
+    old_position = _point_vector_property('old_x', 'old_y', "Position at the previous step")
+    velocity = _point_vector_property('vel_x', 'vel_y', "Velocity estimated by the integrator")
+    force = _point_vector_property('force_x', 'force_y', "Force accumulated this step")
+    
+    def __init__(self, body: 'SoftBody', index: int):
+        self.body = body
+        self.index = index
         
         self.radius = 3.0
         self.color = (255, 255, 255)
@@ -35,70 +265,73 @@ class MassPoint:
         self.constraints = []
         
         # Visual properties
-        self.original_position = position.copy()
+        self.original_position = self.position
         self.displacement = Vector2D.zero()
+    
+    @property
+    def mass(self) -> float:
+        """Mass of the point"""
+        return float(self.body.mass[self.index])
+    
+    @property
+    def inv_mass(self) -> float:
+        """Inverse mass (zero when pinned)"""
+        return float(self.body.inv_mass[self.index])
+    
+    @property
+    def pinned(self) -> bool:
+        """Whether the point is fixed in place"""
+        return bool(self.body.pinned[self.index])
+    
+    def apply_force(self, force: Vector2D) -> None:
+        """Add a force to the point for the current step"""
+        self.body.force_x[self.index] += force.x
+        self.body.force_y[self.index] += force.y
+
+
+def _spring_scalar_property(field: str, cast: type, doc: str) -> property:
+    """Expose one SoftBody spring array entry as a scalar attribute of a Spring"""
+    def getter(self):
+        return cast(getattr(self.body, field)[self.index])
+    
+    def setter(self, value) -> None:
+        getattr(self.body, field)[self.index] = value
+    
+    return property(getter, setter, doc=doc)
 
 
 class Spring:
     """
     Spring connection between two mass points
+    
+    Spring parameters are stored in the owning SoftBody's spring arrays; a
+    Spring is a view onto one index of those arrays.
     """
     
-    def __init__(self, point_a: MassPoint, point_b: MassPoint, 
-                 stiffness: float = 1.0, damping: float = 0.1, 
-                 rest_length: float = None):
-        self.point_a = point_a
-        self.point_b = point_b
-        self.stiffness = stiffness
-        self.damping = damping
-        self.rest_length = rest_length if rest_length else point_a.position.distance_to(point_b.position)
+    rest_length = _spring_scalar_property('spring_rest_length', float, "Length at which the spring exerts no force")
+    stiffness = _spring_scalar_property('spring_stiffness', float, "Hooke's law constant")
+    damping = _spring_scalar_property('spring_damping', float, "Damping along the spring axis")
+    break_threshold = _spring_scalar_property('spring_break_threshold', float, "Force above which the spring breaks")
+    is_broken = _spring_scalar_property('spring_broken', bool, "Whether the spring has broken")
+    current_force = _spring_scalar_property('spring_current_force', float, "Force magnitude from the last update")
+    
+    def __init__(self, body: 'SoftBody', index: int):
+        self.body = body
+        self.index = index
         
         # Visual properties
         self.thickness = 1.0
         self.color = (200, 200, 200)
-        
-        # Constraint properties
-        self.break_threshold = float('inf')
-        self.is_broken = False
-        
-        # Current state
-        self.current_force = 0.0
     
-    def update(self, dt: float) -> None:
-        """Update spring forces"""
-        if self.is_broken:
-            return
-        
-        # Calculate spring vector
-        spring_vector = self.point_b.position - self.point_a.position
-        current_length = spring_vector.magnitude
-        
-        if current_length < 1e-6:
-            return
-        
-        direction = spring_vector.normalize()
-        
-        # Hooke's law: F = -k * x
-        extension = current_length - self.rest_length
-        spring_force_magnitude = -self.stiffness * extension
-        
-        # Damping force
-        relative_velocity = self.point_b.velocity - self.point_a.velocity
-        damping_force_magnitude = -self.damping * relative_velocity.dot(direction)
-        
-        total_force_magnitude = spring_force_magnitude + damping_force_magnitude
-        self.current_force = abs(total_force_magnitude)
-        
-        # Check if spring should break
-        if self.current_force > self.break_threshold:
-            self.is_broken = True
-            return
-        
-        force = direction * total_force_magnitude
-        
-        # Apply forces to points
-        self.point_a.force -= force
-        self.point_b.force += force
+    @property
+    def point_a(self) -> MassPoint:
+        """First end point"""
+        return self.body.mass_points[self.body.spring_a[self.index]]
+    
+    @property
+    def point_b(self) -> MassPoint:
+        """Second end point"""
+        return self.body.mass_points[self.body.spring_b[self.index]]
 
 
 class SoftBody:
@@ -106,6 +339,10 @@ class SoftBody:
     Soft body made of mass points connected by springs
     """
     
+    # Spring topology and boundary ring per grid resolution, shared (read-only)
+    # by all soft bodies
+    _topology_cache: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+    
     def __init__(self, center: Vector2D, width: float, height: float, 
                  resolution: int = 8, stiffness: float = 500.0, damping: float = 10.0):
         self.center = center
@@ -117,6 +354,31 @@ class SoftBody:
         
         self.mass_points = []
         self.springs = []
+        
+        # Point state, one entry per mass point (see MassPoint for the object view)
+        self.pos_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.pos_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.old_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.old_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.vel_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.vel_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.force_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.force_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.mass = np.zeros(0, dtype=STATE_DTYPE)
+        self.inv_mass = np.zeros(0, dtype=STATE_DTYPE)
+        self.pinned = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=STATE_DTYPE)
+        self.boundary = np.zeros(0, dtype=np.int32)  # Outline point indices, in order
+        
+        # Spring state, one entry per spring (see Spring for the object view)
+        self.spring_a = np.zeros(0, dtype=np.int32)
+        self.spring_b = np.zeros(0, dtype=np.int32)
+        self.spring_rest_length = np.zeros(0, dtype=STATE_DTYPE)
+        self.spring_stiffness = np.zeros(0, dtype=STATE_DTYPE)
+        self.spring_damping = np.zeros(0, dtype=STATE_DTYPE)
+        self.spring_break_threshold = np.zeros(0, dtype=STATE_DTYPE)
+        self.spring_broken = np.zeros(0, dtype=bool)
+        self.spring_current_force = np.zeros(0, dtype=STATE_DTYPE)
         self.constraints = []
         
         # Material properties
@@ -139,83 +401,101 @@ class SoftBody:
     
     def create_structure(self) -> None:
         """Create mass-spring structure for soft body"""
-        # Create mass points in a grid
-        for y in range(self.resolution):
-            row = []
-            for x in range(self.resolution):
-                pos = Vector2D(
-                    self.center.x - self.width/2 + (x * self.width / (self.resolution - 1)),
-                    self.center.y - self.height/2 + (y * self.height / (self.resolution - 1))
-                )
-                mass_point = MassPoint(pos, self.density)
-                self.mass_points.append(mass_point)
-                row.append(mass_point)
+        # Create mass points in a grid (row-major: index = y * resolution + x)
+        steps = np.arange(self.resolution, dtype=float)
+        column_x = self.center.x - self.width/2 + (steps * self.width / (self.resolution - 1))
+        row_y = self.center.y - self.height/2 + (steps * self.height / (self.resolution - 1))
+        count = self.resolution * self.resolution
+        
+        self.pos_x = np.tile(column_x, self.resolution).astype(STATE_DTYPE)
+        self.pos_y = np.repeat(row_y, self.resolution).astype(STATE_DTYPE)
+        self.old_x = self.pos_x.copy()
+        self.old_y = self.pos_y.copy()
+        self.vel_x = np.zeros(count, dtype=STATE_DTYPE)
+        self.vel_y = np.zeros(count, dtype=STATE_DTYPE)
+        self.force_x = np.zeros(count, dtype=STATE_DTYPE)
+        self.force_y = np.zeros(count, dtype=STATE_DTYPE)
+        self.mass = np.full(count, self.density, dtype=STATE_DTYPE)
+        self.inv_mass = 1.0 / self.mass
+        self.pinned = np.zeros(count, dtype=bool)
+        self.active = np.ones(count, dtype=STATE_DTYPE)  # 0.0 for pinned points
+        
+        self.mass_points = [MassPoint(self, index) for index in range(count)]
         
         # Create springs between adjacent mass points
-        for y in range(self.resolution):
-            for x in range(self.resolution):
-                current_idx = y * self.resolution + x
-                current_point = self.mass_points[current_idx]
-                
-                # Horizontal springs
-                if x < self.resolution - 1:
-                    right_idx = y * self.resolution + (x + 1)
-                    right_point = self.mass_points[right_idx]
-                    spring = Spring(current_point, right_point, self.stiffness, self.damping)
-                    self.springs.append(spring)
-                
-                # Vertical springs
-                if y < self.resolution - 1:
-                    down_idx = (y + 1) * self.resolution + x
-                    down_point = self.mass_points[down_idx]
-                    spring = Spring(current_point, down_point, self.stiffness, self.damping)
-                    self.springs.append(spring)
-                
-                # Diagonal springs for stability (optional)
-                if x < self.resolution - 1 and y < self.resolution - 1:
-                    diagonal_idx = (y + 1) * self.resolution + (x + 1)
-                    diagonal_point = self.mass_points[diagonal_idx]
-                    spring = Spring(current_point, diagonal_point, 
-                                  self.stiffness * 0.5, self.damping * 0.5)
-                    self.springs.append(spring)
-                
-                # Anti-diagonal springs
-                if x > 0 and y < self.resolution - 1:
-                    anti_diagonal_idx = (y + 1) * self.resolution + (x - 1)
-                    anti_diagonal_point = self.mass_points[anti_diagonal_idx]
-                    spring = Spring(current_point, anti_diagonal_point,
-                                  self.stiffness * 0.5, self.damping * 0.5)
-                    self.springs.append(spring)
+        topology = SoftBody._topology_cache.get(self.resolution)
+        if topology is None:
+            topology = _grid_spring_topology(self.resolution) + (_grid_boundary_ring(self.resolution),)
+            for array in topology:
+                array.setflags(write=False)
+            SoftBody._topology_cache[self.resolution] = topology
+        self.spring_a, self.spring_b, spring_scale, self.boundary = topology
+        spring_count = len(self.spring_a)
+        self.spring_stiffness = (self.stiffness * spring_scale).astype(STATE_DTYPE)
+        self.spring_damping = (self.damping * spring_scale).astype(STATE_DTYPE)
+        
+        dx = self.pos_x[self.spring_b] - self.pos_x[self.spring_a]
+        dy = self.pos_y[self.spring_b] - self.pos_y[self.spring_a]
+        self.spring_rest_length = np.sqrt(dx * dx + dy * dy)
+        self.spring_break_threshold = np.full(spring_count, np.inf, dtype=STATE_DTYPE)
+        self.spring_broken = np.zeros(spring_count, dtype=bool)
+        self.spring_current_force = np.zeros(spring_count, dtype=STATE_DTYPE)
+        
+        self.springs = [Spring(self, index) for index in range(spring_count)]
+        
+        self.allocate_scratch()
+    
+    def allocate_scratch(self) -> None:
+        """Allocate the per-frame work arrays used by the NumPy update path
+        
+        The spring vector buffers also hold the per-spring forces of the
+        compiled spring kernel.
+        """
+        count = len(self.pos_x)
+        spring_count = len(self.spring_a)
+        
+        self._point_mask = np.empty(count, dtype=bool)
+        self._point_a = np.empty(count, dtype=STATE_DTYPE)
+        self._point_b = np.empty(count, dtype=STATE_DTYPE)
+        self._point_c = np.empty(count, dtype=STATE_DTYPE)
+        
+        self._spring_active = np.empty(spring_count, dtype=bool)
+        self._spring_mask = np.empty(spring_count, dtype=bool)
+        self._spring_dx = np.empty(spring_count, dtype=STATE_DTYPE)
+        self._spring_dy = np.empty(spring_count, dtype=STATE_DTYPE)
+        self._spring_length = np.empty(spring_count, dtype=STATE_DTYPE)
+        self._spring_magnitude = np.empty(spring_count, dtype=STATE_DTYPE)
+        self._spring_work = np.empty(spring_count, dtype=STATE_DTYPE)
     
     def update(self, dt: float) -> None:
         """Update soft body simulation"""
-        # Clear forces
-        for point in self.mass_points:
-            point.force = Vector2D.zero()
+        if NUMBA_AVAILABLE:
+            # Forces, springs, pressure and integration in one compiled pass
+            self.step_compiled(dt)
+            self.apply_constraints()
+            self.update_visual_properties()
+            return
         
-        # Apply gravity
-        for point in self.mass_points:
-            if not point.pinned:
-                point.force += self.gravity * point.mass
+        free_mass = np.multiply(self.mass, self.active, out=self._point_a)
+        drag_factor = np.hypot(self.vel_x, self.vel_y, out=self._point_b)
+        drag_factor *= -self.air_resistance
+        drag = self._point_c
         
-        # Apply air resistance
-        for point in self.mass_points:
-            if not point.pinned:
-                drag = point.velocity * (-self.air_resistance * point.velocity.magnitude)
-                point.force += drag
+        # Gravity and air resistance (overwrites last frame's forces); pinned
+        # points have no active mass and no velocity, so both terms vanish
+        for force, velocity, gravity in ((self.force_x, self.vel_x, self.gravity.x),
+                                         (self.force_y, self.vel_y, self.gravity.y)):
+            np.multiply(free_mass, gravity, out=force)
+            force += np.multiply(velocity, drag_factor, out=drag)
         
         # Update springs
-        for spring in self.springs:
-            if not spring.is_broken:
-                spring.update(dt)
+        self.update_springs()
         
         # Apply pressure forces for volume preservation
         self.apply_pressure_forces()
         
         # Integrate motion
-        for point in self.mass_points:
-            if not point.pinned:
-                self.integrate_point(point, dt)
+        self.integrate(dt)
         
         # Apply constraints
         self.apply_constraints()
@@ -223,16 +503,124 @@ class SoftBody:
         # Update visual properties
         self.update_visual_properties()
     
-    def integrate_point(self, point: MassPoint, dt: float) -> None:
-        """Integrate point motion using Verlet integration"""
-        acceleration = point.force * point.inv_mass
+    def step_compiled(self, dt: float) -> None:
+        """Accumulate forces and integrate with the fused compiled kernel"""
+        volume_ratio = self.calculate_volume() / self.rest_volume
+        pressure = (1.0 - volume_ratio) * 1000.0 if volume_ratio < 1.0 else 0.0
+        center = self.get_center()
         
-        # Verlet integration
-        new_position = point.position * 2.0 - point.old_position + acceleration * (dt * dt)
+        _soft_body_step_kernel(self.pos_x, self.pos_y, self.old_x, self.old_y,
+                               self.vel_x, self.vel_y, self.force_x, self.force_y,
+                               self.mass, self.inv_mass, self.active,
+                               STATE_DTYPE(self.gravity.x), STATE_DTYPE(self.gravity.y),
+                               STATE_DTYPE(self.air_resistance),
+                               self.spring_a, self.spring_b, self.spring_rest_length,
+                               self.spring_stiffness, self.spring_damping,
+                               self.spring_break_threshold, self.spring_broken,
+                               self.spring_current_force, STATE_DTYPE(center.x),
+                               STATE_DTYPE(center.y), STATE_DTYPE(pressure), STATE_DTYPE(dt))
+        
+        # The kernel wrote the next positions into the previous-position buffers
+        self.pos_x, self.old_x = self.old_x, self.pos_x
+        self.pos_y, self.old_y = self.old_y, self.pos_y
+    
+    def integrate(self, dt: float) -> None:
+        """Integrate all points using Verlet integration
+        
+        Pinned points have inv_mass == 0 and old == pos, so their step is zero
+        and no masking is needed.
+        """
+        dt_sq = dt * dt
+        half_inv_dt = 0.5 / dt
+        
+        for pos, old, vel, force in ((self.pos_x, self.old_x, self.vel_x, self.force_x),
+                                     (self.pos_y, self.old_y, self.vel_y, self.force_y)):
+            # step = new - pos = (pos - old) + (force * inv_mass) * dt^2
+            step = np.multiply(force, self.inv_mass, out=self._point_a)
+            step *= dt_sq
+            np.subtract(pos, old, out=old)
+            step += old
+            
+            # Central-difference velocity (new - old) / 2dt
+            np.add(old, step, out=vel)
+            vel *= half_inv_dt
+            
+            # Write the next positions into the previous-position buffer
+            np.add(pos, step, out=old)
         
-        point.velocity = (new_position - point.old_position) / (2.0 * dt)
-        point.old_position = point.position.copy()
-        point.position = new_position
+        # Rotate the buffers: the next positions become current and the
+        # current positions become the previous ones, without copying
+        self.pos_x, self.old_x = self.old_x, self.pos_x
+        self.pos_y, self.old_y = self.old_y, self.pos_y
+    
+    def update_springs(self) -> None:
+        """Accumulate Hooke's law and damping forces for all springs at once"""
+        if NUMBA_AVAILABLE:
+            _spring_force_kernel(self.pos_x, self.pos_y, self.vel_x, self.vel_y,
+                                 self.spring_a, self.spring_b, self.spring_rest_length,
+                                 self.spring_stiffness, self.spring_damping,
+                                 self.spring_break_threshold, self.spring_broken,
+                                 self.spring_current_force, self.force_x, self.force_y,
+                                 self._spring_dx, self._spring_dy)
+            return
+        
+        a = self.spring_a
+        b = self.spring_b
+        active = self._spring_active
+        mask = self._spring_mask
+        work = self._spring_work
+        
+        # Spring vectors and lengths, all evaluated into preallocated buffers
+        dx = np.take(self.pos_x, b, out=self._spring_dx)
+        dx -= np.take(self.pos_x, a, out=work)
+        dy = np.take(self.pos_y, b, out=self._spring_dy)
+        dy -= np.take(self.pos_y, a, out=work)
+        length_sq = np.multiply(dx, dx, out=self._spring_length)
+        length_sq += np.multiply(dy, dy, out=work)
+        
+        # Broken and degenerate springs exert no force
+        np.greater_equal(length_sq, 1e-12, out=active)
+        active &= np.logical_not(self.spring_broken, out=mask)
+        
+        # One reciprocal square root yields both the direction and the length
+        inv_length = np.sqrt(length_sq, out=work)
+        np.divide(1.0, inv_length, out=inv_length, where=active)
+        np.copyto(inv_length, 0.0, where=np.logical_not(active, out=mask))
+        dir_x = np.multiply(dx, inv_length, out=dx)
+        dir_y = np.multiply(dy, inv_length, out=dy)
+        length = np.multiply(length_sq, inv_length, out=length_sq)
+        
+        # Relative velocity along the spring axis
+        relative_speed = np.take(self.vel_x, b, out=self._spring_magnitude)
+        relative_speed -= np.take(self.vel_x, a, out=work)
+        relative_speed *= dir_x
+        relative_vy = np.take(self.vel_y, b, out=work)
+        relative_vy -= np.take(self.vel_y, a)
+        relative_vy *= dir_y
+        relative_speed += relative_vy
+        relative_speed *= self.spring_damping
+        
+        # Hooke's law: F = -k * x, plus damping along the spring axis
+        extension = np.subtract(length, self.spring_rest_length, out=length)
+        force_magnitude = np.multiply(self.spring_stiffness, extension, out=work)
+        np.negative(force_magnitude, out=force_magnitude)
+        force_magnitude -= relative_speed
+        
+        np.copyto(self.spring_current_force, np.abs(force_magnitude, out=length), where=active)
+        
+        # Springs that exceed their threshold break without applying force
+        snapped = np.greater(self.spring_current_force, self.spring_break_threshold, out=mask)
+        snapped &= active
+        self.spring_broken |= snapped
+        active &= np.logical_not(snapped, out=mask)
+        np.copyto(force_magnitude, 0.0, where=np.logical_not(active, out=mask))
+        
+        # Scatter equal and opposite forces onto the end points
+        count = len(self.pos_x)
+        spring_fx = np.multiply(dir_x, force_magnitude, out=dir_x)
+        spring_fy = np.multiply(dir_y, force_magnitude, out=dir_y)
+        self.force_x += np.bincount(b, spring_fx, count) - np.bincount(a, spring_fx, count)
+        self.force_y += np.bincount(b, spring_fy, count) - np.bincount(a, spring_fy, count)
     
     def apply_pressure_forces(self) -> None:
         """Apply internal pressure to maintain volume"""
@@ -243,44 +631,39 @@ class SoftBody:
         if volume_ratio < 1.0:  # Compressed
             pressure_magnitude = (1.0 - volume_ratio) * 1000.0
             
+            # Push free points outward from the center of mass; points sitting
+            # exactly on the center get no direction and no force
             center = self.get_center()
-            for point in self.mass_points:
-                if not point.pinned:
-                    direction = (point.position - center)
-                    if direction.magnitude > 0:
-                        direction = direction.normalize()
-                        pressure_force = direction * pressure_magnitude
-                        point.force += pressure_force
+            dx = np.subtract(self.pos_x, center.x, out=self._point_a)
+            dy = np.subtract(self.pos_y, center.y, out=self._point_b)
+            distance = np.hypot(dx, dy, out=self._point_c)
+            nonzero = np.greater(distance, 0, out=self._point_mask)
+            scale = np.divide(pressure_magnitude, distance, out=distance, where=nonzero)
+            np.copyto(scale, 0.0, where=np.logical_not(nonzero, out=nonzero))
+            scale *= self.active
+            self.force_x += np.multiply(dx, scale, out=dx)
+            self.force_y += np.multiply(dy, scale, out=dy)
     
     def calculate_volume(self) -> float:
         """Calculate current volume using shoelace formula"""
-        if len(self.mass_points) < 3:
+        if len(self.boundary) < 3:
             return 0.0
         
-        # Use convex hull or simplified polygon area
-        area = 0.0
-        n = len(self.mass_points)
+        # Area enclosed by the outline of the grid (interior points don't bound it)
+        x = self.pos_x[self.boundary]
+        y = self.pos_y[self.boundary]
+        area = np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
         
-        for i in range(n):
-            j = (i + 1) % n
-            area += self.mass_points[i].position.x * self.mass_points[j].position.y
-            area -= self.mass_points[j].position.x * self.mass_points[i].position.y
-        
-        return abs(area) / 2.0
+        return abs(float(area)) / 2.0
     
     def get_center(self) -> Vector2D:
         """Get center of mass"""
-        center = Vector2D.zero()
-        total_mass = 0.0
-        
-        for point in self.mass_points:
-            center += point.position * point.mass
-            total_mass += point.mass
+        total_mass = self.mass.sum()
+        if total_mass <= 0:
+            return Vector2D.zero()
         
-        if total_mass > 0:
-            center /= total_mass
-        
-        return center
+        return Vector2D(float(np.dot(self.pos_x, self.mass) / total_mass),
+                        float(np.dot(self.pos_y, self.mass) / total_mass))
     
     def apply_constraints(self) -> None:
         """Apply position constraints"""
@@ -295,7 +678,7 @@ class SoftBody:
             point.displacement = point.position - point.original_position
             
             # Color based on stress
-            stress = point.displacement.magnitude / 10.0
+            stress = point.displacement.magnitude() / 10.0
             stress_factor = min(stress, 1.0)
             
             # Green to red based on stress
@@ -312,82 +695,158 @@ class SoftBody:
     def pin_point(self, index: int) -> None:
         """Pin a mass point in place"""
         if 0 <= index < len(self.mass_points):
-            self.mass_points[index].pinned = True
-            self.mass_points[index].inv_mass = 0.0
+            self.pinned[index] = True
+            self.active[index] = 0.0
+            self.inv_mass[index] = 0.0
+            
+            # Bring the point to rest so integration leaves it where it is
+            self.old_x[index] = self.pos_x[index]
+            self.old_y[index] = self.pos_y[index]
+            self.vel_x[index] = 0.0
+            self.vel_y[index] = 0.0
     
     def apply_force_at_point(self, index: int, force: Vector2D) -> None:
         """Apply force to a specific mass point"""
         if 0 <= index < len(self.mass_points):
-            self.mass_points[index].force += force
+            self.force_x[index] += force.x
+            self.force_y[index] += force.y
+
+
+def _bone_vector_property(x_field: str, y_field: str, doc: str) -> property:
+    """Expose a pair of RagdollSystem bone arrays as a Vector2D attribute of a RagdollBone"""
+    def getter(self) -> Vector2D:
+        system = self.system
+        return Vector2D(float(getattr(system, x_field)[self.index]),
+                        float(getattr(system, y_field)[self.index]))
+    
+    def setter(self, value: Vector2D) -> None:
+        system = self.system
+        getattr(system, x_field)[self.index] = value.x
+        getattr(system, y_field)[self.index] = value.y
+    
+    return property(getter, setter, doc=doc)
+
+
+def _bone_scalar_property(field: str, doc: str) -> property:
+    """Expose one RagdollSystem bone array entry as a float attribute of a RagdollBone"""
+    def getter(self) -> float:
+        return float(getattr(self.system, field)[self.index])
+    
+    def setter(self, value: float) -> None:
+        getattr(self.system, field)[self.index] = value
+    
+    return property(getter, setter, doc=doc)
 
 
 class RagdollBone:
     """
     Individual bone in a ragdoll system
+    
+    The bone state is stored in the owning RagdollSystem's arrays; a RagdollBone
+    is a view onto one index of those arrays.
     """
     
-    def __init__(self, position: Vector2D, length: float, angle: float = 0.0, mass: float = 1.0):
-        self.position = position
-        self.length = length
-        self.angle = angle
-        self.mass = mass
-        
-        self.velocity = Vector2D.zero()
-        self.angular_velocity = 0.0
-        self.force = Vector2D.zero()
-        self.torque = 0.0
-        
-        # Calculate endpoints
-        self.update_endpoints()
+    velocity = _bone_vector_property('bone_vx', 'bone_vy', "Linear velocity")
+    force = _bone_vector_property('bone_fx', 'bone_fy', "Force accumulated this step")
+    start = _bone_vector_property('bone_start_x', 'bone_start_y', "First endpoint (see update_endpoints)")
+    end = _bone_vector_property('bone_end_x', 'bone_end_y', "Second endpoint (see update_endpoints)")
+    angular_velocity = _bone_scalar_property('bone_angular_velocity', "Angular velocity in radians per second")
+    torque = _bone_scalar_property('bone_torque', "Torque accumulated this step")
+    length = _bone_scalar_property('bone_length', "Distance between the endpoints")
+    mass = _bone_scalar_property('bone_mass', "Bone mass")
+    moment_of_inertia = _bone_scalar_property('bone_moment_of_inertia', "Moment of inertia about the center")
+    inv_inertia = _bone_scalar_property('bone_inv_inertia', "Inverse moment of inertia")
+    cos_angle = _bone_scalar_property('bone_cos', "Cached cosine of the angle")
+    sin_angle = _bone_scalar_property('bone_sin', "Cached sine of the angle")
+    
+    def __init__(self, system: 'RagdollSystem', index: int):
+        self.system = system
+        self.index = index
         
         # Visual properties
         self.thickness = 8.0
         self.color = (200, 150, 100)  # Bone color
-        
-        # Physics properties
-        self.moment_of_inertia = (1.0/12.0) * mass * length * length
-        self.inv_inertia = 1.0 / self.moment_of_inertia if self.moment_of_inertia > 0 else 0.0
+    
+    @property
+    def position(self) -> Vector2D:
+        """Center position"""
+        system = self.system
+        return Vector2D(float(system.bone_x[self.index]), float(system.bone_y[self.index]))
+    
+    @position.setter
+    def position(self, value: Vector2D) -> None:
+        system = self.system
+        system.bone_x[self.index] = value.x
+        system.bone_y[self.index] = value.y
+        system._bone_grid_dirty = True
+    
+    @property
+    def angle(self) -> float:
+        """Bone orientation in radians"""
+        return float(self.system.bone_angle[self.index])
+    
+    @angle.setter
+    def angle(self, angle: float) -> None:
+        # Cache the trig terms read by endpoint and joint anchor updates
+        system = self.system
+        system.bone_angle[self.index] = angle
+        system.bone_cos[self.index] = math.cos(angle)
+        system.bone_sin[self.index] = math.sin(angle)
+        system._bone_grid_dirty = True
     
     def update_endpoints(self) -> None:
         """Update bone endpoints based on position and angle"""
-        half_length = self.length / 2.0
-        cos_a = math.cos(self.angle)
-        sin_a = math.sin(self.angle)
-        
-        offset = Vector2D(cos_a * half_length, sin_a * half_length)
-        self.start = self.position - offset
-        self.end = self.position + offset
+        system = self.system
+        i = self.index
+        half_length = system.bone_length[i] / 2.0
+        offset_x = system.bone_cos[i] * half_length
+        offset_y = system.bone_sin[i] * half_length
+        
+        system.bone_start_x[i] = system.bone_x[i] - offset_x
+        system.bone_start_y[i] = system.bone_y[i] - offset_y
+        system.bone_end_x[i] = system.bone_x[i] + offset_x
+        system.bone_end_y[i] = system.bone_y[i] + offset_y
+        system._bone_grid_dirty = True
     
     def apply_force_at_point(self, force: Vector2D, point: Vector2D) -> None:
         """Apply force at a specific point on the bone"""
-        self.force += force
-        
-        # Calculate torque
-        r = point - self.position
-        self.torque += r.cross(force)
+        system = self.system
+        i = self.index
+        system.bone_fx[i] += force.x
+        system.bone_fy[i] += force.y
+        
+        # Calculate torque (r x F with r measured from the bone center)
+        r_x = point.x - system.bone_x[i]
+        r_y = point.y - system.bone_y[i]
+        system.bone_torque[i] += r_x * force.y - r_y * force.x
     
     def integrate(self, dt: float) -> None:
-        """Integrate bone motion"""
+        """Integrate bone motion (RagdollSystem.integrate_bones does all bones at once)"""
+        system = self.system
+        i = self.index
+        
         # Linear motion
-        acceleration = self.force / self.mass
-        self.velocity += acceleration * dt
-        self.position += self.velocity * dt
+        system.bone_vx[i] += system.bone_fx[i] / system.bone_mass[i] * dt
+        system.bone_vy[i] += system.bone_fy[i] / system.bone_mass[i] * dt
+        system.bone_x[i] += system.bone_vx[i] * dt
+        system.bone_y[i] += system.bone_vy[i] * dt
         
         # Angular motion
-        angular_acceleration = self.torque * self.inv_inertia
-        self.angular_velocity += angular_acceleration * dt
-        self.angle += self.angular_velocity * dt
+        system.bone_angular_velocity[i] += system.bone_torque[i] * system.bone_inv_inertia[i] * dt
+        self.angle = system.bone_angle[i] + system.bone_angular_velocity[i] * dt
         
         # Update endpoints
         self.update_endpoints()
         
         # Apply damping
-        self.velocity *= 0.99
-        self.angular_velocity *= 0.99
+        system.bone_vx[i] *= 0.99
+        system.bone_vy[i] *= 0.99
+        system.bone_angular_velocity[i] *= 0.99
         
         # Clear forces
-        self.force = Vector2D.zero()
-        self.torque = 0.0
+        system.bone_fx[i] = 0.0
+        system.bone_fy[i] = 0.0
+        system.bone_torque[i] = 0.0
 
 
 class RagdollSystem:
@@ -395,16 +854,52 @@ class RagdollSystem:
     Ragdoll physics system with bones and joints
     """
     
+    # Per-bone state arrays, appended to by add_bone
+    BONE_FIELDS = ('bone_x', 'bone_y', 'bone_vx', 'bone_vy', 'bone_fx', 'bone_fy',
+                   'bone_angle', 'bone_cos', 'bone_sin', 'bone_angular_velocity', 'bone_torque',
+                   'bone_length', 'bone_mass', 'bone_moment_of_inertia', 'bone_inv_inertia',
+                   'bone_start_x', 'bone_start_y', 'bone_end_x', 'bone_end_y')
+    
     def __init__(self, position: Vector2D):
         self.position = position
         self.bones = []
         self.joints = []
         
+        # Bone state, one entry per bone (see RagdollBone for the object view)
+        self.bone_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_vx = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_vy = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_fx = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_fy = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_angle = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_cos = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_sin = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_angular_velocity = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_torque = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_length = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_mass = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_moment_of_inertia = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_inv_inertia = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_start_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_start_y = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_end_x = np.zeros(0, dtype=STATE_DTYPE)
+        self.bone_end_y = np.zeros(0, dtype=STATE_DTYPE)
+        
         # Physics properties
         self.gravity = Vector2D(0, 981)
+        self.solver_iterations = 3
+        
+        # Impulse picking: bones within this distance of the hit point are
+        # eligible. The grid is marked stale whenever a bone is added or moved
+        self.impulse_pick_radius = 20.0
+        self.bone_grid = {}
+        self.bone_grid_size = 1.0
+        self._bone_grid_dirty = True
         
         # Create ragdoll structure
         self.create_ragdoll()
+        self.rebuild_joint_arrays()
     
     def create_ragdoll(self) -> None:
         """Create a simple humanoid ragdoll"""
@@ -418,153 +913,278 @@ class RagdollSystem:
         
         # Create bones
         # Torso (center bone)
-        torso = RagdollBone(self.position, torso_length, math.pi/2, 3.0)
-        self.bones.append(torso)
+        torso = self.add_bone(self.position, torso_length, math.pi/2, 3.0)
         
         # Head
         head_pos = torso.start + Vector2D(0, -head_length/2)
-        head = RagdollBone(head_pos, head_length, math.pi/2, 1.0)
-        self.bones.append(head)
+        head = self.add_bone(head_pos, head_length, math.pi/2, 1.0)
         
         # Arms
         shoulder_pos = torso.start + Vector2D(0, -10)
         
         # Left arm
         left_upper_arm_pos = shoulder_pos + Vector2D(-upper_arm_length/2, 0)
-        left_upper_arm = RagdollBone(left_upper_arm_pos, upper_arm_length, 0, 1.5)
-        self.bones.append(left_upper_arm)
+        left_upper_arm = self.add_bone(left_upper_arm_pos, upper_arm_length, 0, 1.5)
         
         left_elbow_pos = left_upper_arm.end
         left_lower_arm_pos = left_elbow_pos + Vector2D(-lower_arm_length/2, 0)
-        left_lower_arm = RagdollBone(left_lower_arm_pos, lower_arm_length, 0, 1.0)
-        self.bones.append(left_lower_arm)
+        left_lower_arm = self.add_bone(left_lower_arm_pos, lower_arm_length, 0, 1.0)
         
         # Right arm
         right_upper_arm_pos = shoulder_pos + Vector2D(upper_arm_length/2, 0)
-        right_upper_arm = RagdollBone(right_upper_arm_pos, upper_arm_length, 0, 1.5)
-        self.bones.append(right_upper_arm)
+        right_upper_arm = self.add_bone(right_upper_arm_pos, upper_arm_length, 0, 1.5)
         
         right_elbow_pos = right_upper_arm.end
         right_lower_arm_pos = right_elbow_pos + Vector2D(lower_arm_length/2, 0)
-        right_lower_arm = RagdollBone(right_lower_arm_pos, lower_arm_length, 0, 1.0)
-        self.bones.append(right_lower_arm)
+        right_lower_arm = self.add_bone(right_lower_arm_pos, lower_arm_length, 0, 1.0)
         
         # Legs
         hip_pos = torso.end
         
         # Left leg
         left_upper_leg_pos = hip_pos + Vector2D(-10, upper_leg_length/2)
-        left_upper_leg = RagdollBone(left_upper_leg_pos, upper_leg_length, math.pi/2, 2.0)
-        self.bones.append(left_upper_leg)
+        left_upper_leg = self.add_bone(left_upper_leg_pos, upper_leg_length, math.pi/2, 2.0)
         
         left_knee_pos = left_upper_leg.end
         left_lower_leg_pos = left_knee_pos + Vector2D(0, lower_leg_length/2)
-        left_lower_leg = RagdollBone(left_lower_leg_pos, lower_leg_length, math.pi/2, 1.5)
-        self.bones.append(left_lower_leg)
+        left_lower_leg = self.add_bone(left_lower_leg_pos, lower_leg_length, math.pi/2, 1.5)
         
         # Right leg
         right_upper_leg_pos = hip_pos + Vector2D(10, upper_leg_length/2)
-        right_upper_leg = RagdollBone(right_upper_leg_pos, upper_leg_length, math.pi/2, 2.0)
-        self.bones.append(right_upper_leg)
+        right_upper_leg = self.add_bone(right_upper_leg_pos, upper_leg_length, math.pi/2, 2.0)
         
         right_knee_pos = right_upper_leg.end
         right_lower_leg_pos = right_knee_pos + Vector2D(0, lower_leg_length/2)
-        right_lower_leg = RagdollBone(right_lower_leg_pos, lower_leg_length, math.pi/2, 1.5)
-        self.bones.append(right_lower_leg)
+        right_lower_leg = self.add_bone(right_lower_leg_pos, lower_leg_length, math.pi/2, 1.5)
         
-        # Create joints
+        # Create joints, ordered along each kinematic chain so consecutive
+        # solver steps share bones (neck, then each arm, then each leg)
         # Neck joint
         neck_joint = RagdollJoint(torso, head, torso.start, Vector2D(0, head_length/2))
         neck_joint.set_angle_limits(-math.pi/4, math.pi/4)
         self.joints.append(neck_joint)
         
-        # Shoulder joints
+        # Left arm: shoulder, elbow
         left_shoulder = RagdollJoint(torso, left_upper_arm, 
                                    Vector2D(0, -10), Vector2D(upper_arm_length/2, 0))
         left_shoulder.set_angle_limits(-math.pi, math.pi)
         self.joints.append(left_shoulder)
         
-        right_shoulder = RagdollJoint(torso, right_upper_arm,
-                                    Vector2D(0, -10), Vector2D(-upper_arm_length/2, 0))
-        right_shoulder.set_angle_limits(-math.pi, math.pi)
-        self.joints.append(right_shoulder)
-        
-        # Elbow joints
         left_elbow = RagdollJoint(left_upper_arm, left_lower_arm,
                                 Vector2D(-upper_arm_length/2, 0), Vector2D(lower_arm_length/2, 0))
         left_elbow.set_angle_limits(-math.pi/6, math.pi/2)
         self.joints.append(left_elbow)
         
+        # Right arm: shoulder, elbow
+        right_shoulder = RagdollJoint(torso, right_upper_arm,
+                                    Vector2D(0, -10), Vector2D(-upper_arm_length/2, 0))
+        right_shoulder.set_angle_limits(-math.pi, math.pi)
+        self.joints.append(right_shoulder)
+        
         right_elbow = RagdollJoint(right_upper_arm, right_lower_arm,
                                  Vector2D(upper_arm_length/2, 0), Vector2D(-lower_arm_length/2, 0))
         right_elbow.set_angle_limits(-math.pi/6, math.pi/2)
         self.joints.append(right_elbow)
         
-        # Hip joints
+        # Left leg: hip, knee
         left_hip = RagdollJoint(torso, left_upper_leg,
                               Vector2D(-5, torso_length/2), Vector2D(0, -upper_leg_length/2))
         left_hip.set_angle_limits(-math.pi/3, math.pi/3)
         self.joints.append(left_hip)
         
-        right_hip = RagdollJoint(torso, right_upper_leg,
-                               Vector2D(5, torso_length/2), Vector2D(0, -upper_leg_length/2))
-        right_hip.set_angle_limits(-math.pi/3, math.pi/3)
-        self.joints.append(right_hip)
-        
-        # Knee joints
         left_knee = RagdollJoint(left_upper_leg, left_lower_leg,
                                Vector2D(0, upper_leg_length/2), Vector2D(0, -lower_leg_length/2))
         left_knee.set_angle_limits(-math.pi/2, 0)
         self.joints.append(left_knee)
         
+        # Right leg: hip, knee
+        right_hip = RagdollJoint(torso, right_upper_leg,
+                               Vector2D(5, torso_length/2), Vector2D(0, -upper_leg_length/2))
+        right_hip.set_angle_limits(-math.pi/3, math.pi/3)
+        self.joints.append(right_hip)
+        
         right_knee = RagdollJoint(right_upper_leg, right_lower_leg,
                                 Vector2D(0, upper_leg_length/2), Vector2D(0, -lower_leg_length/2))
         right_knee.set_angle_limits(-math.pi/2, 0)
         self.joints.append(right_knee)
     
+    def add_bone(self, position: Vector2D, length: float, angle: float = 0.0,
+                 mass: float = 1.0) -> RagdollBone:
+        """Append a bone to the state arrays and return its view"""
+        moment_of_inertia = (1.0/12.0) * mass * length * length
+        inv_inertia = 1.0 / moment_of_inertia if moment_of_inertia > 0 else 0.0
+        initial = {
+            'bone_x': position.x, 'bone_y': position.y,
+            'bone_angle': angle, 'bone_cos': math.cos(angle), 'bone_sin': math.sin(angle),
+            'bone_length': length, 'bone_mass': mass,
+            'bone_moment_of_inertia': moment_of_inertia, 'bone_inv_inertia': inv_inertia,
+        }
+        for field in self.BONE_FIELDS:
+            setattr(self, field, np.append(getattr(self, field),
+                                           STATE_DTYPE(initial.get(field, 0.0))))
+        
+        bone = RagdollBone(self, len(self.bones))
+        bone.update_endpoints()
+        self.bones.append(bone)
+        self._bone_grid_dirty = True
+        return bone
+    
     def update(self, dt: float) -> None:
         """Update ragdoll simulation"""
         # Apply gravity to all bones
-        for bone in self.bones:
-            bone.force += self.gravity * bone.mass
-        
-        # Solve joint constraints
-        for _ in range(3):  # Multiple iterations for stability
-            for joint in self.joints:
-                joint.solve_position_constraint()
-                joint.solve_angle_constraint()
+        self.bone_fx += self.gravity.x * self.bone_mass
+        self.bone_fy += self.gravity.y * self.bone_mass
+        
+        # Solve joint constraints (the solver never reads endpoints; they are
+        # refreshed once per frame by integrate_bones)
+        if NUMBA_AVAILABLE:
+            self.solve_joints_compiled()
+        else:
+            for _ in range(self.solver_iterations):  # Multiple iterations for stability
+                for joint in self.joints:
+                    joint.solve_position_constraint()
+                    joint.solve_angle_constraint()
         
         # Integrate bone motion
-        for bone in self.bones:
-            bone.integrate(dt)
+        self.integrate_bones(dt)
+        
+        # Bones moved, so the impulse grid is rebuilt on the next query
+        self._bone_grid_dirty = True
+    
+    def integrate_bones(self, dt: float) -> None:
+        """Integrate all bones at once (vectorized RagdollBone.integrate)"""
+        # Linear motion
+        self.bone_vx += self.bone_fx / self.bone_mass * dt
+        self.bone_vy += self.bone_fy / self.bone_mass * dt
+        self.bone_x += self.bone_vx * dt
+        self.bone_y += self.bone_vy * dt
+        
+        # Angular motion
+        self.bone_angular_velocity += self.bone_torque * self.bone_inv_inertia * dt
+        self.bone_angle += self.bone_angular_velocity * dt
+        np.cos(self.bone_angle, out=self.bone_cos)
+        np.sin(self.bone_angle, out=self.bone_sin)
+        
+        # Update endpoints
+        self.update_endpoints()
+        
+        # Apply damping
+        self.bone_vx *= 0.99
+        self.bone_vy *= 0.99
+        self.bone_angular_velocity *= 0.99
+        
+        # Clear forces
+        self.bone_fx.fill(0.0)
+        self.bone_fy.fill(0.0)
+        self.bone_torque.fill(0.0)
+    
+    def update_endpoints(self) -> None:
+        """Recompute every bone's endpoints from its position and cached trig"""
+        half_length = self.bone_length / 2.0
+        offset_x = self.bone_cos * half_length
+        offset_y = self.bone_sin * half_length
+        np.subtract(self.bone_x, offset_x, out=self.bone_start_x)
+        np.subtract(self.bone_y, offset_y, out=self.bone_start_y)
+        np.add(self.bone_x, offset_x, out=self.bone_end_x)
+        np.add(self.bone_y, offset_y, out=self.bone_end_y)
+    
+    def rebuild_joint_arrays(self) -> None:
+        """Pack joint topology and limits into arrays for the compiled solver
+        
+        Runs again automatically when the joint list changes, set_angle_limits
+        is called or an anchor is reassigned; call it directly after changing
+        a joint's fields or anchor vectors in place.
+        """
+        joints = self.joints
+        
+        self.joint_a = np.array([j.bone_a.index for j in joints], dtype=np.int32)
+        self.joint_b = np.array([j.bone_b.index for j in joints], dtype=np.int32)
+        self.joint_anchor_ax = np.array([j.local_anchor_a.x for j in joints], dtype=np.float64)
+        self.joint_anchor_ay = np.array([j.local_anchor_a.y for j in joints], dtype=np.float64)
+        self.joint_anchor_bx = np.array([j.local_anchor_b.x for j in joints], dtype=np.float64)
+        self.joint_anchor_by = np.array([j.local_anchor_b.y for j in joints], dtype=np.float64)
+        self.joint_min_angle = np.array([j.min_angle for j in joints], dtype=np.float64)
+        self.joint_max_angle = np.array([j.max_angle for j in joints], dtype=np.float64)
+        self.joint_has_limits = np.array([j.has_angle_limits for j in joints], dtype=np.bool_)
+        self._packed_joints = list(joints)
+        self._joint_arrays_dirty = False
+    
+    def solve_joints_compiled(self) -> None:
+        """Solve all joint constraints in one compiled call on the bone arrays
+        
+        The kernel updates positions and angles in place; the cached trig and
+        endpoints are refreshed by integrate_bones().
+        """
+        if self._joint_arrays_dirty or self._packed_joints != self.joints:
+            self.rebuild_joint_arrays()
+        
+        _ragdoll_joint_kernel(self.solver_iterations, self.bone_x, self.bone_y, self.bone_angle,
+                              self.bone_mass, self.bone_inv_inertia,
+                              self.joint_a, self.joint_b,
+                              self.joint_anchor_ax, self.joint_anchor_ay,
+                              self.joint_anchor_bx, self.joint_anchor_by,
+                              self.joint_min_angle, self.joint_max_angle,
+                              self.joint_has_limits)
+    
+    def build_bone_grid(self) -> None:
+        """Build a uniform grid of bone indices for impulse picking"""
+        self.bone_grid.clear()
+        self.bone_grid_size = max(float(self.bone_length.max(initial=0.0)),
+                                  self.impulse_pick_radius, 1.0)
+        
+        # Each bone's AABB is grown by the pick radius, so any bone close enough
+        # to a point is registered in the cell containing that point
+        radius = self.impulse_pick_radius
+        size = self.bone_grid_size
+        cell_min_x = ((np.minimum(self.bone_start_x, self.bone_end_x) - radius) // size).astype(int)
+        cell_max_x = ((np.maximum(self.bone_start_x, self.bone_end_x) + radius) // size).astype(int)
+        cell_min_y = ((np.minimum(self.bone_start_y, self.bone_end_y) - radius) // size).astype(int)
+        cell_max_y = ((np.maximum(self.bone_start_y, self.bone_end_y) + radius) // size).astype(int)
+        
+        for i, (min_x, max_x, min_y, max_y) in enumerate(zip(cell_min_x.tolist(), cell_max_x.tolist(),
+                                                             cell_min_y.tolist(), cell_max_y.tolist())):
+            for grid_x in range(min_x, max_x + 1):
+                for grid_y in range(min_y, max_y + 1):
+                    if (grid_x, grid_y) not in self.bone_grid:
+                        self.bone_grid[(grid_x, grid_y)] = []
+                    self.bone_grid[(grid_x, grid_y)].append(i)
+        
+        self._bone_grid_dirty = False
     
     def apply_impulse_at_point(self, point: Vector2D, impulse: Vector2D) -> None:
         """Apply impulse at a specific world point"""
-        # Find the closest bone
+        if self._bone_grid_dirty:
+            self.build_bone_grid()
+        
+        # Find the closest bone among those registered in the point's cell
         closest_bone = None
         min_distance = float('inf')
         
-        for bone in self.bones:
+        cell = (int(point.x // self.bone_grid_size), int(point.y // self.bone_grid_size))
+        for i in self.bone_grid.get(cell, ()):
+            bone = self.bones[i]
             # Distance from point to bone line segment
             distance = self.point_to_line_distance(point, bone.start, bone.end)
             if distance < min_distance:
                 min_distance = distance
                 closest_bone = bone
         
-        if closest_bone and min_distance < 20:  # Within reasonable distance
+        if closest_bone and min_distance < self.impulse_pick_radius:  # Within reasonable distance
             closest_bone.apply_force_at_point(impulse, point)
     
     def point_to_line_distance(self, point: Vector2D, line_start: Vector2D, line_end: Vector2D) -> float:
         """Calculate distance from point to line segment"""
-        line_vec = line_end - line_start
-        point_vec = point - line_start
+        line_x = line_end.x - line_start.x
+        line_y = line_end.y - line_start.y
+        point_x = point.x - line_start.x
+        point_y = point.y - line_start.y
         
-        if line_vec.magnitude_squared == 0:
-            return point_vec.magnitude
+        length_sq = line_x * line_x + line_y * line_y
+        if length_sq == 0:
+            return math.hypot(point_x, point_y)
         
-        t = max(0, min(1, point_vec.dot(line_vec) / line_vec.magnitude_squared))
-        projection = line_start + line_vec * t
-        return point.distance_to(projection)
+        t = max(0, min(1, (point_x * line_x + point_y * line_y) / length_sq))
+        return math.hypot(point_x - line_x * t, point_y - line_y * t)
 
 
 class RagdollJoint:
@@ -576,8 +1196,8 @@ class RagdollJoint:
                  anchor_a: Vector2D, anchor_b: Vector2D):
         self.bone_a = bone_a
         self.bone_b = bone_b
-        self.local_anchor_a = anchor_a  # Local to bone_a
-        self.local_anchor_b = anchor_b  # Local to bone_b
+        self._local_anchor_a = anchor_a  # Local to bone_a
+        self._local_anchor_b = anchor_b  # Local to bone_b
         
         # Angle constraints
         self.min_angle = -math.pi
@@ -588,16 +1208,41 @@ class RagdollJoint:
         self.stiffness = 1.0
         self.damping = 0.1
     
+    @property
+    def local_anchor_a(self) -> Vector2D:
+        """Anchor in bone_a's local frame"""
+        return self._local_anchor_a
+    
+    @local_anchor_a.setter
+    def local_anchor_a(self, anchor: Vector2D) -> None:
+        self._local_anchor_a = anchor
+        self.mark_packed_stale()
+    
+    @property
+    def local_anchor_b(self) -> Vector2D:
+        """Anchor in bone_b's local frame"""
+        return self._local_anchor_b
+    
+    @local_anchor_b.setter
+    def local_anchor_b(self, anchor: Vector2D) -> None:
+        self._local_anchor_b = anchor
+        self.mark_packed_stale()
+    
+    def mark_packed_stale(self) -> None:
+        """Have the compiled solver repack its copy of this joint before the next step"""
+        self.bone_a.system._joint_arrays_dirty = True
+    
     def set_angle_limits(self, min_angle: float, max_angle: float) -> None:
         """Set angle limits for the joint"""
         self.min_angle = min_angle
         self.max_angle = max_angle
         self.has_angle_limits = True
+        self.mark_packed_stale()
     
     def get_world_anchor_a(self) -> Vector2D:
         """Get world position of anchor on bone A"""
-        cos_a = math.cos(self.bone_a.angle)
-        sin_a = math.sin(self.bone_a.angle)
+        cos_a = self.bone_a.cos_angle
+        sin_a = self.bone_a.sin_angle
         
         rotated_x = self.local_anchor_a.x * cos_a - self.local_anchor_a.y * sin_a
         rotated_y = self.local_anchor_a.x * sin_a + self.local_anchor_a.y * cos_a
@@ -606,8 +1251,8 @@ class RagdollJoint:
     
     def get_world_anchor_b(self) -> Vector2D:
         """Get world position of anchor on bone B"""
-        cos_b = math.cos(self.bone_b.angle)
-        sin_b = math.sin(self.bone_b.angle)
+        cos_b = self.bone_b.cos_angle
+        sin_b = self.bone_b.sin_angle
         
         rotated_x = self.local_anchor_b.x * cos_b - self.local_anchor_b.y * sin_b
         rotated_y = self.local_anchor_b.x * sin_b + self.local_anchor_b.y * cos_b
@@ -616,45 +1261,54 @@ class RagdollJoint:
     
     def solve_position_constraint(self) -> None:
         """Solve position constraint to keep anchors together"""
-        anchor_a = self.get_world_anchor_a()
-        anchor_b = self.get_world_anchor_b()
-        
-        constraint_error = anchor_b - anchor_a
-        
-        if constraint_error.magnitude_squared < 1e-6:
+        # Work on the bone arrays directly, as RagdollSystem.integrate_bones does
+        system = self.bone_a.system
+        bone_x = system.bone_x
+        bone_y = system.bone_y
+        cos = system.bone_cos
+        sin = system.bone_sin
+        a = self.bone_a.index
+        b = self.bone_b.index
+        anchor_a = self._local_anchor_a
+        anchor_b = self._local_anchor_b
+        
+        # World anchor separation, computed from scalars (see get_world_anchor_a/b)
+        x_a, y_a, cos_a, sin_a = float(bone_x[a]), float(bone_y[a]), float(cos[a]), float(sin[a])
+        x_b, y_b, cos_b, sin_b = float(bone_x[b]), float(bone_y[b]), float(cos[b]), float(sin[b])
+        error_x = ((x_b + anchor_b.x * cos_b - anchor_b.y * sin_b) -
+                   (x_a + anchor_a.x * cos_a - anchor_a.y * sin_a))
+        error_y = ((y_b + anchor_b.x * sin_b + anchor_b.y * cos_b) -
+                   (y_a + anchor_a.x * sin_a + anchor_a.y * cos_a))
+        
+        if error_x * error_x + error_y * error_y < 1e-6:
             return
         
         # Calculate correction
         correction_factor = 0.5  # How much to correct each frame
-        correction = constraint_error * correction_factor
+        correction_x = error_x * correction_factor
+        correction_y = error_y * correction_factor
         
         # Apply position correction
-        total_inv_mass = (1.0 / self.bone_a.mass) + (1.0 / self.bone_b.mass)
+        inv_mass_a = 1.0 / float(system.bone_mass[a])
+        inv_mass_b = 1.0 / float(system.bone_mass[b])
+        total_inv_mass = inv_mass_a + inv_mass_b
         
         if total_inv_mass > 0:
-            correction_a = correction * (1.0 / self.bone_a.mass) / total_inv_mass
-            correction_b = correction * (1.0 / self.bone_b.mass) / total_inv_mass
-            
-            self.bone_a.position += correction_a
-            self.bone_b.position -= correction_b
+            share_a = inv_mass_a / total_inv_mass
+            share_b = inv_mass_b / total_inv_mass
             
-            # Update endpoints
-            self.bone_a.update_endpoints()
-            self.bone_b.update_endpoints()
+            bone_x[a] = x_a + correction_x * share_a
+            bone_y[a] = y_a + correction_y * share_a
+            bone_x[b] = x_b - correction_x * share_b
+            bone_y[b] = y_b - correction_y * share_b
     
     def solve_angle_constraint(self) -> None:
         """Solve angle constraint if limits are set"""
         if not self.has_angle_limits:
             return
         
-        # Calculate relative angle
-        relative_angle = self.bone_b.angle - self.bone_a.angle
-        
-        # Normalize angle to [-pi, pi]
-        while relative_angle > math.pi:
-            relative_angle -= 2 * math.pi
-        while relative_angle < -math.pi:
-            relative_angle += 2 * math.pi
+        # Calculate relative angle, normalized to [-pi, pi]
+        relative_angle = math.remainder(self.bone_b.angle - self.bone_a.angle, math.tau)
         
         # Check if angle is within limits
         angle_violation = 0.0
@@ -678,7 +1332,3 @@ class RagdollJoint:
                 
                 self.bone_a.angle += correction_a
                 self.bone_b.angle -= correction_b
-                
-                # Update endpoints
-                self.bone_a.update_endpoints()
-                self.bone_b.update_endpoints()
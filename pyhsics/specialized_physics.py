@@ -5,9 +5,202 @@ Implements orbital mechanics, vehicle physics with suspension, and projectile mo
 
 import math
 import random
-from typing import List, Dict, Tuple, Optional
-from vector2d import Vector2D, clamp
+from collections import deque
+from typing import List, Dict, Tuple, Optional, Callable
+
+import numpy as np
+
+from vector2d import Vector2D
 from physics_body import PhysicsBody
+from numba_support import NUMBA_AVAILABLE, njit, prange
+
+_TWO_PI = math.pi * 2.0
+
+
+# Direct-summation kernels specialized per (G, eps2), shared by all systems
+_NBODY_KERNELS: Dict[Tuple[float, float], Callable] = {}
+
+
+def _make_nbody_kernel(G: float, eps2: float) -> Callable:
+    """Return a compiled direct-summation kernel with G and eps2 baked in as constants"""
+    key = (G, eps2)
+    if key in _NBODY_KERNELS:
+        return _NBODY_KERNELS[key]
+    
+    # Closure variables are frozen into the compiled code, so the constants
+    # fold into the pair arithmetic. Closures cannot use the on-disk cache.
+    @njit(parallel=True, fastmath=True)
+    def kernel(px, py, m, ax, ay):
+        n = px.shape[0]
+        
+        # Each body sums its own row and writes only its own slot, so the outer
+        # loop is race-free; the price is evaluating every pair from both sides
+        for i in prange(n):
+            xi = px[i]
+            yi = py[i]
+            axi = 0.0
+            ayi = 0.0
+            for j in range(n):
+                dx = px[j] - xi
+                dy = py[j] - yi
+                # Softening keeps r2 positive, so the self term needs no branch:
+                # dx = dy = 0 there and it adds nothing
+                inv_r = 1.0 / math.sqrt(dx * dx + dy * dy + eps2)
+                f = G * m[j] * inv_r * inv_r * inv_r
+                axi += f * dx
+                ayi += f * dy
+            ax[i] = axi
+            ay[i] = ayi
+    
+    _NBODY_KERNELS[key] = kernel
+    return kernel
+
+
+# Deepest quadtree level; bodies closer than root_size / 2**depth share a leaf
+_QUADTREE_MAX_DEPTH = 32
+
+
+@njit(cache=True)
+def _build_quadtree(px, py, m):
+    """Insert every body into a flat-array quadtree with one body per leaf"""
+    n = px.shape[0]
+    capacity = 4 * n + 1
+    child = np.full((capacity, 4), -1, dtype=np.int64)
+    body = np.full(capacity, -1, dtype=np.int64)
+    center_x = np.zeros(capacity)
+    center_y = np.zeros(capacity)
+    half = np.zeros(capacity)
+    total_mass = np.zeros(capacity)
+    com_x = np.zeros(capacity)
+    com_y = np.zeros(capacity)
+    
+    # Root cell is the square bounding box of all bodies
+    min_x = px.min()
+    max_x = px.max()
+    min_y = py.min()
+    max_y = py.max()
+    center_x[0] = 0.5 * (min_x + max_x)
+    center_y[0] = 0.5 * (min_y + max_y)
+    half[0] = 0.5 * max(max_x - min_x, max_y - min_y) + 1e-9
+    count = 1
+    
+    for b in range(n):
+        node = 0
+        depth = 0
+        while True:
+            # Every cell on the way down gains this body's mass
+            total_mass[node] += m[b]
+            com_x[node] += m[b] * px[b]
+            com_y[node] += m[b] * py[b]
+            
+            if child[node, 0] < 0:
+                if body[node] < 0:
+                    body[node] = b
+                    break
+                if depth >= _QUADTREE_MAX_DEPTH:
+                    # Too close to separate; the leaf keeps the combined mass
+                    break
+                
+                # Split the occupied leaf, growing storage when it runs out
+                if count + 4 > capacity:
+                    capacity *= 2
+                    child = np.concatenate((child, np.full((capacity - child.shape[0], 4), -1, dtype=np.int64)))
+                    body = np.concatenate((body, np.full(capacity - body.shape[0], -1, dtype=np.int64)))
+                    center_x = np.concatenate((center_x, np.zeros(capacity - center_x.shape[0])))
+                    center_y = np.concatenate((center_y, np.zeros(capacity - center_y.shape[0])))
+                    half = np.concatenate((half, np.zeros(capacity - half.shape[0])))
+                    total_mass = np.concatenate((total_mass, np.zeros(capacity - total_mass.shape[0])))
+                    com_x = np.concatenate((com_x, np.zeros(capacity - com_x.shape[0])))
+                    com_y = np.concatenate((com_y, np.zeros(capacity - com_y.shape[0])))
+                
+                quarter = 0.5 * half[node]
+                for q in range(4):
+                    c = count + q
+                    child[node, q] = c
+                    center_x[c] = center_x[node] + (quarter if q & 1 else -quarter)
+                    center_y[c] = center_y[node] + (quarter if q & 2 else -quarter)
+                    half[c] = quarter
+                count += 4
+                
+                # Push the resident body one level down
+                old = body[node]
+                body[node] = -1
+                q = (1 if px[old] >= center_x[node] else 0) + (2 if py[old] >= center_y[node] else 0)
+                c = child[node, q]
+                body[c] = old
+                total_mass[c] = m[old]
+                com_x[c] = m[old] * px[old]
+                com_y[c] = m[old] * py[old]
+            
+            q = (1 if px[b] >= center_x[node] else 0) + (2 if py[b] >= center_y[node] else 0)
+            node = child[node, q]
+            depth += 1
+    
+    # Turn the mass-weighted sums into centres of mass
+    for node in range(count):
+        if total_mass[node] > 0.0:
+            com_x[node] /= total_mass[node]
+            com_y[node] /= total_mass[node]
+    
+    return child[:count], com_x[:count], com_y[:count], total_mass[:count], 2.0 * half[:count]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _barnes_hut_accel(px, py, child, com_x, com_y, total_mass, size, G, eps2, theta, ax, ay):
+    """Approximate gravitational accelerations by walking the quadtree per body"""
+    n = px.shape[0]
+    theta2 = theta * theta
+    
+    for i in prange(n):
+        xi = px[i]
+        yi = py[i]
+        axi = 0.0
+        ayi = 0.0
+        stack = np.empty(3 * _QUADTREE_MAX_DEPTH + 4, dtype=np.int64)
+        stack[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            node = stack[top]
+            if total_mass[node] == 0.0:
+                continue
+            dx = com_x[node] - xi
+            dy = com_y[node] - yi
+            d2 = dx * dx + dy * dy
+            
+            # Leaves and cells that look small enough act as a point mass;
+            # the body's own leaf sits at zero offset and adds nothing
+            if child[node, 0] < 0 or size[node] * size[node] < theta2 * d2:
+                inv_r = 1.0 / math.sqrt(d2 + eps2)
+                f = G * total_mass[node] * inv_r * inv_r * inv_r
+                axi += f * dx
+                ayi += f * dy
+            else:
+                for q in range(4):
+                    stack[top] = child[node, q]
+                    top += 1
+        ax[i] = axi
+        ay[i] = ayi
+
+
+class BarnesHutTree:
+    """
+    Quadtree over body positions for O(N log N) gravity
+    """
+    
+    def __init__(self, px: np.ndarray, py: np.ndarray, mass: np.ndarray):
+        self.child, self.com_x, self.com_y, self.total_mass, self.size = _build_quadtree(px, py, mass)
+    
+    @property
+    def node_count(self) -> int:
+        """Number of cells in the tree"""
+        return self.child.shape[0]
+    
+    def compute_accelerations(self, px: np.ndarray, py: np.ndarray, G: float, eps2: float,
+                              theta: float, ax: np.ndarray, ay: np.ndarray) -> None:
+        """Write approximate accelerations for the given bodies into ax/ay"""
+        _barnes_hut_accel(px, py, self.child, self.com_x, self.com_y, self.total_mass,
+                          self.size, G, eps2, theta, ax, ay)
 
 
 class OrbitingBody:
@@ -16,9 +209,10 @@ class OrbitingBody:
     """
     
     def __init__(self, position: Vector2D, velocity: Vector2D, mass: float, 
-                 radius: float = 10.0, is_central_body: bool = False):
-        self.position = position.copy()
-        self.velocity = velocity.copy()
+                 radius: float = 10.0, is_central_body: bool = False, _unsafe_share: bool = False):
+        # Callers handing over vectors nobody else references may skip the copies
+        self.position = position if _unsafe_share else position.copy()
+        self.velocity = velocity if _unsafe_share else velocity.copy()
         self.mass = mass
         self.radius = radius
         self.is_central_body = is_central_body
@@ -38,8 +232,8 @@ class OrbitingBody:
         
         # Visual properties
         self.color = (255, 255, 255)
-        self.trail_points = []
         self.max_trail_length = 200
+        self.trail_points = deque(maxlen=self.max_trail_length)
         
         # Orbital path visualization
         self.orbit_points = []
@@ -48,7 +242,7 @@ class OrbitingBody:
     def update_orbital_parameters(self, central_mass: float, central_position: Vector2D) -> None:
         """Update orbital parameters based on current state"""
         r_vector = self.position - central_position
-        r_magnitude = r_vector.magnitude
+        r_magnitude = r_vector.magnitude()
         
         if r_magnitude == 0:
             return
@@ -58,7 +252,7 @@ class OrbitingBody:
         mu = G * central_mass
         
         # Specific orbital energy
-        kinetic_energy = 0.5 * self.velocity.magnitude_squared
+        kinetic_energy = 0.5 * self.velocity.magnitude_squared()
         potential_energy = -mu / r_magnitude
         self.orbital_energy = kinetic_energy + potential_energy
         
@@ -86,8 +280,6 @@ class OrbitingBody:
     def update_trail(self) -> None:
         """Update orbital trail"""
         self.trail_points.append(self.position.copy())
-        if len(self.trail_points) > self.max_trail_length:
-            self.trail_points.pop(0)
 
 
 class OrbitalMechanicsSystem:
@@ -102,9 +294,34 @@ class OrbitalMechanicsSystem:
         self.show_force_vectors = False
         self.show_velocity_vectors = False
         
+        # Above this many bodies (and with Numba) forces come from a
+        # Barnes-Hut tree; theta is the opening angle size / distance
+        self.barnes_hut_threshold = 512
+        self.barnes_hut_theta = 0.5
+        
+        # Plummer softening length; must stay positive, it bounds close
+        # encounters and lets the force kernels skip the r == 0 test
+        self.softening = 1.0
+        
         # Simulation bounds
         self.bounds = None
         
+        # Struct-of-arrays body state, read from the bodies at the start of each step
+        self._synced_bodies: List[OrbitingBody] = []
+        self._px = np.zeros(0)
+        self._py = np.zeros(0)
+        self._vx = np.zeros(0)
+        self._vy = np.zeros(0)
+        self._m = np.zeros(0)
+        self._mobile = np.zeros(0)
+        self._ax = np.zeros(0)
+        self._ay = np.zeros(0)
+        self._accel_valid = False  # _ax/_ay hold the forces at the current positions
+        
+        # Compiled direct-summation kernel for the current G and softening
+        self._kernel = None
+        self._kernel_constants = None
+        
     def add_body(self, body: OrbitingBody) -> None:
         """Add a body to the system"""
         self.bodies.append(body)
@@ -114,24 +331,102 @@ class OrbitalMechanicsSystem:
         if body in self.bodies:
             self.bodies.remove(body)
     
+    def _sync_arrays(self) -> None:
+        """Read the body state into the arrays, so edits made between steps take effect"""
+        bodies = self.bodies
+        if self._synced_bodies != bodies:
+            # Membership changed; resize the arrays
+            self._synced_bodies = list(bodies)
+            self._ax = np.zeros(len(bodies))
+            self._ay = np.zeros(len(bodies))
+            self._accel_valid = False
+        
+        px = np.array([body.position.x for body in bodies], dtype=np.float64)
+        py = np.array([body.position.y for body in bodies], dtype=np.float64)
+        m = np.array([body.mass for body in bodies], dtype=np.float64)
+        
+        # Cached forces only hold while positions and masses are unchanged
+        if self._accel_valid and not (np.array_equal(px, self._px) and np.array_equal(py, self._py)
+                                      and np.array_equal(m, self._m)):
+            self._accel_valid = False
+        
+        self._px, self._py, self._m = px, py, m
+        self._vx = np.array([body.velocity.x for body in bodies], dtype=np.float64)
+        self._vy = np.array([body.velocity.y for body in bodies], dtype=np.float64)
+        # Central bodies feel gravity but are held in place
+        self._mobile = np.array([0.0 if body.is_central_body else 1.0 for body in bodies])
+    
+    def compute_accelerations(self) -> None:
+        """Fill the acceleration arrays from the current body positions"""
+        G = self.gravitational_constant
+        eps2 = self.softening * self.softening
+        if NUMBA_AVAILABLE:
+            if len(self._m) > self.barnes_hut_threshold:
+                tree = BarnesHutTree(self._px, self._py, self._m)
+                tree.compute_accelerations(self._px, self._py, G, eps2, self.barnes_hut_theta,
+                                           self._ax, self._ay)
+            else:
+                # Rebuild the specialized kernel if G or the softening changed
+                if self._kernel_constants != (G, eps2):
+                    self._kernel = _make_nbody_kernel(G, eps2)
+                    self._kernel_constants = (G, eps2)
+                self._kernel(self._px, self._py, self._m, self._ax, self._ay)
+            return
+        
+        px, py, m = self._px, self._py, self._m
+        
+        # Pairwise separations, row i holding the offsets from body i to every body j
+        dx = px[None, :] - px[:, None]
+        dy = py[None, :] - py[:, None]
+        inv_r = 1.0 / np.sqrt(dx * dx + dy * dy + eps2)
+        
+        # m_j / r^3 per pair; the diagonal has zero offsets and contributes nothing
+        inv_r3 = inv_r * inv_r * inv_r * m[None, :]
+        np.multiply((dx * inv_r3).sum(axis=1), G, out=self._ax)
+        np.multiply((dy * inv_r3).sum(axis=1), G, out=self._ay)
+    
     def update(self, dt: float) -> None:
         """Update orbital mechanics simulation"""
         dt *= self.time_scale
         
-        # Clear forces
-        for body in self.bodies:
-            body.gravitational_force = Vector2D.zero()
-            body.total_force = Vector2D.zero()
-        
-        # Calculate gravitational forces between all body pairs
-        for i, body1 in enumerate(self.bodies):
-            for j, body2 in enumerate(self.bodies[i+1:], i+1):
-                self.calculate_gravitational_force(body1, body2)
-        
-        # Update positions and velocities
-        for body in self.bodies:
-            if not body.is_central_body:
-                self.integrate_body(body, dt)
+        self._sync_arrays()
+        if not self._accel_valid:
+            self.compute_accelerations()
+            self._accel_valid = True
+        px, py, vx, vy, m = self._px, self._py, self._vx, self._vy, self._m
+        ax, ay = self._ax, self._ay
+        
+        # Kick-drift-kick leapfrog for every body that is free to move. The
+        # closing kick reuses this step's forces as the next opening kick, so
+        # each step costs a single force evaluation
+        step = dt * self._mobile
+        half_step = 0.5 * step
+        vx += ax * half_step
+        vy += ay * half_step
+        px += vx * step
+        py += vy * step
+        self.compute_accelerations()
+        vx += ax * half_step
+        vy += ay * half_step
+        
+        # Write the new state back into the bodies
+        fx = (ax * m).tolist()
+        fy = (ay * m).tolist()
+        for body, x, y, vel_x, vel_y, force_x, force_y in zip(
+                self._synced_bodies, px.tolist(), py.tolist(), vx.tolist(), vy.tolist(), fx, fy):
+            body.position.set(x, y)
+            body.velocity.set(vel_x, vel_y)
+            body.gravitational_force = Vector2D(force_x, force_y)
+            body.total_force = Vector2D(force_x, force_y)
+        
+        # Remove free bodies that left the simulation bounds
+        if self.bounds:
+            min_x, min_y, max_x, max_y = self.bounds
+            for body in self._synced_bodies:
+                if (not body.is_central_body and
+                    (body.position.x < min_x or body.position.x > max_x or
+                     body.position.y < min_y or body.position.y > max_y)):
+                    self.remove_body(body)
         
         # Update orbital parameters
         central_bodies = [b for b in self.bodies if b.is_central_body]
@@ -148,14 +443,13 @@ class OrbitalMechanicsSystem:
     def calculate_gravitational_force(self, body1: OrbitingBody, body2: OrbitingBody) -> None:
         """Calculate gravitational force between two bodies"""
         r_vector = body2.position - body1.position
-        r_magnitude = r_vector.magnitude
+        r_magnitude, force_direction = r_vector.magnitude_and_direction()
         
         if r_magnitude == 0:
             return
         
         # Newton's law of universal gravitation: F = G * m1 * m2 / r^2
         force_magnitude = self.gravitational_constant * body1.mass * body2.mass / (r_magnitude * r_magnitude)
-        force_direction = r_vector.normalize()
         force = force_direction * force_magnitude
         
         # Apply equal and opposite forces
@@ -166,7 +460,7 @@ class OrbitalMechanicsSystem:
         body2.total_force -= force
     
     def integrate_body(self, body: OrbitingBody, dt: float) -> None:
-        """Integrate body motion using Verlet integration"""
+        """Integrate a single body with a semi-implicit Euler step"""
         acceleration = body.total_force / body.mass
         
         # Update velocity and position
@@ -198,7 +492,7 @@ class OrbitalMechanicsSystem:
         velocity_direction = Vector2D(-math.sin(angle), math.cos(angle))
         velocity = velocity_direction * orbital_velocity
         
-        orbiting_body = OrbitingBody(position, velocity, orbital_mass)
+        orbiting_body = OrbitingBody(position, velocity, orbital_mass, _unsafe_share=True)
         self.add_body(orbiting_body)
         
         return orbiting_body
@@ -223,37 +517,160 @@ class OrbitalMechanicsSystem:
         velocity_direction = Vector2D(-math.sin(angle), math.cos(angle))
         velocity = velocity_direction * velocity_magnitude
         
-        orbiting_body = OrbitingBody(position, velocity, orbital_mass)
+        orbiting_body = OrbitingBody(position, velocity, orbital_mass, _unsafe_share=True)
         self.add_body(orbiting_body)
         
         return orbiting_body
 
 
+def _projectile_vector_property(x_field: str, y_field: str, doc: str) -> property:
+    """Expose a pair of projectile state arrays as a Vector2D attribute of a Projectile"""
+    def getter(self) -> Vector2D:
+        arrays = self.arrays
+        return Vector2D(float(getattr(arrays, x_field)[self.index]),
+                        float(getattr(arrays, y_field)[self.index]))
+    
+    def setter(self, value: Vector2D) -> None:
+        arrays = self.arrays
+        getattr(arrays, x_field)[self.index] = value.x
+        getattr(arrays, y_field)[self.index] = value.y
+    
+    return property(getter, setter, doc=doc)
+
+
+def _projectile_scalar_property(field: str, doc: str) -> property:
+    """Expose one projectile state array entry as a float attribute of a Projectile"""
+    def getter(self) -> float:
+        return float(getattr(self.arrays, field)[self.index])
+    
+    def setter(self, value: float) -> None:
+        getattr(self.arrays, field)[self.index] = value
+    
+    return property(getter, setter, doc=doc)
+
+
+def _projectile_drag_property(field: str, doc: str) -> property:
+    """Like _projectile_scalar_property, but keeps the cached drag constant in sync"""
+    def getter(self) -> float:
+        return float(getattr(self.arrays, field)[self.index])
+    
+    def setter(self, value: float) -> None:
+        arrays = self.arrays
+        index = self.index
+        getattr(arrays, field)[index] = value
+        arrays.drag_k[index] = 0.5 * arrays.drag_coefficient[index] * arrays.cross_sectional_area[index]
+    
+    return property(getter, setter, doc=doc)
+
+
+def _projectile_mass_property(doc: str) -> property:
+    """Like _projectile_scalar_property, but keeps the cached inverse mass in sync"""
+    def getter(self) -> float:
+        return float(self.arrays.mass[self.index])
+    
+    def setter(self, value: float) -> None:
+        arrays = self.arrays
+        arrays.mass[self.index] = value
+        arrays.inv_mass[self.index] = 1.0 / value if value != 0 else 0.0
+    
+    return property(getter, setter, doc=doc)
+
+
+def _projectile_flag_property(field: str, doc: str) -> property:
+    """Expose one projectile flag array entry as a boolean attribute of a Projectile"""
+    def getter(self) -> bool:
+        return bool(getattr(self.arrays, field)[self.index])
+    
+    def setter(self, value: bool) -> None:
+        getattr(self.arrays, field)[self.index] = value
+    
+    return property(getter, setter, doc=doc)
+
+
+class ProjectileArrays:
+    """
+    Struct-of-arrays projectile state with a growable capacity
+    """
+    
+    FIELDS = ('px', 'py', 'vx', 'vy', 'fx', 'fy', 'gravity_fx', 'gravity_fy', 'drag_fx', 'drag_fy',
+              'wind_fx', 'wind_fy', 'mass', 'inv_mass', 'drag_coefficient',
+              'cross_sectional_area', 'drag_k', 'radius', 'bounce_factor', 'ground_friction',
+              'launch_speed', 'flight_time', 'max_height', 'distance_traveled')
+    FLAGS = ('active', 'bounced')
+    
+    def __init__(self, capacity: int = 16):
+        self.capacity = 0
+        for field in self.FIELDS:
+            setattr(self, field, np.zeros(0))
+        for field in self.FLAGS:
+            setattr(self, field, np.zeros(0, dtype=bool))
+        self.reserve(capacity)
+    
+    def reserve(self, capacity: int) -> None:
+        """Grow every array to hold at least capacity projectiles"""
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity)
+        for field in self.FIELDS + self.FLAGS:
+            old = getattr(self, field)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, field, new)
+        self.capacity = capacity
+    
+    def copy_row(self, source: 'ProjectileArrays', source_index: int, index: int) -> None:
+        """Copy one projectile's state from another set of arrays"""
+        for field in self.FIELDS + self.FLAGS:
+            getattr(self, field)[index] = getattr(source, field)[source_index]
+
+
 class Projectile:
     """
     Projectile with air resistance and environmental effects
+    
+    The simulated state lives in a ProjectileArrays instance; a Projectile is a
+    view onto one index of it. A new projectile owns a single-slot store until
+    a ProjectileSystem adopts it.
     """
     
+    position = _projectile_vector_property('px', 'py', "Position")
+    velocity = _projectile_vector_property('vx', 'vy', "Velocity")
+    total_force = _projectile_vector_property('fx', 'fy', "Net force from the last update")
+    gravity_force = _projectile_vector_property('gravity_fx', 'gravity_fy', "Gravity force from the last update")
+    drag_force = _projectile_vector_property('drag_fx', 'drag_fy', "Drag force from the last update")
+    wind_force = _projectile_vector_property('wind_fx', 'wind_fy', "Wind force from the last update")
+    mass = _projectile_mass_property("Mass")
+    drag_coefficient = _projectile_drag_property('drag_coefficient', "Aerodynamic drag coefficient")
+    cross_sectional_area = _projectile_drag_property('cross_sectional_area', "Area facing the airflow")
+    radius = _projectile_scalar_property('radius', "Collision radius")
+    bounce_factor = _projectile_scalar_property('bounce_factor', "Vertical restitution on ground hits")
+    ground_friction = _projectile_scalar_property('ground_friction', "Horizontal speed kept on ground hits")
+    flight_time = _projectile_scalar_property('flight_time', "Seconds since launch")
+    max_height = _projectile_scalar_property('max_height', "Highest point reached (smallest y)")
+    distance_traveled = _projectile_scalar_property('distance_traveled', "Launch speed times flight time")
+    is_active = _projectile_flag_property('active', "False once the projectile should be removed")
+    has_bounced = _projectile_flag_property('bounced', "True after the first ground contact")
+    
     def __init__(self, position: Vector2D, velocity: Vector2D, mass: float = 1.0, 
-                 drag_coefficient: float = 0.47, cross_sectional_area: float = 0.01):
-        self.position = position.copy()
-        self.velocity = velocity.copy()
-        self.initial_velocity = velocity.copy()
+                 drag_coefficient: float = 0.47, cross_sectional_area: float = 0.01,
+                 _unsafe_share: bool = False):
+        self.arrays = ProjectileArrays(1)
+        self.index = 0
+        
+        # Position and velocity are copied into the arrays; only the launch
+        # velocity is kept as an object, shared if the caller allows it
+        self.position = position
+        self.velocity = velocity
+        self.initial_velocity = velocity if _unsafe_share else velocity.copy()
         self.mass = mass
         self.drag_coefficient = drag_coefficient
         self.cross_sectional_area = cross_sectional_area
         
-        # Forces
-        self.gravity_force = Vector2D.zero()
-        self.drag_force = Vector2D.zero()
-        self.wind_force = Vector2D.zero()
-        self.total_force = Vector2D.zero()
-        
         # Properties
         self.radius = 3.0
         self.color = (255, 200, 100)
-        self.trail_points = []
         self.max_trail_length = 100
+        self.trail_points = deque(maxlen=self.max_trail_length)
         
         # Flight data
         self.flight_time = 0.0
@@ -266,30 +683,61 @@ class Projectile:
         self.ground_friction = 0.8
         self.has_bounced = False
     
+    @property
+    def initial_velocity(self) -> Vector2D:
+        """Launch velocity; reassign it rather than changing it in place"""
+        return self._initial_velocity
+    
+    @initial_velocity.setter
+    def initial_velocity(self, velocity: Vector2D) -> None:
+        # distance_traveled is derived from the launch speed every update
+        self._initial_velocity = velocity
+        self.arrays.launch_speed[self.index] = velocity.magnitude()
+    
+    def detach(self) -> None:
+        """Move this projectile's state into a private single-slot store"""
+        arrays = ProjectileArrays(1)
+        arrays.copy_row(self.arrays, self.index, 0)
+        self.arrays = arrays
+        self.index = 0
+    
     def apply_forces(self, gravity: Vector2D, air_density: float = 1.225, 
                     wind_velocity: Vector2D = None) -> None:
         """Apply forces to the projectile"""
-        # Clear forces
-        self.gravity_force = Vector2D.zero()
-        self.drag_force = Vector2D.zero()
-        self.wind_force = Vector2D.zero()
+        arrays = self.arrays
+        index = self.index
+        mass = float(arrays.mass[index])
+        vx = float(arrays.vx[index])
+        vy = float(arrays.vy[index])
         
         # Gravity
-        self.gravity_force = gravity * self.mass
-        
-        # Air resistance (drag)
-        if self.velocity.magnitude > 0:
-            relative_velocity = self.velocity.copy()
-            if wind_velocity:
-                relative_velocity -= wind_velocity
-                self.wind_force = wind_velocity * (air_density * 0.1)  # Simplified wind effect
+        gravity_fx = gravity.x * mass
+        gravity_fy = gravity.y * mass
+        drag_fx = drag_fy = 0.0
+        wind_fx = wind_fy = 0.0
+        
+        # Air resistance (drag) against the wind-relative airflow
+        if vx * vx + vy * vy > 0:
+            if wind_velocity is not None:
+                vx -= wind_velocity.x
+                vy -= wind_velocity.y
+                wind_fx = wind_velocity.x * (air_density * 0.1)  # Simplified wind effect
+                wind_fy = wind_velocity.y * (air_density * 0.1)
             
-            drag_magnitude = 0.5 * air_density * self.drag_coefficient * self.cross_sectional_area * relative_velocity.magnitude_squared
-            drag_direction = -relative_velocity.normalize()
-            self.drag_force = drag_direction * drag_magnitude
-        
-        # Total force
-        self.total_force = self.gravity_force + self.drag_force + self.wind_force
+            # |F| = k * v^2 along -v, i.e. -v scaled by k * |v|
+            drag_scale = float(arrays.drag_k[index]) * air_density * math.sqrt(vx * vx + vy * vy)
+            drag_fx = -vx * drag_scale
+            drag_fy = -vy * drag_scale
+        
+        # Keep the components, then the total force
+        arrays.gravity_fx[index] = gravity_fx
+        arrays.gravity_fy[index] = gravity_fy
+        arrays.drag_fx[index] = drag_fx
+        arrays.drag_fy[index] = drag_fy
+        arrays.wind_fx[index] = wind_fx
+        arrays.wind_fy[index] = wind_fy
+        arrays.fx[index] = gravity_fx + drag_fx + wind_fx
+        arrays.fy[index] = gravity_fy + drag_fy + wind_fy
 
 
 class ProjectileSystem:
@@ -303,29 +751,189 @@ class ProjectileSystem:
         self.air_density = air_density
         self.wind_velocity = Vector2D.zero()
         
+        # Projectile state; projectiles[i] is a view onto index i
+        self.arrays = ProjectileArrays()
+        
         # Environment
         self.ground_level = 550
         self.obstacles = []
         
+        # Uniform grid of obstacle indices, rebuilt when the obstacle list changes
+        self.obstacle_grid: Dict[Tuple[int, int], List[int]] = {}
+        self.obstacle_grid_size = 1.0
+        self._grid_obstacles: List[PhysicsBody] = []
+        
         # Variable gravity (for different planets/environments)
         self.gravity_wells = []
+        
+        # Gravity wells as arrays, rebuilt when the well list changes
+        self.well_x = np.zeros(0)
+        self.well_y = np.zeros(0)
+        self.well_strength = np.zeros(0)
+        self.well_radius_sq = np.zeros(0)
+        self._array_wells: List[Tuple[Vector2D, float, float]] = []
     
     def add_projectile(self, projectile: Projectile) -> None:
         """Add projectile to the system"""
+        index = len(self.projectiles)
+        self.arrays.reserve(index + 1)
+        self.arrays.copy_row(projectile.arrays, projectile.index, index)
+        projectile.arrays = self.arrays
+        projectile.index = index
         self.projectiles.append(projectile)
     
     def remove_projectile(self, projectile: Projectile) -> None:
         """Remove projectile from the system"""
-        if projectile in self.projectiles:
-            self.projectiles.remove(projectile)
+        index = projectile.index
+        if (projectile.arrays is not self.arrays or index >= len(self.projectiles) or
+                self.projectiles[index] is not projectile):
+            return
+        
+        # Keep the removed projectile usable, then fill its slot with the last one
+        projectile.detach()
+        last = self.projectiles.pop()
+        if last is not projectile:
+            self.arrays.copy_row(self.arrays, last.index, index)
+            last.index = index
+            self.projectiles[index] = last
+    
+    def compact(self) -> None:
+        """Drop every inactive projectile in one pass, keeping the others in order"""
+        count = len(self.projectiles)
+        arrays = self.arrays
+        keep = np.flatnonzero(arrays.active[:count])
+        if len(keep) == count:
+            return
+        
+        for projectile in self.projectiles:
+            if not projectile.is_active:
+                projectile.detach()
+        for field in arrays.FIELDS + arrays.FLAGS:
+            column = getattr(arrays, field)
+            column[:len(keep)] = column[keep]
+        
+        self.projectiles = [self.projectiles[i] for i in keep.tolist()]
+        for index, projectile in enumerate(self.projectiles):
+            projectile.index = index
+    
+    def clear(self) -> None:
+        """Remove every projectile"""
+        for projectile in self.projectiles:
+            projectile.detach()
+        self.projectiles.clear()
     
     def update(self, dt: float) -> None:
         """Update all projectiles"""
-        for projectile in self.projectiles[:]:  # Copy list to allow removal during iteration
-            if projectile.is_active:
-                self.update_projectile(projectile, dt)
+        self.compact()
+        count = len(self.projectiles)
+        if count == 0:
+            return
+        
+        arrays = self.arrays
+        px, py = arrays.px[:count], arrays.py[:count]
+        vx, vy = arrays.vx[:count], arrays.vy[:count]
+        fx, fy = arrays.fx[:count], arrays.fy[:count]
+        mass = arrays.mass[:count]
+        inv_mass = arrays.inv_mass[:count]
+        radius = arrays.radius[:count]
+        bounced = arrays.bounced[:count]
+        
+        # Effective gravity, including the inverse-square pull of every well
+        # in range, evaluated for all (projectile, well) pairs at once
+        if self._array_wells != self.gravity_wells:
+            self.build_well_arrays()
+        dx = self.well_x[None, :] - px[:, None]
+        dy = self.well_y[None, :] - py[:, None]
+        r2 = dx * dx + dy * dy
+        in_range = (r2 < self.well_radius_sq[None, :]) & (r2 > 0)
+        inv_r3 = np.divide(self.well_strength[None, :], r2 * np.sqrt(r2), out=np.zeros_like(r2), where=in_range)
+        gx = self.gravity.x + (dx * inv_r3).sum(axis=1)
+        gy = self.gravity.y + (dy * inv_r3).sum(axis=1)
+        
+        # Gravity, quadratic drag against the relative airflow, and wind.
+        # Drag is k * |v|^2 along -v, i.e. -v scaled by k * |v|, so no
+        # direction needs normalizing
+        moving = (vx * vx + vy * vy) > 0
+        rvx = vx - self.wind_velocity.x
+        rvy = vy - self.wind_velocity.y
+        drag_scale = np.where(moving, -self.air_density * arrays.drag_k[:count] * np.sqrt(rvx * rvx + rvy * rvy), 0.0)
+        wind_scale = np.where(moving, self.air_density * 0.1, 0.0)
+        
+        # Keep each component for the per-projectile force properties
+        gravity_fx = np.multiply(gx, mass, out=arrays.gravity_fx[:count])
+        gravity_fy = np.multiply(gy, mass, out=arrays.gravity_fy[:count])
+        drag_fx = np.multiply(rvx, drag_scale, out=arrays.drag_fx[:count])
+        drag_fy = np.multiply(rvy, drag_scale, out=arrays.drag_fy[:count])
+        wind_fx = np.multiply(wind_scale, self.wind_velocity.x, out=arrays.wind_fx[:count])
+        wind_fy = np.multiply(wind_scale, self.wind_velocity.y, out=arrays.wind_fy[:count])
+        np.add(gravity_fx + drag_fx, wind_fx, out=fx)
+        np.add(gravity_fy + drag_fy, wind_fy, out=fy)
+        
+        # Integration
+        vx += fx * inv_mass * dt
+        vy += fy * inv_mass * dt
+        px += vx * dt
+        py += vy * dt
+        
+        # Update flight data
+        arrays.flight_time[:count] += dt
+        np.minimum(arrays.max_height[:count], py, out=arrays.max_height[:count])  # Min because Y increases downward
+        np.multiply(arrays.launch_speed[:count], arrays.flight_time[:count], out=arrays.distance_traveled[:count])
+        
+        # Ground collision: bounce on first contact or while still fast, else settle
+        ground_y = self.ground_level - radius
+        hit = py >= ground_y
+        if hit.any():
+            py[hit] = ground_y[hit]
+            bounce = hit & (~bounced | (vy > 50))
+            settle = hit & ~bounce
+            vy[bounce] *= -arrays.bounce_factor[:count][bounce]
+            vx[bounce] *= arrays.ground_friction[:count][bounce]
+            bounced |= bounce
+            vy[settle] = 0.0
+            vx[settle] *= 0.95  # Rolling friction
+        
+        # Obstacle collisions: reflect and push out along the contact normal,
+        # testing only obstacles registered in a cell that holds a projectile
+        if self._grid_obstacles != self.obstacles:
+            self.build_obstacle_grid()
+        size = self.obstacle_grid_size
+        cells = set(zip((px // size).astype(int).tolist(), (py // size).astype(int).tolist()))
+        candidates = sorted({i for cell in cells for i in self.obstacle_grid.get(cell, ())})
+        for i in candidates:
+            obstacle = self.obstacles[i]
+            ox, oy = obstacle.position.x, obstacle.position.y
+            if obstacle.body_type == "circle":
+                dx = px - ox
+                dy = py - oy
+                hit = dx * dx + dy * dy <= obstacle.radius * obstacle.radius
             else:
-                self.remove_projectile(projectile)
+                hit = obstacle.contains_points(px, py)
+            if not hit.any():
+                continue
+            
+            index = np.nonzero(hit)[0]
+            nx = px[index] - ox
+            ny = py[index] - oy
+            length = np.sqrt(nx * nx + ny * ny)
+            safe_length = np.where(length > 0, length, 1.0)
+            nx = np.where(length > 0, nx / safe_length, 0.0)
+            ny = np.where(length > 0, ny / safe_length, 0.0)
+            twice_dot = 2 * (vx[index] * nx + vy[index] * ny)
+            vx[index] = (vx[index] - twice_dot * nx) * 0.8
+            vy[index] = (vy[index] - twice_dot * ny) * 0.8
+            surface_distance = obstacle.radius + radius[index]
+            px[index] = ox + nx * surface_distance
+            py[index] = oy + ny * surface_distance
+        
+        # Update trails
+        for projectile, x, y in zip(self.projectiles, px.tolist(), py.tolist()):
+            projectile.trail_points.append(Vector2D(x, y))
+        
+        # Deactivate if out of bounds or too slow
+        leaving = ((py > self.ground_level + 100) | (px < -100) | (px > 900) |
+                   ((vx * vx + vy * vy < 100) & bounced))
+        arrays.active[:count] &= ~leaving
     
     def update_projectile(self, projectile: Projectile, dt: float) -> None:
         """Update individual projectile"""
@@ -333,18 +941,18 @@ class ProjectileSystem:
         effective_gravity = self.calculate_effective_gravity(projectile.position)
         projectile.apply_forces(effective_gravity, self.air_density, self.wind_velocity)
         
-        # Integration
-        acceleration = projectile.total_force / projectile.mass
-        projectile.velocity += acceleration * dt
-        projectile.position += projectile.velocity * dt
+        # Integration, straight on the projectile's array slots
+        arrays = projectile.arrays
+        index = projectile.index
+        arrays.vx[index] += arrays.fx[index] * arrays.inv_mass[index] * dt
+        arrays.vy[index] += arrays.fy[index] * arrays.inv_mass[index] * dt
+        arrays.px[index] += arrays.vx[index] * dt
+        arrays.py[index] += arrays.vy[index] * dt
         
         # Update flight data
         projectile.flight_time += dt
         projectile.max_height = min(projectile.max_height, projectile.position.y)  # Min because Y increases downward
-        projectile.distance_traveled = projectile.position.distance_to(
-            Vector2D(projectile.position.x - projectile.initial_velocity.x * projectile.flight_time, 
-                    projectile.position.y - projectile.initial_velocity.y * projectile.flight_time)
-        )
+        projectile.distance_traveled = arrays.launch_speed[index] * projectile.flight_time
         
         # Ground collision
         if projectile.position.y >= self.ground_level - projectile.radius:
@@ -356,45 +964,45 @@ class ProjectileSystem:
                 self.handle_obstacle_collision(projectile, obstacle)
         
         # Update trail
-        projectile.trail_points.append(projectile.position.copy())
-        if len(projectile.trail_points) > projectile.max_trail_length:
-            projectile.trail_points.pop(0)
+        projectile.trail_points.append(projectile.position)
         
         # Deactivate if out of bounds or too slow
         if (projectile.position.y > self.ground_level + 100 or 
             projectile.position.x < -100 or projectile.position.x > 900 or
-            (projectile.velocity.magnitude < 10 and projectile.has_bounced)):
+            (projectile.velocity.magnitude_squared() < 100 and projectile.has_bounced)):
             projectile.is_active = False
     
     def calculate_effective_gravity(self, position: Vector2D) -> Vector2D:
         """Calculate gravity including gravity wells"""
-        effective_gravity = self.gravity.copy()
+        gravity_x = self.gravity.x
+        gravity_y = self.gravity.y
         
-        for well in self.gravity_wells:
-            well_position, well_strength, well_radius = well
-            distance = position.distance_to(well_position)
+        for well_position, well_strength, well_radius in self.gravity_wells:
+            dx = well_position.x - position.x
+            dy = well_position.y - position.y
+            distance_sq = dx * dx + dy * dy
             
-            if distance < well_radius and distance > 0:
-                # Inverse square law
-                well_force_magnitude = well_strength / (distance * distance)
-                well_direction = (well_position - position).normalize()
-                well_force = well_direction * well_force_magnitude
-                effective_gravity += well_force
-        
-        return effective_gravity
+            # Range test on squared distances; one sqrt only for wells in range
+            if distance_sq < well_radius * well_radius and distance_sq > 0:
+                # Inverse square law along the unit offset: strength * d / |d|^3
+                pull = well_strength / (distance_sq * math.sqrt(distance_sq))
+                gravity_x += dx * pull
+                gravity_y += dy * pull
+        
+        return Vector2D(gravity_x, gravity_y)
     
     def handle_ground_collision(self, projectile: Projectile) -> None:
         """Handle projectile collision with ground"""
-        projectile.position.y = self.ground_level - projectile.radius
+        projectile.position = Vector2D(projectile.position.x, self.ground_level - projectile.radius)
         
-        if not projectile.has_bounced or projectile.velocity.y > 50:  # Allow small bounces
-            projectile.velocity.y *= -projectile.bounce_factor
-            projectile.velocity.x *= projectile.ground_friction
+        velocity = projectile.velocity
+        if not projectile.has_bounced or velocity.y > 50:  # Allow small bounces
+            projectile.velocity = Vector2D(velocity.x * projectile.ground_friction,
+                                           velocity.y * -projectile.bounce_factor)
             projectile.has_bounced = True
         else:
             # Stop bouncing if velocity is too low
-            projectile.velocity.y = 0
-            projectile.velocity.x *= 0.95  # Rolling friction
+            projectile.velocity = Vector2D(velocity.x * 0.95, 0.0)  # Rolling friction
     
     def check_projectile_obstacle_collision(self, projectile: Projectile, obstacle: PhysicsBody) -> bool:
         """Check collision between projectile and obstacle"""
@@ -410,10 +1018,46 @@ class ProjectileSystem:
         distance_to_surface = obstacle.radius + projectile.radius
         projectile.position = obstacle.position + collision_normal * distance_to_surface
     
+    def add_obstacle(self, obstacle: PhysicsBody) -> None:
+        """Add a static obstacle that deflects projectiles"""
+        self.obstacles.append(obstacle)
+    
+    def remove_obstacle(self, obstacle: PhysicsBody) -> None:
+        """Remove an obstacle"""
+        if obstacle in self.obstacles:
+            self.obstacles.remove(obstacle)
+    
+    def build_obstacle_grid(self) -> None:
+        """Build a uniform grid of obstacle indices for collision queries"""
+        self.obstacle_grid.clear()
+        self.obstacle_grid_size = max(2.0 * max((obstacle.radius for obstacle in self.obstacles), default=0.0), 1.0)
+        
+        # Each obstacle is registered in every cell its bounding box touches, so
+        # any point inside it finds it in the point's own cell
+        size = self.obstacle_grid_size
+        for i, obstacle in enumerate(self.obstacles):
+            min_point, max_point = obstacle.get_aabb()
+            for grid_x in range(int(min_point.x // size), int(max_point.x // size) + 1):
+                for grid_y in range(int(min_point.y // size), int(max_point.y // size) + 1):
+                    if (grid_x, grid_y) not in self.obstacle_grid:
+                        self.obstacle_grid[(grid_x, grid_y)] = []
+                    self.obstacle_grid[(grid_x, grid_y)].append(i)
+        
+        self._grid_obstacles = list(self.obstacles)
+    
     def add_gravity_well(self, position: Vector2D, strength: float, radius: float) -> None:
         """Add a gravity well that affects projectiles"""
         self.gravity_wells.append((position, strength, radius))
     
+    def build_well_arrays(self) -> None:
+        """Copy the gravity wells into the arrays used by the vectorized update"""
+        wells = self.gravity_wells
+        self.well_x = np.array([position.x for position, _, _ in wells], dtype=np.float64)
+        self.well_y = np.array([position.y for position, _, _ in wells], dtype=np.float64)
+        self.well_strength = np.array([strength for _, strength, _ in wells], dtype=np.float64)
+        self.well_radius_sq = np.array([radius * radius for _, _, radius in wells], dtype=np.float64)
+        self._array_wells = list(wells)
+    
     def launch_projectile(self, start_pos: Vector2D, velocity: Vector2D, mass: float = 1.0,
                          drag_coefficient: float = 0.47) -> Projectile:
         """Launch a new projectile"""
@@ -429,7 +1073,7 @@ class Wheel:
     
     def __init__(self, position: Vector2D, radius: float = 15.0, mass: float = 2.0):
         self.local_position = position  # Position relative to vehicle
-        self.world_position = position.copy()  # World position
+        self.world = np.array([position.x, position.y])  # World position (a row of the vehicle's array once mounted)
         self.radius = radius
         self.mass = mass
         
@@ -459,6 +1103,16 @@ class Wheel:
         
         # Visual
         self.color = (50, 50, 50)
+    
+    @property
+    def world_position(self) -> Vector2D:
+        """World position of the wheel center"""
+        return Vector2D(float(self.world[0]), float(self.world[1]))
+    
+    @world_position.setter
+    def world_position(self, value: Vector2D) -> None:
+        self.world[0] = value.x
+        self.world[1] = value.y
 
 
 class Vehicle:
@@ -490,6 +1144,14 @@ class Vehicle:
             Wheel(Vector2D(self.wheelbase/2, self.track_width/2))     # Rear right
         ]
         
+        # Wheel offsets in the body frame and world positions, one row per
+        # wheel; each wheel's world vector is a view onto its row
+        self._wheel_local = np.array([[wheel.local_position.x, wheel.local_position.y]
+                                      for wheel in self.wheels])
+        self._wheel_world = self._wheel_local.copy()
+        for wheel, row in zip(self.wheels, self._wheel_world):
+            wheel.world = row
+        
         # Engine and drivetrain
         self.engine_power = 150000.0  # Watts
         self.max_rpm = 6000.0
@@ -501,9 +1163,10 @@ class Vehicle:
         # Vehicle properties
         self.max_steering_angle = math.pi / 6  # 30 degrees
         self.brake_force = 5000.0
-        self.downforce_coefficient = 0.5
-        self.drag_coefficient = 0.3
-        self.frontal_area = 2.0
+        self._downforce_coefficient = 0.5
+        self._drag_coefficient = 0.3
+        self._frontal_area = 2.0
+        self._update_aero_constants()
         
         # Forces
         self.engine_force = Vector2D.zero()
@@ -515,7 +1178,8 @@ class Vehicle:
         
         # Visual properties
         self.color = (200, 50, 50)
-        self.trail_points = []
+        self.max_trail_length = 100
+        self.trail_points = deque(maxlen=self.max_trail_length)
         
         # Physics settings
         self.gravity = Vector2D(0, 981)
@@ -523,6 +1187,52 @@ class Vehicle:
         
         # Ground interaction
         self.ground_level = 550
+        
+        # Heading trig, recomputed only when the angle changes
+        self._heading_angle = None
+        self._heading = (1.0, 0.0)
+    
+    @property
+    def drag_coefficient(self) -> float:
+        """Aerodynamic drag coefficient"""
+        return self._drag_coefficient
+    
+    @drag_coefficient.setter
+    def drag_coefficient(self, value: float) -> None:
+        self._drag_coefficient = value
+        self._update_aero_constants()
+    
+    @property
+    def downforce_coefficient(self) -> float:
+        """Aerodynamic downforce coefficient"""
+        return self._downforce_coefficient
+    
+    @downforce_coefficient.setter
+    def downforce_coefficient(self, value: float) -> None:
+        self._downforce_coefficient = value
+        self._update_aero_constants()
+    
+    @property
+    def frontal_area(self) -> float:
+        """Area facing the airflow"""
+        return self._frontal_area
+    
+    @frontal_area.setter
+    def frontal_area(self, value: float) -> None:
+        self._frontal_area = value
+        self._update_aero_constants()
+    
+    def _update_aero_constants(self) -> None:
+        """Cache the shape terms of the drag and downforce equations"""
+        self._drag_k = 0.5 * self._drag_coefficient * self._frontal_area
+        self._downforce_k = 0.5 * self._downforce_coefficient * self._frontal_area
+    
+    def heading(self) -> Tuple[float, float]:
+        """Cosine and sine of the vehicle angle"""
+        if self.angle != self._heading_angle:
+            self._heading_angle = self.angle
+            self._heading = (math.cos(self.angle), math.sin(self.angle))
+        return self._heading
     
     def update(self, dt: float) -> None:
         """Update vehicle physics"""
@@ -552,24 +1262,18 @@ class Vehicle:
     
     def update_wheel_positions(self) -> None:
         """Update wheel world positions based on vehicle position and angle"""
-        cos_a = math.cos(self.angle)
-        sin_a = math.sin(self.angle)
+        cos_a, sin_a = self.heading()
+        rotation = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
         
-        for wheel in self.wheels:
-            # Transform local position to world position
-            local_x = wheel.local_position.x
-            local_y = wheel.local_position.y
-            
-            world_x = self.position.x + local_x * cos_a - local_y * sin_a
-            world_y = self.position.y + local_x * sin_a + local_y * cos_a
-            
-            wheel.world_position = Vector2D(world_x, world_y)
+        # Rotate every local offset at once, then translate to the body position
+        np.dot(self._wheel_local, rotation.T, out=self._wheel_world)
+        self._wheel_world += (self.position.x, self.position.y)
     
     def calculate_suspension_forces(self) -> None:
         """Calculate suspension forces for each wheel"""
-        for wheel in self.wheels:
+        for wheel, world_y in zip(self.wheels, self._wheel_world[:, 1].tolist()):
             # Check if wheel is on ground
-            ground_distance = self.ground_level - wheel.world_position.y
+            ground_distance = self.ground_level - world_y
             
             if ground_distance <= wheel.suspension_rest_length:
                 wheel.is_grounded = True
@@ -595,29 +1299,28 @@ class Vehicle:
         """Calculate engine force based on throttle input"""
         if self.throttle_input > 0:
             # Simple engine model
-            engine_torque = self.engine_power / max(self.current_rpm, 1000) * 60 / (2 * math.pi)
+            engine_torque = self.engine_power / max(self.current_rpm, 1000) * 60 / _TWO_PI
             engine_torque *= self.throttle_input
             
-            # Apply to rear wheels (rear-wheel drive)
-            rear_wheels = self.wheels[2:]  # Last two wheels are rear
-            force_per_wheel = engine_torque / len(rear_wheels)
-            
-            # Engine force in vehicle forward direction
-            self.engine_force = Vector2D.from_angle(self.angle, force_per_wheel * len(rear_wheels))
+            # Rear-wheel drive: the rear wheels share the torque, so together
+            # they push with all of it in the vehicle's forward direction
+            cos_a, sin_a = self.heading()
+            self.engine_force = Vector2D(cos_a * engine_torque, sin_a * engine_torque)
         else:
             self.engine_force = Vector2D.zero()
     
     def calculate_aerodynamic_forces(self) -> None:
         """Calculate drag and downforce"""
-        if self.velocity.magnitude > 0:
-            speed_squared = self.velocity.magnitude_squared
+        speed_squared = self.velocity.magnitude_squared()
+        if speed_squared > 0:
             
             # Drag force
-            drag_magnitude = 0.5 * self.air_density * self.drag_coefficient * self.frontal_area * speed_squared
-            self.drag_force = -self.velocity.normalize() * drag_magnitude
+            drag_magnitude = self._drag_k * self.air_density * speed_squared
+            direction_x, direction_y = self.velocity.normalize_xy()
+            self.drag_force = Vector2D(-direction_x * drag_magnitude, -direction_y * drag_magnitude)
             
             # Downforce
-            downforce_magnitude = 0.5 * self.air_density * self.downforce_coefficient * self.frontal_area * speed_squared
+            downforce_magnitude = self._downforce_k * self.air_density * speed_squared
             self.downforce = Vector2D(0, downforce_magnitude)
         else:
             self.drag_force = Vector2D.zero()
@@ -627,64 +1330,83 @@ class Vehicle:
         """Calculate tire friction forces"""
         for wheel in self.wheels:
             wheel.friction_force = Vector2D.zero()
+        
+        v_mag = self.velocity.magnitude()
+        if v_mag < 1e-6:
+            return
+        
+        # Heading, speed and load terms are shared by every wheel
+        inv_v_mag = 1.0 / v_mag
+        cos_a, sin_a = self.heading()
+        forward = Vector2D(cos_a, sin_a)
+        lateral = Vector2D(-sin_a, cos_a)
+        longitudinal_velocity = self.velocity.dot(forward)
+        lateral_velocity = self.velocity.dot(lateral)
+        rolling_direction = self.velocity * -inv_v_mag
+        shared_load = (self.mass * self.gravity.magnitude() + self.downforce.magnitude()) / len(self.wheels)
+        
+        for wheel in self.wheels:
+            if not wheel.is_grounded:
+                continue
             
-            if wheel.is_grounded:
-                # Normal force (from suspension + downforce + gravity)
-                normal_force = wheel.suspension_force + (self.mass * self.gravity.magnitude / len(self.wheels))
-                normal_force += self.downforce.magnitude / len(self.wheels)
-                
-                # Longitudinal friction (acceleration/braking)
-                longitudinal_velocity = self.velocity.dot(Vector2D.from_angle(self.angle))
-                if abs(longitudinal_velocity) > 0.1:
-                    longitudinal_friction = -longitudinal_velocity * wheel.longitudinal_friction * normal_force / self.velocity.magnitude
-                    wheel.friction_force += Vector2D.from_angle(self.angle, longitudinal_friction)
-                
-                # Lateral friction (cornering)
-                lateral_velocity = self.velocity.dot(Vector2D.from_angle(self.angle + math.pi/2))
-                if abs(lateral_velocity) > 0.1:
-                    lateral_friction = -lateral_velocity * wheel.lateral_friction * normal_force / self.velocity.magnitude
-                    wheel.friction_force += Vector2D.from_angle(self.angle + math.pi/2, lateral_friction)
-                
-                # Rolling resistance
-                if self.velocity.magnitude > 0:
-                    rolling_resistance = -self.velocity.normalize() * wheel.rolling_resistance * normal_force
-                    wheel.friction_force += rolling_resistance
+            # Normal force (from suspension + downforce + gravity)
+            normal_force = wheel.suspension_force + shared_load
+            
+            # Rolling resistance
+            friction_force = rolling_direction * (wheel.rolling_resistance * normal_force)
+            
+            # Longitudinal friction (acceleration/braking)
+            if abs(longitudinal_velocity) > 0.1:
+                friction_force += forward * (-longitudinal_velocity * wheel.longitudinal_friction * normal_force * inv_v_mag)
+            
+            # Lateral friction (cornering)
+            if abs(lateral_velocity) > 0.1:
+                friction_force += lateral * (-lateral_velocity * wheel.lateral_friction * normal_force * inv_v_mag)
+            
+            wheel.friction_force = friction_force
     
     def apply_steering(self) -> None:
         """Apply steering to front wheels"""
         if abs(self.steering_input) > 0.01:
-            steering_angle = self.steering_input * self.max_steering_angle
+            # Every grounded front wheel pushes sideways with the same force
+            steering_force_magnitude = self.velocity.magnitude() * self.steering_input * 100
+            cos_a, sin_a = self.heading()
+            steering_force = Vector2D(-sin_a * steering_force_magnitude, cos_a * steering_force_magnitude)
             
-            # Ackermann steering geometry (simplified)
             front_wheels = self.wheels[:2]  # First two wheels are front
             for wheel in front_wheels:
                 if wheel.is_grounded:
-                    # Calculate steering force
-                    steering_force_magnitude = abs(self.velocity.magnitude) * self.steering_input * 100
-                    steering_force = Vector2D.from_angle(self.angle + math.pi/2, steering_force_magnitude)
                     wheel.friction_force += steering_force
     
     def integrate_motion(self, dt: float) -> None:
         """Integrate vehicle motion"""
-        # Sum all forces
-        self.total_force = self.engine_force + self.drag_force
-        self.total_torque = 0.0
+        # Sum all forces and wheel torques in plain floats
+        force_x = self.engine_force.x + self.drag_force.x
+        force_y = self.engine_force.y + self.drag_force.y
+        torque = 0.0
+        position_x = self.position.x
+        position_y = self.position.y
         
         # Add forces from wheels
-        for wheel in self.wheels:
-            self.total_force += wheel.friction_force + wheel.suspension_force_vector
+        for wheel, (world_x, world_y) in zip(self.wheels, self._wheel_world.tolist()):
+            friction = wheel.friction_force
+            suspension = wheel.suspension_force_vector
+            force_x += friction.x + suspension.x
+            force_y += friction.y + suspension.y
             
-            # Calculate torque from wheel forces
-            r = wheel.world_position - self.position
-            self.total_torque += r.cross(wheel.friction_force)
+            # Torque from the friction force about the body center (r x F)
+            torque += (world_x - position_x) * friction.y - (world_y - position_y) * friction.x
         
         # Add gravity
-        self.total_force += self.gravity * self.mass
+        force_x += self.gravity.x * self.mass
+        force_y += self.gravity.y * self.mass
+        self.total_force = Vector2D(force_x, force_y)
+        self.total_torque = torque
         
         # Update linear motion
-        acceleration = self.total_force / self.mass
-        self.velocity += acceleration * dt
-        self.position += self.velocity * dt
+        velocity_x = self.velocity.x + force_x / self.mass * dt
+        velocity_y = self.velocity.y + force_y / self.mass * dt
+        self.position = Vector2D(position_x + velocity_x * dt, position_y + velocity_y * dt)
         
         # Update angular motion
         angular_acceleration = self.total_torque / self.moment_of_inertia
@@ -692,21 +1414,20 @@ class Vehicle:
         self.angle += self.angular_velocity * dt
         
         # Apply damping
-        self.velocity *= 0.999
+        self.velocity = Vector2D(velocity_x * 0.999, velocity_y * 0.999)
         self.angular_velocity *= 0.98
         
-        # Update RPM based on speed (simplified)
-        self.current_rpm = 800 + abs(self.velocity.magnitude) * 50  # Idle + speed factor
-        self.current_rpm = clamp(self.current_rpm, 0, self.max_rpm)
+        # Update RPM based on speed (simplified); it never drops below idle,
+        # so only the redline needs clamping
+        rpm = 800 + self.velocity.magnitude() * 50  # Idle + speed factor
+        self.current_rpm = rpm if rpm < self.max_rpm else self.max_rpm
     
     def update_trail(self) -> None:
         """Update vehicle trail"""
         self.trail_points.append(self.position.copy())
-        if len(self.trail_points) > 100:
-            self.trail_points.pop(0)
     
     def set_input(self, throttle: float, brake: float, steering: float) -> None:
         """Set vehicle control inputs"""
-        self.throttle_input = clamp(throttle, 0.0, 1.0)
-        self.brake_input = clamp(brake, 0.0, 1.0)
-        self.steering_input = clamp(steering, -1.0, 1.0)
+        self.throttle_input = 0.0 if throttle < 0.0 else (1.0 if throttle > 1.0 else throttle)
+        self.brake_input = 0.0 if brake < 0.0 else (1.0 if brake > 1.0 else brake)
+        self.steering_input = -1.0 if steering < -1.0 else (1.0 if steering > 1.0 else steering)
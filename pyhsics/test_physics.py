@@ -7,19 +7,25 @@ import unittest
 import math
 import sys
 import os
+import time
+
+import numpy as np
 
 # Add the physics directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from vector2d import Vector2D
-from physics_body import PhysicsBody
+from numba_support import NUMBA_AVAILABLE
+from physics_body import BODY_HAS_BBOX, BODY_HAS_FORCE, BODY_HAS_SLEEP, PhysicsBody, integrate_array
 from collision_detection import CollisionDetector, SpatialHash
+from sap_broadphase import SweepAndPrune, sweep_and_prune
 from collision_resolution import CollisionResolver, ConstraintSolver, SpringJoint
 from particle_system import FluidSystem, Particle
-from soft_body_physics import SoftBody, RagdollSystem
-from specialized_physics import OrbitalMechanicsSystem, Vehicle, ProjectileSystem
-from platformer_physics import PlatformerWorld, PlatformerCharacter
-from visual_effects import PerformanceProfiler, VisualEffects
+from soft_body_physics import SoftBody, RagdollJoint, RagdollSystem
+from specialized_physics import (BarnesHutTree, OrbitalMechanicsSystem, OrbitingBody, Vehicle, Projectile,
+                                 ProjectileSystem, _make_nbody_kernel)
+from platformer_physics import Platform, PlatformType, PlatformerWorld, PlatformerCharacter
+from visual_effects import DebugRenderer, PerformanceProfiler, SpawnRing, VisualEffects, optimize_physics_bodies
 
 
 class TestVector2D(unittest.TestCase):
@@ -124,7 +130,21 @@ class TestPhysicsBody(unittest.TestCase):
         expected_velocity = initial_velocity + impulse / self.body.mass
         self.assertAlmostEqual(self.body.velocity.x, expected_velocity.x)
         self.assertAlmostEqual(self.body.velocity.y, expected_velocity.y)
-        
+    
+    def test_batch_apply_impulse(self):
+        """Test applying impulses to several bodies at once"""
+        light = PhysicsBody(Vector2D(0, 0), Vector2D(5, 0), mass=2.0)
+        wall = PhysicsBody(Vector2D(0, 0), Vector2D(0, 0), mass=1.0, is_static=True)
+        bodies = [self.body, light, wall]
+        expected = [body.velocity + impulse * body.inv_mass
+                    for body, impulse in zip(bodies, [Vector2D(10, 0), Vector2D(0, -4), Vector2D(3, 3)])]
+        
+        PhysicsBody.batch_apply_impulse(bodies, [[10, 0], [0, -4], [3, 3]])
+        
+        for body, velocity in zip(bodies, expected):
+            self.assertAlmostEqual(body.velocity.x, velocity.x)
+            self.assertAlmostEqual(body.velocity.y, velocity.y)
+    
     def test_integration(self):
         """Test physics integration"""
         dt = 1.0 / 60.0  # 60 FPS
@@ -148,7 +168,32 @@ class TestPhysicsBody(unittest.TestCase):
         
         # Check position changed
         self.assertNotEqual(self.body.position.x, initial_position.x)
+    
+    def test_fused_integration(self):
+        """Test that the fused integrators match the separate passes"""
+        dt = 1.0 / 60.0
+        fused = PhysicsBody(Vector2D(100, 100), Vector2D(10, 0), mass=1.0, radius=20)
+        for body in (self.body, fused):
+            body.apply_force(Vector2D(60, -30))
         
+        self.body.integrate_forces(dt)
+        self.body.integrate_velocity(dt)
+        fused.integrate(dt)
+        
+        self.assertAlmostEqual(fused.velocity.x, self.body.velocity.x)
+        self.assertAlmostEqual(fused.velocity.y, self.body.velocity.y)
+        self.assertAlmostEqual(fused.position.x, self.body.position.x)
+        self.assertAlmostEqual(fused.position.y, self.body.position.y)
+        self.assertEqual(fused.force.x, 0)
+        
+        # Same step on array storage
+        forces = np.array([[60.0, -30.0]])
+        velocities = np.array([[10.0, 0.0]])
+        positions = np.array([[100.0, 100.0]])
+        integrate_array(forces, velocities, positions, np.array([1.0]), dt)
+        self.assertAlmostEqual(velocities[0, 0], fused.velocity.x)
+        self.assertAlmostEqual(positions[0, 1], fused.position.y)
+    
     def test_polygon_vertices(self):
         """Test polygon vertex setting"""
         vertices = [
@@ -234,6 +279,29 @@ class TestCollisionDetection(unittest.TestCase):
         self.assertTrue(
             any((bodies[0] in pair and bodies[1] in pair) for pair in pair_bodies)
         )
+    
+    def test_sweep_and_prune(self):
+        """Test sweep-and-prune broad phase"""
+        bodies = [
+            PhysicsBody(Vector2D(0, 0), mass=1.0, radius=10, body_type="circle"),
+            PhysicsBody(Vector2D(15, 5), mass=1.0, radius=10, body_type="circle"),
+            PhysicsBody(Vector2D(15, 100), mass=1.0, radius=10, body_type="circle"),
+            PhysicsBody(Vector2D(200, 0), mass=1.0, radius=10, body_type="circle")
+        ]
+        
+        # Only the first two boxes overlap on both axes
+        pairs = sweep_and_prune(bodies)
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual({id(body) for body in pairs[0]}, {id(bodies[0]), id(bodies[1])})
+        
+        # The incremental form repairs its order as bodies cross
+        broad_phase = SweepAndPrune()
+        broad_phase.rebuild(bodies)
+        broad_phase.get_potential_collisions()
+        bodies[3].position = Vector2D(10, 100)
+        broad_phase.rebuild(bodies)
+        pairs = broad_phase.get_potential_collisions()
+        self.assertEqual(len(pairs), 2)
 
 
 class TestCollisionResolution(unittest.TestCase):
@@ -383,6 +451,40 @@ class TestSoftBodyPhysics(unittest.TestCase):
         self.assertTrue(
             initial_pos.equals(self.soft_body.mass_points[0].position, tolerance=0.01)
         )
+        
+    def test_ragdoll_joint_changes_repacked(self):
+        """Test that the compiled joint solver sees limit and anchor changes"""
+        ragdoll = RagdollSystem(Vector2D(400, 300))
+        ragdoll.solve_joints_compiled()
+        
+        joint = ragdoll.joints[1]
+        joint.set_angle_limits(-0.01, 0.01)
+        joint.local_anchor_b = Vector2D(12, 3)
+        ragdoll.solve_joints_compiled()
+        self.assertEqual(ragdoll.joint_min_angle[1], -0.01)
+        self.assertEqual(ragdoll.joint_max_angle[1], 0.01)
+        self.assertEqual((ragdoll.joint_anchor_bx[1], ragdoll.joint_anchor_by[1]), (12, 3))
+        
+        # Joints swapped in place are repacked too
+        ragdoll.joints[2] = RagdollJoint(ragdoll.bones[0], ragdoll.bones[5], Vector2D(1, 2), Vector2D(3, 4))
+        ragdoll.solve_joints_compiled()
+        self.assertEqual((ragdoll.joint_a[2], ragdoll.joint_b[2]), (0, 5))
+        self.assertFalse(ragdoll.joint_has_limits[2])
+        
+    def test_ragdoll_impulse_picks_new_and_moved_bones(self):
+        """Test that impulse picking sees bones added or moved after the grid was built"""
+        ragdoll = RagdollSystem(Vector2D(400, 300))
+        ragdoll.apply_impulse_at_point(Vector2D(400, 300), Vector2D(0, 0))
+        
+        bone = ragdoll.add_bone(Vector2D(700, 100), 30)
+        ragdoll.apply_impulse_at_point(Vector2D(700, 100), Vector2D(100, 0))
+        self.assertEqual(bone.force.x, 100)
+        
+        bone.position = Vector2D(100, 500)
+        bone.angle = math.pi / 2
+        bone.update_endpoints()
+        ragdoll.apply_impulse_at_point(Vector2D(100, 510), Vector2D(100, 0))
+        self.assertEqual(bone.force.x, 200)
 
 
 class TestSpecializedPhysics(unittest.TestCase):
@@ -414,6 +516,71 @@ class TestSpecializedPhysics(unittest.TestCase):
         # Planet should have some velocity (orbital motion)
         self.assertGreater(planet.velocity.magnitude(), 0)
         
+    def test_orbital_edits_between_steps(self):
+        """Test that body edits between orbital steps are honoured"""
+        orbital_system = OrbitalMechanicsSystem()
+        sun = OrbitingBody(Vector2D(400, 300), Vector2D(0, 0), 1000.0, is_central_body=True)
+        planet = OrbitingBody(Vector2D(500, 300), Vector2D(0, 800), 1.0)
+        orbital_system.add_body(sun)
+        orbital_system.add_body(planet)
+        
+        dt = 1.0 / 60.0
+        orbital_system.update(dt)
+        orbital_system.update(dt)
+        
+        # Move, stop and reweigh the planet, then step once more
+        planet.position = Vector2D(100, 100)
+        planet.velocity.set(0.0, 0.0)
+        planet.mass = 50.0
+        orbital_system.update(dt)
+        
+        # It should fall from its new spot, not resume the old orbit
+        self.assertLess(planet.position.distance_to(Vector2D(100, 100)), 1.0)
+        self.assertLess(planet.velocity.magnitude(), 20.0)
+        self.assertGreater(planet.velocity.dot(sun.position - planet.position), 0)
+        
+        # The force on it reflects the new mass
+        distance = planet.position.distance_to(sun.position)
+        expected_force = orbital_system.gravitational_constant * 1000.0 * 50.0 / (distance * distance)
+        self.assertAlmostEqual(planet.gravitational_force.magnitude() / expected_force, 1.0, places=3)
+        
+    @unittest.skipUnless(NUMBA_AVAILABLE, "Barnes-Hut kernels need Numba")
+    def test_barnes_hut_accuracy(self):
+        """Test Barnes-Hut accelerations against direct summation"""
+        G = 6.674e-11 * 1e15
+        eps2 = 1.0
+        direct = _make_nbody_kernel(G, eps2)
+        
+        def relative_errors(px, py, m):
+            ax, ay = np.zeros(len(px)), np.zeros(len(px))
+            direct(px, py, m, ax, ay)
+            bx, by = np.zeros(len(px)), np.zeros(len(px))
+            BarnesHutTree(px, py, m).compute_accelerations(px, py, G, eps2, 0.5, bx, by)
+            self.assertTrue(np.isfinite(bx).all() and np.isfinite(by).all())
+            return np.hypot(bx - ax, by - ay) / np.hypot(ax, ay)
+        
+        rng = np.random.default_rng(7)
+        n = 1000
+        px = rng.uniform(0, 1000, n)
+        py = rng.uniform(0, 1000, n)
+        m = rng.uniform(1, 10, n)
+        errors = relative_errors(px, py, m)
+        self.assertLess(np.median(errors), 0.02)
+        self.assertLess(np.percentile(errors, 99), 0.2)
+        
+        # Coincident bodies cannot be split and end in one depth-capped leaf
+        px[:6] = 500.0
+        py[:6] = 500.0
+        errors = relative_errors(px, py, m)
+        self.assertLess(np.median(errors), 0.02)
+        self.assertLess(errors[:6].max(), 0.02)
+        
+        # Nothing but coincident bodies and one other
+        errors = relative_errors(np.array([10.0, 10.0, 10.0, 10.0, 400.0]),
+                                 np.array([20.0, 20.0, 20.0, 20.0, 300.0]),
+                                 np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+        self.assertLess(errors.max(), 1e-9)
+        
     def test_vehicle_physics(self):
         """Test vehicle physics"""
         vehicle = Vehicle(Vector2D(200, 400), mass=1200.0)
@@ -459,6 +626,99 @@ class TestSpecializedPhysics(unittest.TestCase):
         projectile = projectile_system.projectiles[-1]
         self.assertTrue(projectile.is_active)
         self.assertGreater(projectile.velocity.magnitude(), 0)
+        
+    def test_projectile_distance_traveled(self):
+        """Test that distance traveled is the launch speed times the flight time"""
+        projectile_system = ProjectileSystem(gravity=Vector2D(0, 980))
+        projectile_system.wind_velocity = Vector2D(30, 0)
+        launched = projectile_system.launch_projectile(Vector2D(100, 300), Vector2D(120, -160))
+        standalone = Projectile(Vector2D(100, 300), Vector2D(120, -160))
+        
+        dt = 1.0 / 60.0
+        for _ in range(20):
+            projectile_system.update(dt)
+            projectile_system.update_projectile(standalone, dt)
+        
+        for projectile in (launched, standalone):
+            self.assertAlmostEqual(projectile.distance_traveled, 200 * projectile.flight_time, places=6)
+            self.assertAlmostEqual(projectile.flight_time, 20 * dt, places=9)
+        
+    def test_projectile_force_components(self):
+        """Test that system updates fill in each projectile's force components"""
+        projectile_system = ProjectileSystem(gravity=Vector2D(0, 980))
+        projectile_system.wind_velocity = Vector2D(30, -5)
+        projectile_system.add_gravity_well(Vector2D(300, 300), 5000.0, 400.0)
+        projectiles = [projectile_system.launch_projectile(Vector2D(100 + 50 * i, 400),
+                                                           Vector2D(80, -150 - 20 * i), mass=1.0 + i)
+                       for i in range(3)]
+        
+        dt = 1.0 / 60.0
+        for _ in range(10):
+            # The standalone path, from the same state, gives the expected forces
+            expected = []
+            for projectile in projectiles:
+                reference = Projectile(projectile.position, projectile.velocity, projectile.mass)
+                reference.apply_forces(projectile_system.calculate_effective_gravity(projectile.position),
+                                       projectile_system.air_density, projectile_system.wind_velocity)
+                expected.append(reference)
+            
+            projectile_system.update(dt)
+            
+            for projectile, reference in zip(projectiles, expected):
+                for name in ('gravity_force', 'drag_force', 'wind_force', 'total_force'):
+                    actual = getattr(projectile, name)
+                    wanted = getattr(reference, name)
+                    self.assertAlmostEqual(actual.x, wanted.x, places=6)
+                    self.assertAlmostEqual(actual.y, wanted.y, places=6)
+                self.assertNotEqual(projectile.gravity_force.y, 0)
+                self.assertNotEqual(projectile.drag_force.x, 0)
+    
+    def test_projectile_removal_bookkeeping(self):
+        """Test that removal and compaction keep every projectile on its own array row"""
+        projectile_system = ProjectileSystem(gravity=Vector2D(0, 980))
+        projectiles = [projectile_system.launch_projectile(Vector2D(100 + 50 * i, 300),
+                                                           Vector2D(60, -100 - 10 * i), mass=1.0 + i)
+                       for i in range(8)]
+        
+        # Remove from the middle (the last one fills the slot) and from the end
+        removed = [projectiles[2], projectiles[6]]
+        snapshots = [(p.position, p.velocity, p.mass) for p in removed]
+        for projectile in removed:
+            projectile_system.remove_projectile(projectile)
+        self.assertEqual(len(projectile_system.projectiles), 6)
+        for index, projectile in enumerate(projectile_system.projectiles):
+            self.assertEqual(projectile.index, index)
+            self.assertEqual(projectile.mass, 1.0 + projectiles.index(projectile))
+        
+        # Deactivate two more; the next update compacts them away
+        deactivated = [projectiles[0], projectiles[5]]
+        for projectile in deactivated:
+            projectile.is_active = False
+        removed += deactivated
+        snapshots += [(p.position, p.velocity, p.mass) for p in deactivated]
+        
+        projectile_system.update(1.0 / 60.0)
+        
+        arrays = projectile_system.arrays
+        survivors = [p for p in projectiles if p not in removed]
+        self.assertCountEqual(projectile_system.projectiles, survivors)
+        for index, projectile in enumerate(projectile_system.projectiles):
+            self.assertIs(projectile.arrays, arrays)
+            self.assertEqual(projectile.index, index)
+            self.assertEqual(projectile.mass, 1.0 + projectiles.index(projectile))
+            self.assertEqual(projectile.position.x, arrays.px[index])
+            self.assertEqual(projectile.position.y, arrays.py[index])
+            self.assertEqual(projectile.velocity.x, arrays.vx[index])
+            self.assertGreater(projectile.flight_time, 0)
+        
+        # Removed projectiles keep the state they had when they left
+        for projectile, (position, velocity, mass) in zip(removed, snapshots):
+            self.assertIsNot(projectile.arrays, arrays)
+            self.assertEqual(projectile.index, 0)
+            self.assertEqual(projectile.position, position)
+            self.assertEqual(projectile.velocity, velocity)
+            self.assertEqual(projectile.mass, mass)
+            self.assertEqual(projectile.flight_time, 0)
 
 
 class TestPlatformerPhysics(unittest.TestCase):
@@ -496,6 +756,52 @@ class TestPlatformerPhysics(unittest.TestCase):
         
         # Should have created some platforms
         self.assertGreater(len(self.world.platforms), 0)
+        
+    def test_platforms_in_range(self):
+        """Test the platform broadphase against wide, moving and late platforms"""
+        world = self.world
+        left = Platform(Vector2D(0, 500), Vector2D(50, 20))
+        moving = Platform(Vector2D(600, 300), Vector2D(80, 20), PlatformType.MOVING)
+        moving.set_move_path([Vector2D(600, 300), Vector2D(100, 300)], speed=200.0, wait_duration=0.0)
+        wide = Platform(Vector2D(-100, 450), Vector2D(700, 20))
+        right = Platform(Vector2D(700, 500), Vector2D(50, 20))
+        for platform in (left, moving, wide, right):
+            world.add_platform(platform)
+        
+        def in_range(min_x, max_x):
+            # Candidates may include extra platforms but keep the list order
+            found = world.get_platforms_in_range(min_x, max_x)
+            self.assertEqual(found, [p for p in world.platforms if p in found])
+            return found
+        
+        # The wide platform starts left of the query but still reaches it
+        found = in_range(300, 320)
+        self.assertIn(wide, found)
+        self.assertIn(moving, found)
+        self.assertNotIn(right, found)
+        self.assertNotIn(right, in_range(-10, 5))
+        
+        # A character above the wide platform lands on it
+        self.character.position.set(300, 420)
+        for _ in range(60):
+            world.update(1.0 / 60.0)
+        self.assertTrue(self.character.is_grounded)
+        self.assertAlmostEqual(self.character.position.y + self.character.size.y / 2, 450, places=3)
+        
+        # The moving platform has left its start but is still returned
+        self.assertLess(moving.position.x, 600)
+        self.assertIn(moving, in_range(-10, 5))
+        
+        # Platforms added or swapped in after the index was built are found
+        late = Platform(Vector2D(310, 200), Vector2D(20, 20))
+        world.add_platform(late)
+        self.assertIn(late, in_range(300, 320))
+        replacement = Platform(Vector2D(305, 100), Vector2D(20, 20))
+        world.platforms[0] = replacement
+        world.update(1.0 / 60.0)
+        found = in_range(300, 320)
+        self.assertIn(replacement, found)
+        self.assertNotIn(left, found)
 
 
 class TestPerformanceProfiler(unittest.TestCase):
@@ -565,6 +871,32 @@ class TestVisualEffects(unittest.TestCase):
         # Should have created particles
         self.assertGreater(len(self.effects.effect_particles), initial_particle_count)
         
+    def test_queued_effects(self):
+        """Test effects queued from another thread"""
+        import threading
+        
+        def produce():
+            for i in range(50):
+                self.effects.queue_collision_effect(Vector2D(i, i), intensity=1.0)
+        
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join()
+        
+        # Nothing spawns until the queue is drained by update
+        self.assertEqual(self.effects.effect_count, 0)
+        self.effects.update(0.0)
+        self.assertEqual(self.effects.effect_count, 500)
+        
+        # A full ring rejects events instead of overwriting them
+        ring = SpawnRing(capacity=4)
+        self.assertTrue(all(ring.try_enqueue((i,)) for i in range(4)))
+        self.assertFalse(ring.try_enqueue((4,)))
+        self.assertEqual(ring.try_dequeue(), (0,))
+        self.assertTrue(ring.try_enqueue((4,)))
+        self.assertEqual(ring.drain(), [(1,), (2,), (3,), (4,)])
+        self.assertIsNone(ring.try_dequeue())
+        
     def test_screen_effects(self):
         """Test screen effects"""
         # Add screen shake
@@ -578,6 +910,57 @@ class TestVisualEffects(unittest.TestCase):
         
         self.assertEqual(self.effects.screen_flash_color, (255, 255, 255))
         self.assertEqual(self.effects.screen_flash_alpha, 100)
+        
+    def test_body_capabilities(self):
+        """Test that bodies take the debug and sleep branches their members allow"""
+        import types
+        import pygame
+        pygame.font.init()
+        
+        plain = PhysicsBody(position=Vector2D(100, 100))
+        self.assertEqual(plain.caps, 0)
+        
+        # A body class carrying every optional member: the instance attribute
+        # is declared, the class members are picked up on their own
+        class FullBody(PhysicsBody):
+            caps = BODY_HAS_FORCE
+            is_sleeping = False
+            
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.accumulated_force = Vector2D(1000, 0)
+            
+            def get_bounding_box(self):
+                return (60, 60, 140, 140)
+        
+        body = FullBody(position=Vector2D(100, 100))
+        self.assertEqual(body.caps, BODY_HAS_FORCE | BODY_HAS_BBOX | BODY_HAS_SLEEP)
+        
+        # Force vector and bounding box are drawn only for the capable body
+        renderer = DebugRenderer(pygame.font.Font(None, 20))
+        renderer.show_velocity_vectors = False
+        renderer.show_physics_info = False
+        screen = pygame.Surface((200, 200))
+        renderer.render_physics_body_debug(screen, body)
+        self.assertEqual(tuple(screen.get_at((105, 100)))[:3], renderer.force_color)
+        self.assertEqual(tuple(screen.get_at((60, 100)))[:3], renderer.bbox_color)
+        
+        screen.fill((0, 0, 0))
+        renderer.render_physics_body_debug(screen, plain)
+        self.assertEqual(tuple(screen.get_at((105, 100)))[:3], (0, 0, 0))
+        self.assertEqual(tuple(screen.get_at((60, 100)))[:3], (0, 0, 0))
+        
+        # Distant slow bodies with a sleep flag are put to sleep, duck-typed
+        # bodies without caps included, and woken once in view
+        duck = types.SimpleNamespace(position=Vector2D(100, 100), velocity=Vector2D(0, 0), is_sleeping=False)
+        visible, sleeping = optimize_physics_bodies([body, plain, duck], Vector2D(5000, 5000), (800, 600))
+        self.assertEqual(visible, [])
+        self.assertEqual(sleeping, [body, duck])
+        self.assertTrue(body.is_sleeping and duck.is_sleeping)
+        
+        visible, sleeping = optimize_physics_bodies([body, plain, duck], Vector2D(100, 100), (800, 600))
+        self.assertEqual(len(visible), 3)
+        self.assertFalse(body.is_sleeping or duck.is_sleeping)
 
 
 def run_performance_benchmark():
@@ -600,24 +983,24 @@ def run_performance_benchmark():
         )
         bodies.append(body)
     
-    # Time collision detection
+    # Time collision detection: spatial hash broad phase, then the narrow
+    # phase on candidate pairs only (the same path the demo uses)
+    spatial_hash = SpatialHash(cell_size=50)
     start_time = time.time()
     
+    spatial_hash.rebuild(bodies)
     collision_count = 0
-    for i in range(len(bodies)):
-        for j in range(i + 1, len(bodies)):
-            manifold = detector.detect_collision(bodies[i], bodies[j])
-            if manifold:
-                collision_count += 1
+    for body_a, body_b in spatial_hash.get_potential_collisions():
+        manifold = detector.detect_collision(body_a, body_b)
+        if manifold:
+            collision_count += 1
     
     end_time = time.time()
     
     print(f"Collision Detection: {len(bodies)} bodies, {collision_count} collisions")
     print(f"Time: {(end_time - start_time) * 1000:.2f}ms")
     
-    # Benchmark spatial hashing
-    spatial_hash = SpatialHash(cell_size=50)
-    
+    # Benchmark spatial hashing on its own
     start_time = time.time()
     spatial_hash.rebuild(bodies)
     collision_pairs = spatial_hash.get_potential_collisions()
@@ -626,6 +1009,14 @@ def run_performance_benchmark():
     print(f"Spatial Hash: {len(collision_pairs)} potential pairs")
     print(f"Time: {(end_time - start_time) * 1000:.2f}ms")
     
+    # Benchmark sweep-and-prune, which suits the diagonal arrangement
+    start_time = time.time()
+    collision_pairs = sweep_and_prune(bodies)
+    end_time = time.time()
+    
+    print(f"Sweep and Prune: {len(collision_pairs)} potential pairs")
+    print(f"Time: {(end_time - start_time) * 1000:.2f}ms")
+    
     # Benchmark fluid simulation
     fluid_system = FluidSystem()
     fluid_system.create_fluid_block(Vector2D(100, 100), width=10, height=10, spacing=4.0)
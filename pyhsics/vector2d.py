@@ -6,15 +6,23 @@ Provides comprehensive vector operations for physics calculations
 import math
 from typing import Union, Tuple
 
+# Per-component tolerance for vector equality
+EPS = 1e-10
+
 
 class Vector2D:
     """
     2D Vector class with comprehensive mathematical operations
+    
+    Components are stored as given, without conversion, so callers pass plain
+    ints or floats (use .tolist() or float() on NumPy scalars).
     """
     
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float = 0.0, y: float = 0.0):
-        self.x = float(x)
-        self.y = float(y)
+        self.x = x
+        self.y = y
     
     # Basic operations
     def __add__(self, other: 'Vector2D') -> 'Vector2D':
@@ -26,8 +34,7 @@ class Vector2D:
     def __mul__(self, scalar: float) -> 'Vector2D':
         return Vector2D(self.x * scalar, self.y * scalar)
     
-    def __rmul__(self, scalar: float) -> 'Vector2D':
-        return self.__mul__(scalar)
+    __rmul__ = __mul__
     
     def __truediv__(self, scalar: float) -> 'Vector2D':
         if scalar == 0:
@@ -38,7 +45,7 @@ class Vector2D:
         return Vector2D(-self.x, -self.y)
     
     def __eq__(self, other: 'Vector2D') -> bool:
-        return abs(self.x - other.x) < 1e-10 and abs(self.y - other.y) < 1e-10
+        return self is other or (abs(self.x - other.x) < EPS and abs(self.y - other.y) < EPS)
     
     def __repr__(self) -> str:
         return f"Vector2D({self.x:.3f}, {self.y:.3f})"
@@ -47,17 +54,14 @@ class Vector2D:
         return f"({self.x:.3f}, {self.y:.3f})"
     
     # Vector properties
-    @property
     def magnitude(self) -> float:
         """Calculate the magnitude (length) of the vector"""
-        return math.sqrt(self.x * self.x + self.y * self.y)
+        return math.hypot(self.x, self.y)
     
-    @property
     def magnitude_squared(self) -> float:
         """Calculate the squared magnitude (faster than magnitude)"""
         return self.x * self.x + self.y * self.y
     
-    @property
     def angle(self) -> float:
         """Get the angle of the vector in radians"""
         return math.atan2(self.y, self.x)
@@ -65,14 +69,38 @@ class Vector2D:
     # Vector operations
     def normalize(self) -> 'Vector2D':
         """Return a normalized version of this vector"""
-        mag = self.magnitude
+        mag = self.magnitude()
         if mag == 0:
             return Vector2D(0, 0)
-        return Vector2D(self.x / mag, self.y / mag)
+        inv = 1.0 / mag
+        return Vector2D(self.x * inv, self.y * inv)
     
-    def normalized(self) -> 'Vector2D':
-        """Return a normalized copy of this vector"""
-        return self.normalize()
+    normalized = normalize
+    
+    def magnitude_and_direction(self) -> Tuple[float, 'Vector2D']:
+        """Return the magnitude and the normalized vector from a single sqrt"""
+        mag = self.magnitude()
+        if mag == 0:
+            return 0.0, Vector2D(0, 0)
+        inv = 1.0 / mag
+        return mag, Vector2D(self.x * inv, self.y * inv)
+    
+    # Allocation-free siblings of normalize/dot for hot paths that only need
+    # plain numbers; the Vector2D-returning versions stay for readable code
+    def normalize_xy(self) -> Tuple[float, float]:
+        """Return the normalized components as an (x, y) tuple"""
+        mag_sq = self.x * self.x + self.y * self.y
+        if mag_sq == 0:
+            return 0.0, 0.0
+        inv = 1.0 / math.sqrt(mag_sq)
+        return self.x * inv, self.y * inv
+    
+    def dot_with_normalized(self, other: 'Vector2D') -> float:
+        """Dot product with other.normalize(), without building the unit vector"""
+        mag_sq = other.x * other.x + other.y * other.y
+        if mag_sq == 0:
+            return 0.0
+        return (self.x * other.x + self.y * other.y) / math.sqrt(mag_sq)
     
     def dot(self, other: 'Vector2D') -> float:
         """Calculate dot product with another vector"""
@@ -95,10 +123,23 @@ class Vector2D:
             self.x * sin_a + self.y * cos_a
         )
     
+    def rotate_precomputed(self, cos_a: float, sin_a: float) -> 'Vector2D':
+        """Rotate vector by an angle given as its cosine and sine
+        
+        Lets callers rotating many vectors by one angle compute the trig once.
+        """
+        return Vector2D(
+            self.x * cos_a - self.y * sin_a,
+            self.x * sin_a + self.y * cos_a
+        )
+    
     def limit(self, max_magnitude: float) -> 'Vector2D':
         """Limit the magnitude of the vector"""
-        if self.magnitude > max_magnitude:
-            return self.normalize() * max_magnitude
+        # Compare squared lengths so vectors within the limit need no sqrt
+        mag_sq = self.x * self.x + self.y * self.y
+        if mag_sq > max_magnitude * max_magnitude:
+            scale = max_magnitude / math.sqrt(mag_sq)
+            return Vector2D(self.x * scale, self.y * scale)
         return Vector2D(self.x, self.y)
     
     def lerp(self, other: 'Vector2D', t: float) -> 'Vector2D':
@@ -107,41 +148,57 @@ class Vector2D:
     
     def distance_to(self, other: 'Vector2D') -> float:
         """Calculate distance to another vector"""
-        return (other - self).magnitude
+        return math.hypot(other.x - self.x, other.y - self.y)
     
     def distance_squared_to(self, other: 'Vector2D') -> float:
         """Calculate squared distance to another vector"""
-        return (other - self).magnitude_squared
+        dx = other.x - self.x
+        dy = other.y - self.y
+        return dx * dx + dy * dy
     
     def reflect(self, normal: 'Vector2D') -> 'Vector2D':
         """Reflect vector across a normal"""
-        return self - 2 * self.dot(normal) * normal
+        twice_dot = 2 * (self.x * normal.x + self.y * normal.y)
+        return Vector2D(self.x - twice_dot * normal.x, self.y - twice_dot * normal.y)
     
     def project(self, onto: 'Vector2D') -> 'Vector2D':
         """Project this vector onto another vector"""
-        if onto.magnitude_squared == 0:
+        if onto.magnitude_squared() == 0:
             return Vector2D(0, 0)
-        return onto * (self.dot(onto) / onto.magnitude_squared)
+        return onto * (self.dot(onto) / onto.magnitude_squared())
     
     def reject(self, from_vec: 'Vector2D') -> 'Vector2D':
         """Reject this vector from another vector"""
-        return self - self.project(from_vec)
+        length_sq = from_vec.x * from_vec.x + from_vec.y * from_vec.y
+        if length_sq == 0:
+            return Vector2D(self.x, self.y)
+        scale = (self.x * from_vec.x + self.y * from_vec.y) / length_sq
+        return Vector2D(self.x - from_vec.x * scale, self.y - from_vec.y * scale)
     
     # Utility methods
+    def equals(self, other: 'Vector2D', tolerance: float = EPS) -> bool:
+        """Check whether each component is within tolerance of the other vector's"""
+        return abs(self.x - other.x) < tolerance and abs(self.y - other.y) < tolerance
+    
     def copy(self) -> 'Vector2D':
         """Create a copy of this vector"""
         return Vector2D(self.x, self.y)
     
     def set(self, x: float, y: float) -> None:
         """Set the components of this vector"""
-        self.x = float(x)
-        self.y = float(y)
+        # Checked only in debug runs; python -O strips the assert
+        assert isinstance(x, (int, float)) and isinstance(y, (int, float)), \
+            "Vector2D components must be plain numbers"
+        self.x = x
+        self.y = y
     
     def set_magnitude(self, magnitude: float) -> 'Vector2D':
         """Set the magnitude while preserving direction"""
-        if self.magnitude == 0:
+        mag_sq = self.x * self.x + self.y * self.y
+        if mag_sq == 0:
             return Vector2D(magnitude, 0)
-        return self.normalize() * magnitude
+        scale = magnitude / math.sqrt(mag_sq)
+        return Vector2D(self.x * scale, self.y * scale)
     
     def to_tuple(self) -> Tuple[float, float]:
         """Convert to tuple"""
@@ -196,6 +253,37 @@ class Vector2D:
         return cls(1, 0)
 
 
+class _FrozenVector2D(Vector2D):
+    """
+    Read-only Vector2D for shared constants
+    
+    Arithmetic still returns ordinary Vector2D instances; only assignment to
+    the constant itself is refused.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, x: float, y: float):
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+    
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Vector2D constants are read-only; use copy() for a mutable vector")
+    
+    def set(self, x: float, y: float) -> None:
+        raise AttributeError("Vector2D constants are read-only; use copy() for a mutable vector")
+
+
+# Shared read-only constants. The zero()/up()/... factories still return fresh
+# vectors, since callers commonly use them as mutable initial state.
+ZERO = _FrozenVector2D(0.0, 0.0)
+ONE = _FrozenVector2D(1.0, 1.0)
+UP = _FrozenVector2D(0.0, -1.0)
+DOWN = _FrozenVector2D(0.0, 1.0)
+LEFT = _FrozenVector2D(-1.0, 0.0)
+RIGHT = _FrozenVector2D(1.0, 0.0)
+
+
 def clamp(value: float, min_val: float, max_val: float) -> float:
     """Clamp a value between min and max"""
     return max(min_val, min(value, max_val))
@@ -213,9 +301,5 @@ def map_range(value: float, in_min: float, in_max: float, out_min: float, out_ma
 
 def sign(value: float) -> int:
     """Return the sign of a value"""
-    if value > 0:
-        return 1
-    elif value < 0:
-        return -1
-    else:
-        return 0
+    # Booleans subtract as 0/1, giving -1, 0 or 1 without branching
+    return (value > 0) - (value < 0)
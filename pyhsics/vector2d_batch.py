@@ -0,0 +1,171 @@
+"""
+Batched 2D Vector Mathematics
+Structure-of-arrays vector storage with whole-batch NumPy operations
+"""
+
+import math
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from vector2d import Vector2D
+from vector2d_kernels import normalize_array, rotate_array
+from numba_support import NUMBA_AVAILABLE
+
+# Default storage precision. Single precision is ample for screen-space
+# simulation and halves the memory traffic of every pass.
+VECTOR_DTYPE = np.float32
+
+# Element-wise counterpart of vector2d.sign for arrays
+sign_array = np.sign
+
+
+class Vector2DArray:
+    """
+    Batch of 2D vectors stored as separate x and y arrays
+    
+    Operations mirror Vector2D but act on every vector at once. Each takes an
+    optional ``out`` batch (or array, for scalar results) to write into, so
+    per-frame buffers can be reused instead of reallocated.
+    """
+    
+    __slots__ = ('xs', 'ys')
+    
+    def __init__(self, n: int = 0, dtype=VECTOR_DTYPE):
+        self.xs = np.zeros(n, dtype=dtype)
+        self.ys = np.zeros(n, dtype=dtype)
+    
+    @classmethod
+    def from_arrays(cls, xs: np.ndarray, ys: np.ndarray) -> 'Vector2DArray':
+        """Wrap existing component arrays without copying them"""
+        batch = cls.__new__(cls)
+        batch.xs = xs
+        batch.ys = ys
+        return batch
+    
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector2D], dtype=VECTOR_DTYPE) -> 'Vector2DArray':
+        """Gather a sequence of Vector2D into a new batch"""
+        vectors = list(vectors)
+        count = len(vectors)
+        return cls.from_arrays(np.fromiter((v.x for v in vectors), dtype, count),
+                               np.fromiter((v.y for v in vectors), dtype, count))
+    
+    def __len__(self) -> int:
+        return len(self.xs)
+    
+    def __getitem__(self, index: int) -> Vector2D:
+        return Vector2D(float(self.xs[index]), float(self.ys[index]))
+    
+    def __setitem__(self, index: int, value: Vector2D) -> None:
+        self.xs[index] = value.x
+        self.ys[index] = value.y
+    
+    def __repr__(self) -> str:
+        return f"Vector2DArray({len(self)}, dtype={self.xs.dtype})"
+    
+    def to_vectors(self) -> List[Vector2D]:
+        """Convert the batch into a list of Vector2D"""
+        return [Vector2D(x, y) for x, y in zip(self.xs.tolist(), self.ys.tolist())]
+    
+    def copy(self) -> 'Vector2DArray':
+        """Create a copy of this batch"""
+        return Vector2DArray.from_arrays(self.xs.copy(), self.ys.copy())
+    
+    def _target(self, out: Optional['Vector2DArray']) -> 'Vector2DArray':
+        """Return the batch to write results into"""
+        if out is None:
+            return Vector2DArray(len(self), self.xs.dtype)
+        return out
+    
+    # Element-wise arithmetic
+    def add(self, other: 'Vector2DArray', out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Add another batch element-wise"""
+        out = self._target(out)
+        np.add(self.xs, other.xs, out=out.xs)
+        np.add(self.ys, other.ys, out=out.ys)
+        return out
+    
+    def sub(self, other: 'Vector2DArray', out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Subtract another batch element-wise"""
+        out = self._target(out)
+        np.subtract(self.xs, other.xs, out=out.xs)
+        np.subtract(self.ys, other.ys, out=out.ys)
+        return out
+    
+    def mul(self, scalar: Union[float, np.ndarray],
+            out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Scale by a scalar or by one scalar per vector"""
+        out = self._target(out)
+        np.multiply(self.xs, scalar, out=out.xs)
+        np.multiply(self.ys, scalar, out=out.ys)
+        return out
+    
+    def dot(self, other: 'Vector2DArray', out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dot product with another batch, one scalar per vector"""
+        return np.add(self.xs * other.xs, self.ys * other.ys, out=out)
+    
+    def cross(self, other: 'Vector2DArray', out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cross product (scalar in 2D) with another batch
+        
+        This is the dot product with the other batch rotated by -90 degrees,
+        (oy, -ox), so it shares dot's two products and one combining pass.
+        """
+        return np.subtract(self.xs * other.ys, self.ys * other.xs, out=out)
+    
+    # Lengths and directions
+    def magnitude_squared(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Squared length of every vector"""
+        return self.dot(self, out=out)
+    
+    def magnitude(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Length of every vector"""
+        return np.hypot(self.xs, self.ys, out=out)
+    
+    def normalize(self, out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Unit vectors in the same directions; zero vectors stay zero"""
+        if NUMBA_AVAILABLE:
+            out = self._target(out)
+            normalize_array(self.xs, self.ys, out.xs, out.ys)
+            return out
+        
+        magnitude = self.magnitude()
+        inv = np.zeros_like(magnitude)
+        np.divide(1.0, magnitude, out=inv, where=magnitude > 0)
+        return self.mul(inv, out=out)
+    
+    def rotate(self, angle: float, out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Rotate every vector by the same angle in radians"""
+        out = self._target(out)
+        if NUMBA_AVAILABLE:
+            rotate_array(self.xs, self.ys, angle, out.xs, out.ys)
+            return out
+        
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        # Both components are computed before either is stored, so out may be self
+        x = self.xs * cos_a - self.ys * sin_a
+        y = self.xs * sin_a + self.ys * cos_a
+        out.xs[:] = x
+        out.ys[:] = y
+        return out
+    
+    def lerp(self, other: 'Vector2DArray', t: Union[float, np.ndarray],
+             out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Linear interpolation towards another batch"""
+        out = self._target(out)
+        step = other.sub(self).mul(t)
+        return self.add(step, out=out)
+    
+    def reflect(self, normal: 'Vector2DArray', out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Reflect every vector across its normal"""
+        out = self._target(out)
+        offset = normal.mul(2.0 * self.dot(normal))
+        return self.sub(offset, out=out)
+    
+    def project(self, onto: 'Vector2DArray', out: Optional['Vector2DArray'] = None) -> 'Vector2DArray':
+        """Project every vector onto the matching vector of another batch"""
+        length_sq = onto.magnitude_squared()
+        scale = np.zeros_like(length_sq)
+        np.divide(self.dot(onto), length_sq, out=scale, where=length_sq > 0)
+        return onto.mul(scale, out=out)
@@ -0,0 +1,62 @@
+"""
+Compiled Vector Kernels
+Scalar vector math for use inside compiled kernels, plus parallel batch versions
+"""
+
+import math
+
+from numba_support import njit, prange
+
+
+# Scalar kernels. These return (x, y) tuples and are meant to be called from
+# other compiled code, where they inline; calling them from Python costs more
+# in dispatch than the arithmetic, so Vector2D keeps its plain methods.
+@njit(fastmath=True, cache=True)
+def rotate_kernel(x, y, cos_a, sin_a):
+    """Rotate (x, y) by an angle given as its cosine and sine"""
+    return x * cos_a - y * sin_a, x * sin_a + y * cos_a
+
+
+@njit(fastmath=True, cache=True)
+def reflect_kernel(x, y, nx, ny):
+    """Reflect (x, y) across the normal (nx, ny)"""
+    twice_dot = 2.0 * (x * nx + y * ny)
+    return x - twice_dot * nx, y - twice_dot * ny
+
+
+@njit(fastmath=True, cache=True)
+def project_kernel(x, y, ox, oy):
+    """Project (x, y) onto (ox, oy); projecting onto zero gives zero"""
+    length_sq = ox * ox + oy * oy
+    if length_sq == 0.0:
+        return 0.0, 0.0
+    scale = (x * ox + y * oy) / length_sq
+    return ox * scale, oy * scale
+
+
+@njit(fastmath=True, cache=True)
+def normalize_kernel(x, y):
+    """Unit vector in the direction of (x, y); zero stays zero"""
+    length_sq = x * x + y * y
+    if length_sq == 0.0:
+        return 0.0, 0.0
+    inv = 1.0 / math.sqrt(length_sq)
+    return x * inv, y * inv
+
+
+# Batch kernels over component arrays. Every element is independent, so the
+# loops run in parallel; the outputs may alias the inputs.
+@njit(parallel=True, fastmath=True, cache=True)
+def rotate_array(xs, ys, angle, out_x, out_y):
+    """Rotate every vector of a batch by the same angle"""
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    for i in prange(xs.shape[0]):
+        out_x[i], out_y[i] = rotate_kernel(xs[i], ys[i], cos_a, sin_a)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def normalize_array(xs, ys, out_x, out_y):
+    """Normalize every vector of a batch"""
+    for i in prange(xs.shape[0]):
+        out_x[i], out_y[i] = normalize_kernel(xs[i], ys[i])
@@ -5,12 +5,71 @@ Optimizations, visual enhancements, and debugging tools for the physics engine
 
 import pygame
 import math
+import random
 import time
+from itertools import repeat
 from typing import List, Tuple, Dict, Optional
-from collections import deque
 import threading
 
+import numpy as np
+
 from vector2d import Vector2D
+from vector2d_batch import Vector2DArray
+from physics_body import BODY_HAS_BBOX, BODY_HAS_FORCE, BODY_HAS_SLEEP, body_caps, gather_positions
+from numba_support import NUMBA_AVAILABLE, njit
+
+
+class SampleRing:
+    """
+    Fixed-size window of timing samples backed by a NumPy array
+    
+    Appending past maxlen overwrites the oldest sample. Indexing and
+    iteration run oldest to newest, like a deque with maxlen.
+    """
+    
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._samples = np.zeros(maxlen)
+        self._head = 0  # Slot the next sample is written to
+        self._count = 0
+    
+    def append(self, value: float):
+        """Add a sample, evicting the oldest when full"""
+        self.push(value)
+    
+    def push(self, value: float) -> float:
+        """Add a sample and return the one it evicted, or 0.0 if none was"""
+        head = self._head
+        evicted = 0.0
+        if self._count == self.maxlen:
+            evicted = float(self._samples[head])
+        else:
+            self._count += 1
+        self._samples[head] = value
+        self._head = head + 1 if head + 1 < self.maxlen else 0
+        return evicted
+    
+    def view(self) -> np.ndarray:
+        """Live samples in storage order, for reductions like min, max and sum"""
+        return self._samples[:self._count]
+    
+    def ordered(self) -> np.ndarray:
+        """Copy of the live samples, oldest first"""
+        if self._count < self.maxlen:
+            return self._samples[:self._count].copy()
+        return np.concatenate((self._samples[self._head:], self._samples[:self._head]))
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> float:
+        if not -self._count <= index < self._count:
+            raise IndexError("sample index out of range")
+        start = self._head - self._count
+        return float(self._samples[(start + index % self._count) % self.maxlen])
+    
+    def __iter__(self):
+        return iter(self.ordered().tolist())
 
 
 class PerformanceProfiler:
@@ -20,44 +79,42 @@ class PerformanceProfiler:
     
     def __init__(self, max_samples: int = 100):
         self.max_samples = max_samples
-        self.frame_times = deque(maxlen=max_samples)
-        self.physics_times = deque(maxlen=max_samples)
-        self.render_times = deque(maxlen=max_samples)
-        self.collision_times = deque(maxlen=max_samples)
+        self.frame_times = SampleRing(max_samples)
+        self.physics_times = SampleRing(max_samples)
+        self.render_times = SampleRing(max_samples)
+        self.collision_times = SampleRing(max_samples)
+        
+        # Category -> sample window, with a running sum kept alongside each
+        self._samples = {
+            "frame": self.frame_times,
+            "physics": self.physics_times,
+            "render": self.render_times,
+            "collision": self.collision_times
+        }
+        self._sums = dict.fromkeys(self._samples, 0.0)
         
         self.start_times = {}
         
     def start_timing(self, category: str):
         """Start timing a category"""
-        self.start_times[category] = time.time()
+        self.start_times[category] = time.perf_counter_ns()
     
     def end_timing(self, category: str):
         """End timing and record duration"""
+        # Read the clock before any bookkeeping so it is not measured
+        end = time.perf_counter_ns()
         if category in self.start_times:
-            duration = time.time() - self.start_times[category]
+            duration = (end - self.start_times[category]) * 1e-9
             
-            if category == "frame":
-                self.frame_times.append(duration)
-            elif category == "physics":
-                self.physics_times.append(duration)
-            elif category == "render":
-                self.render_times.append(duration)
-            elif category == "collision":
-                self.collision_times.append(duration)
+            times = self._samples.get(category)
+            if times is not None:
+                # Swap the evicted sample for the new one in the running sum
+                self._sums[category] += duration - times.push(duration)
     
     def get_average_time(self, category: str) -> float:
         """Get average time for category"""
-        times = None
-        if category == "frame":
-            times = self.frame_times
-        elif category == "physics":
-            times = self.physics_times
-        elif category == "render":
-            times = self.render_times
-        elif category == "collision":
-            times = self.collision_times
-        
-        return sum(times) / len(times) if times else 0.0
+        times = self._samples.get(category)
+        return self._sums[category] / len(times) if times else 0.0
     
     def get_fps(self) -> float:
         """Get average FPS"""
@@ -77,6 +134,116 @@ class PerformanceProfiler:
         }
 
 
+# Effect sparks are drawn from cached sprites, one per quantized color and
+# alpha level, so colors snap to 8 levels per channel and alpha to 16
+EFFECT_ALPHA_LEVELS = 16
+EFFECT_SPRITE_RADIUS = 2
+
+# Surface.fblits is only in pygame-ce; plain pygame falls back to blits
+_HAS_FBLITS = hasattr(pygame.Surface, 'fblits')
+
+# Per-frame velocity retention of effect sparks (air resistance)
+EFFECT_DRAG = 0.98
+
+
+@njit(cache=True)
+def encode_effect_color(red: int, green: int, blue: int) -> int:
+    """Pack a color into a 9-bit code, 8 levels per channel"""
+    return (red >> 5) << 6 | (green >> 5) << 3 | (blue >> 5)
+
+
+def decode_effect_color(code: int) -> Tuple[int, int, int]:
+    """Unpack a color code to the top of each channel's 32-wide band"""
+    return ((code >> 6) * 32 + 31, (code >> 3 & 7) * 32 + 31, (code & 7) * 32 + 31)
+
+
+# Sine table for spark directions; sparks fly in one of EFFECT_DIRECTIONS
+# evenly spaced directions, and a quarter turn on gives the cosine
+EFFECT_DIRECTIONS = 1024
+_SIN_TABLE = np.sin(np.arange(EFFECT_DIRECTIONS) * (2.0 * math.pi / EFFECT_DIRECTIONS))
+if not NUMBA_AVAILABLE:
+    # Plain floats index faster than array scalars in interpreted code
+    _SIN_TABLE = _SIN_TABLE.tolist()
+
+
+@njit(cache=True, fastmath=True)
+def _spawn_effect_ring(xs, ys, vxs, vys, life, decay, color, start, stop, cx, cy, radius,
+                       speed_min, speed_max, life_value, decay_min, decay_max,
+                       green_min, green_max, blue_min, blue_max):
+    """Fill slots [start, stop) with sparks flying outward from a disc around (cx, cy)"""
+    for i in range(start, stop):
+        direction = int(random.random() * EFFECT_DIRECTIONS)
+        distance = random.uniform(0.0, radius)
+        speed = random.uniform(speed_min, speed_max)
+        cos_a = _SIN_TABLE[(direction + EFFECT_DIRECTIONS // 4) % EFFECT_DIRECTIONS]
+        sin_a = _SIN_TABLE[direction]
+        xs[i] = cx + cos_a * distance
+        ys[i] = cy + sin_a * distance
+        vxs[i] = cos_a * speed
+        vys[i] = sin_a * speed
+        green = random.randint(green_min, green_max)
+        blue = random.randint(blue_min, blue_max)
+        color[i] = encode_effect_color(255, green, blue)
+        life[i] = life_value
+        decay[i] = random.uniform(decay_min, decay_max)
+
+
+class SpawnRing:
+    """
+    Single-producer, single-consumer ring of pending effect spawns
+    
+    One thread enqueues and one thread dequeues, with no lock. Each side is
+    the only writer of its own position and keeps a cached copy of the
+    other's, rereading it only when the ring looks full or empty. A slot is
+    filled before the write position moves past it, so the consumer never
+    sees a half-written slot.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._slots: List[Optional[tuple]] = [None] * capacity
+        self._write_pos = 0
+        self._read_pos = 0
+        self._cached_read_pos = 0  # Producer's copy of _read_pos
+        self._cached_write_pos = 0  # Consumer's copy of _write_pos
+    
+    def try_enqueue(self, event: tuple) -> bool:
+        """Add an event from the producer thread; False if the ring is full"""
+        write_pos = self._write_pos
+        if write_pos - self._cached_read_pos == self.capacity:
+            self._cached_read_pos = self._read_pos
+            if write_pos - self._cached_read_pos == self.capacity:
+                return False
+        self._slots[write_pos % self.capacity] = event
+        self._write_pos = write_pos + 1
+        return True
+    
+    def try_dequeue(self) -> Optional[tuple]:
+        """Take the oldest event on the consumer thread; None if the ring is empty"""
+        read_pos = self._read_pos
+        if read_pos == self._cached_write_pos:
+            self._cached_write_pos = self._write_pos
+            if read_pos == self._cached_write_pos:
+                return None
+        slot = read_pos % self.capacity
+        event = self._slots[slot]
+        self._slots[slot] = None
+        self._read_pos = read_pos + 1
+        return event
+    
+    def drain(self) -> List[tuple]:
+        """Take every event enqueued so far on the consumer thread"""
+        read_pos = self._read_pos
+        self._cached_write_pos = write_pos = self._write_pos
+        events = []
+        for pos in range(read_pos, write_pos):
+            slot = pos % self.capacity
+            events.append(self._slots[slot])
+            self._slots[slot] = None
+        self._read_pos = write_pos
+        return events
+
+
 class VisualEffects:
     """
     Visual effects system for enhanced physics visualization
@@ -89,16 +256,30 @@ class VisualEffects:
         self.trails = {}  # Object ID -> trail data
         self.max_trail_length = 50
         self.trail_fade_rate = 0.95
+        self._trail_layer = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        self._trail_layer_dirty = False
         
-        # Particle effects
-        self.effect_particles = []
+        # Particle effects, stored as arrays; the first effect_count slots are live
         self.max_effect_particles = 1000
+        self.effect_count = 0
+        self.effect_positions = Vector2DArray(self.max_effect_particles)
+        self.effect_velocities = Vector2DArray(self.max_effect_particles)
+        self.effect_life = np.zeros(self.max_effect_particles, dtype=np.float32)
+        self.effect_decay = np.zeros(self.max_effect_particles, dtype=np.float32)
+        self.effect_color = np.zeros(self.max_effect_particles, dtype=np.int32)
+        self._sprite_cache: Dict[int, pygame.Surface] = {}
+        
+        # Spawns queued from a physics thread, drained at the start of update
+        self.spawn_queue = SpawnRing()
         
         # Screen effects
         self.screen_shake_intensity = 0.0
         self.screen_shake_duration = 0.0
+        self._shake_offset = Vector2D.zero()
         self.screen_flash_color = None
         self.screen_flash_alpha = 0
+        self._flash_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        self._flash_key = None
         
         # Visual settings
         self.motion_blur_enabled = True
@@ -108,84 +289,110 @@ class VisualEffects:
     def add_trail_point(self, object_id: str, position: Vector2D, color: Tuple[int, int, int]):
         """Add a point to an object's trail"""
         if object_id not in self.trails:
+            # Ring buffers; the newest point is just before head
             self.trails[object_id] = {
-                'points': deque(maxlen=self.max_trail_length),
-                'colors': deque(maxlen=self.max_trail_length),
-                'alphas': deque(maxlen=self.max_trail_length)
+                'points': np.empty((self.max_trail_length, 2)),
+                'colors': np.empty((self.max_trail_length, 3), dtype=np.uint8),
+                'alphas': np.empty(self.max_trail_length, dtype=np.float32),
+                'head': 0,
+                'count': 0,
+                'max_alpha': 0.0
             }
         
         trail = self.trails[object_id]
-        trail['points'].append(position.copy())
-        trail['colors'].append(color)
-        trail['alphas'].append(255)
-        
-        # Fade existing trail points
-        for i in range(len(trail['alphas'])):
-            trail['alphas'][i] *= self.trail_fade_rate
+        head = trail['head']
+        trail['points'][head] = (position.x, position.y)
+        trail['colors'][head] = color
+        trail['alphas'][head] = 255
+        trail['head'] = (head + 1) % self.max_trail_length
+        trail['count'] = min(trail['count'] + 1, self.max_trail_length)
+        
+        # Fade existing trail points; the live slots are always the first count
+        trail['alphas'][:trail['count']] *= self.trail_fade_rate
+        
+        # The newest point is always the brightest
+        trail['max_alpha'] = float(trail['alphas'][head])
     
     def render_trails(self, screen: pygame.Surface):
         """Render all trails with fading effect"""
+        # Draw segments straight onto the shared alpha layer, clearing it
+        # only if the last frame drew on it
+        layer = self._trail_layer
+        if self._trail_layer_dirty:
+            layer.fill((0, 0, 0, 0))
+            self._trail_layer_dirty = False
         for object_id, trail in self.trails.items():
-            if len(trail['points']) < 2:
+            # Skip trails too short or too faded to have a visible segment
+            count = trail['count']
+            if count < 2 or trail['max_alpha'] < 6:
                 continue
             
-            for i in range(len(trail['points']) - 1):
-                start_pos = trail['points'][i]
-                end_pos = trail['points'][i + 1]
-                color = trail['colors'][i]
-                alpha = int(trail['alphas'][i])
-                
+            # Walk the ring from oldest to newest
+            order = np.arange(trail['head'] - count, trail['head']) % self.max_trail_length
+            points = np.rint(trail['points'][order]).astype(np.int32).tolist()
+            colors = trail['colors'][order].tolist()
+            alphas = trail['alphas'][order].astype(np.int32).tolist()
+            
+            for i in range(count - 1):
+                alpha = alphas[i]
                 if alpha > 5:  # Only draw visible segments
-                    # Create surface for alpha blending
-                    trail_surface = pygame.Surface((abs(int(end_pos.x - start_pos.x)) + 4,
-                                                  abs(int(end_pos.y - start_pos.y)) + 4), pygame.SRCALPHA)
-                    
-                    # Draw line on surface with alpha
-                    start_local = Vector2D(2, 2)
-                    end_local = end_pos - start_pos + Vector2D(2, 2)
-                    pygame.draw.line(trail_surface, (*color, alpha), 
-                                   start_local.to_int_tuple(), end_local.to_int_tuple(), 2)
-                    
-                    # Blit to main screen
-                    screen.blit(trail_surface, (start_pos.x - 2, start_pos.y - 2))
+                    pygame.draw.line(layer, (*colors[i], alpha), points[i], points[i + 1], 2)
+                    self._trail_layer_dirty = True
+        
+        # Blend every trail onto the screen at once
+        if self._trail_layer_dirty:
+            screen.blit(layer, (0, 0))
+    
+    @property
+    def effect_particles(self) -> List[Dict]:
+        """Snapshot of the live effect particles as dicts, for inspection"""
+        n = self.effect_count
+        return [
+            {'position': Vector2D(x, y), 'velocity': Vector2D(vx, vy),
+             'color': decode_effect_color(code), 'life': life, 'decay_rate': decay}
+            for x, y, vx, vy, code, life, decay in zip(
+                self.effect_positions.xs[:n].tolist(), self.effect_positions.ys[:n].tolist(),
+                self.effect_velocities.xs[:n].tolist(), self.effect_velocities.ys[:n].tolist(),
+                self.effect_color[:n].tolist(), self.effect_life[:n].tolist(),
+                self.effect_decay[:n].tolist())
+        ]
+    
+    def reserve_effect_particles(self, count: int) -> slice:
+        """Claim slots for new effect particles, as many as the budget allows"""
+        start = self.effect_count
+        self.effect_count = min(self.max_effect_particles, start + count)
+        return slice(start, self.effect_count)
+    
+    def spawn_effect_ring(self, count: int, center: Vector2D, radius: float,
+                          speed_range: Tuple[float, float], life: float,
+                          decay_range: Tuple[float, float], green_range: Tuple[int, int],
+                          blue_range: Tuple[int, int]) -> None:
+        """Spawn red-based sparks flying outward from a disc, within the particle budget"""
+        slots = self.reserve_effect_particles(count)
+        _spawn_effect_ring(self.effect_positions.xs, self.effect_positions.ys,
+                           self.effect_velocities.xs, self.effect_velocities.ys,
+                           self.effect_life, self.effect_decay, self.effect_color,
+                           slots.start, slots.stop, center.x, center.y, radius,
+                           speed_range[0], speed_range[1], life, decay_range[0], decay_range[1],
+                           green_range[0], green_range[1], blue_range[0], blue_range[1])
     
     def add_collision_effect(self, position: Vector2D, intensity: float):
         """Add collision spark effect"""
-        num_particles = int(10 * intensity)
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(20, 100 * intensity)
-            velocity = Vector2D(math.cos(angle) * speed, math.sin(angle) * speed)
-            
-            self.effect_particles.append({
-                'position': position.copy(),
-                'velocity': velocity,
-                'color': (255, random.randint(100, 255), random.randint(50, 150)),
-                'life': 1.0,
-                'decay_rate': random.uniform(2.0, 5.0)
-            })
+        self.spawn_effect_ring(int(10 * intensity), position, 0.0, (20, 100 * intensity), 1.0,
+                               (2.0, 5.0), (100, 255), (50, 150))
     
     def add_explosion_effect(self, position: Vector2D, radius: float, intensity: float):
         """Add explosion particle effect"""
-        num_particles = int(20 * intensity)
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(0, radius)
-            speed = random.uniform(50, 200 * intensity)
-            
-            particle_pos = position + Vector2D(
-                math.cos(angle) * distance,
-                math.sin(angle) * distance
-            )
-            velocity = Vector2D(math.cos(angle) * speed, math.sin(angle) * speed)
-            
-            self.effect_particles.append({
-                'position': particle_pos,
-                'velocity': velocity,
-                'color': (255, random.randint(150, 255), random.randint(0, 100)),
-                'life': 1.5,
-                'decay_rate': random.uniform(1.0, 3.0)
-            })
+        self.spawn_effect_ring(int(20 * intensity), position, radius, (50, 200 * intensity), 1.5,
+                               (1.0, 3.0), (150, 255), (0, 100))
+    
+    def queue_collision_effect(self, position: Vector2D, intensity: float) -> bool:
+        """Queue a collision effect from the physics thread; False if the queue is full"""
+        return self.spawn_queue.try_enqueue(('collision', position.copy(), 0.0, intensity))
+    
+    def queue_explosion_effect(self, position: Vector2D, radius: float, intensity: float) -> bool:
+        """Queue an explosion effect from the physics thread; False if the queue is full"""
+        return self.spawn_queue.try_enqueue(('explosion', position.copy(), radius, intensity))
     
     def add_screen_shake(self, intensity: float, duration: float):
         """Add screen shake effect"""
@@ -199,15 +406,91 @@ class VisualEffects:
     
     def update(self, dt: float):
         """Update all visual effects"""
-        # Update effect particles
-        for particle in self.effect_particles[:]:
-            particle['position'] += particle['velocity'] * dt
-            particle['velocity'] *= 0.98  # Air resistance
-            particle['life'] -= particle['decay_rate'] * dt
-            
-            if particle['life'] <= 0:
-                self.effect_particles.remove(particle)
+        self._spawn_queued_effects()
+        self._advance_effect_particles(dt)
+        
+        # Compact the survivors to the front of every array
+        alive = np.flatnonzero(self.effect_life[:self.effect_count] > 0)
+        if len(alive) < self.effect_count:
+            self._compact_effect_particles(alive)
+        
+        self._update_screen_effects(dt)
+    
+    def render_effects(self, screen: pygame.Surface):
+        """Render all visual effects"""
+        # Render trails
+        if self.particle_trails_enabled:
+            self.render_trails(screen)
         
+        # Render the visible effect particles
+        n = self.effect_count
+        alpha = (255 * self.effect_life[:n]).astype(np.int32)
+        visible = np.flatnonzero(alpha > 0)
+        if len(visible):
+            self._blit_effect_particles(screen, self.effect_positions.xs[visible],
+                                        self.effect_positions.ys[visible],
+                                        self.effect_color[visible], alpha[visible])
+        
+        self._render_screen_flash(screen)
+    
+    def step_and_draw(self, dt: float, screen: pygame.Surface):
+        """
+        Update and render all visual effects in one pass over the particles
+        
+        Same result as update followed by render_effects, except particles
+        too faded to draw are dropped a little before their life runs out.
+        One mask then serves both compaction and drawing, and the draw reads
+        the compacted arrays in place.
+        """
+        self._spawn_queued_effects()
+        self._advance_effect_particles(dt)
+        self._update_screen_effects(dt)
+        
+        # Render trails
+        if self.particle_trails_enabled:
+            self.render_trails(screen)
+        
+        # Keep only the particles that will draw, then draw all of them
+        alpha = (255 * self.effect_life[:self.effect_count]).astype(np.int32)
+        visible = np.flatnonzero(alpha > 0)
+        if len(visible) < self.effect_count:
+            self._compact_effect_particles(visible)
+            alpha = alpha[visible]
+        n = self.effect_count
+        if n:
+            self._blit_effect_particles(screen, self.effect_positions.xs[:n], self.effect_positions.ys[:n],
+                                        self.effect_color[:n], alpha)
+        
+        self._render_screen_flash(screen)
+    
+    def _spawn_queued_effects(self):
+        """Spawn the effects queued by other threads since the last update"""
+        for kind, position, radius, intensity in self.spawn_queue.drain():
+            if kind == 'collision':
+                self.add_collision_effect(position, intensity)
+            else:
+                self.add_explosion_effect(position, radius, intensity)
+    
+    def _advance_effect_particles(self, dt: float):
+        """Move the live effect particles and age them, leaving dead ones in place"""
+        n = self.effect_count
+        if n:
+            positions = Vector2DArray.from_arrays(self.effect_positions.xs[:n], self.effect_positions.ys[:n])
+            velocities = Vector2DArray.from_arrays(self.effect_velocities.xs[:n], self.effect_velocities.ys[:n])
+            positions.add(velocities.mul(dt), out=positions)
+            velocities.mul(EFFECT_DRAG, out=velocities)
+            self.effect_life[:n] -= self.effect_decay[:n] * dt
+    
+    def _compact_effect_particles(self, keep: np.ndarray):
+        """Move the particles at the given slots to the front of every array"""
+        for array in (self.effect_positions.xs, self.effect_positions.ys,
+                      self.effect_velocities.xs, self.effect_velocities.ys,
+                      self.effect_life, self.effect_decay, self.effect_color):
+            array[:len(keep)] = array[keep]
+        self.effect_count = len(keep)
+    
+    def _update_screen_effects(self, dt: float):
+        """Update screen shake, screen flash and trail lifetimes"""
         # Update screen shake
         if self.screen_shake_duration > 0:
             self.screen_shake_duration -= dt
@@ -220,42 +503,70 @@ class VisualEffects:
             if self.screen_flash_alpha < 0:
                 self.screen_flash_alpha = 0
         
-        # Clean up old trails
-        for object_id in list(self.trails.keys()):
-            trail = self.trails[object_id]
-            # Remove trails with all low alpha values
-            max_alpha = max(trail['alphas']) if trail['alphas'] else 0
-            if max_alpha < 1:
-                del self.trails[object_id]
+        # Clean up old trails, keeping those with any visible point in one pass
+        self.trails = {object_id: trail for object_id, trail in self.trails.items()
+                       if trail['max_alpha'] >= 1}
     
-    def render_effects(self, screen: pygame.Surface):
-        """Render all visual effects"""
-        # Render trails
-        if self.particle_trails_enabled:
-            self.render_trails(screen)
-        
-        # Render effect particles
-        for particle in self.effect_particles:
-            alpha = int(255 * particle['life'])
-            if alpha > 0:
-                color = (*particle['color'], alpha)
-                pos = particle['position'].to_int_tuple()
-                pygame.draw.circle(screen, particle['color'][:3], pos, 2)
-        
-        # Apply screen flash
+    def _blit_effect_particles(self, screen: pygame.Surface, xs: np.ndarray, ys: np.ndarray,
+                               colors: np.ndarray, alpha: np.ndarray):
+        """Draw effect particles in one batched blit"""
+        level = np.minimum(alpha * EFFECT_ALPHA_LEVELS // 256, EFFECT_ALPHA_LEVELS - 1)
+        keys = (colors * EFFECT_ALPHA_LEVELS + level).tolist()
+        sprites = list(map(self.get_effect_sprite, keys))
+        xs = (xs.astype(np.int32) - EFFECT_SPRITE_RADIUS).tolist()
+        ys = (ys.astype(np.int32) - EFFECT_SPRITE_RADIUS).tolist()
+        
+        # Sprites hold pre-faded colors on black, so additive blending
+        # leaves their corners invisible
+        if _HAS_FBLITS:
+            screen.fblits(zip(sprites, zip(xs, ys)), pygame.BLEND_RGB_ADD)
+        else:
+            screen.blits(zip(sprites, zip(xs, ys), repeat(None), repeat(pygame.BLEND_RGB_ADD)),
+                         doreturn=False)
+    
+    def _render_screen_flash(self, screen: pygame.Surface):
+        """Apply the screen flash over everything drawn so far"""
         if self.screen_flash_alpha > 0:
-            flash_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-            flash_surface.fill((*self.screen_flash_color, int(self.screen_flash_alpha)))
-            screen.blit(flash_surface, (0, 0))
+            # Refill the persistent flash layer only when its color changes
+            flash_key = (self.screen_flash_color, int(self.screen_flash_alpha))
+            if flash_key != self._flash_key:
+                self._flash_surface.fill((*self.screen_flash_color, flash_key[1]))
+                self._flash_key = flash_key
+            screen.blit(self._flash_surface, (0, 0))
+    
+    def get_effect_sprite(self, key: int) -> pygame.Surface:
+        """Get the cached spark sprite for a color code * EFFECT_ALPHA_LEVELS + alpha level"""
+        sprite = self._sprite_cache.get(key)
+        if sprite is None:
+            # Bake the fade into the color; additive blits need no alpha channel
+            code, level = divmod(key, EFFECT_ALPHA_LEVELS)
+            fade = (level + 1) / EFFECT_ALPHA_LEVELS
+            size = 2 * EFFECT_SPRITE_RADIUS + 1
+            sprite = pygame.Surface((size, size))
+            pygame.draw.circle(sprite, tuple(int(channel * fade) for channel in decode_effect_color(code)),
+                               (EFFECT_SPRITE_RADIUS, EFFECT_SPRITE_RADIUS), EFFECT_SPRITE_RADIUS)
+            self._sprite_cache[key] = sprite
+        return sprite
     
     def get_screen_shake_offset(self) -> Vector2D:
-        """Get current screen shake offset"""
-        if self.screen_shake_intensity > 0:
-            import random
-            offset_x = random.uniform(-self.screen_shake_intensity, self.screen_shake_intensity)
-            offset_y = random.uniform(-self.screen_shake_intensity, self.screen_shake_intensity)
-            return Vector2D(offset_x, offset_y)
-        return Vector2D.zero()
+        """
+        Get current screen shake offset
+        
+        The same vector is updated and returned on every call; copy it to keep it.
+        """
+        offset = self._shake_offset
+        intensity = self.screen_shake_intensity
+        if intensity > 0:
+            offset.x = random.uniform(-intensity, intensity)
+            offset.y = random.uniform(-intensity, intensity)
+        else:
+            offset.x = offset.y = 0.0
+        return offset
+
+
+# Velocity arrow barbs point back along the arrow, 0.5 rad either side
+_ARROW_BARB_ROTATIONS = tuple((math.cos(math.pi + offset), math.sin(math.pi + offset))
+                              for offset in (-0.5, 0.5))
 
 
 class DebugRenderer:
@@ -281,28 +592,34 @@ class DebugRenderer:
         self.bbox_color = (255, 255, 0)
         self.normal_color = (0, 255, 255)
         self.text_color = (255, 255, 255)
+        
+        # Reused spatial hash overlay pieces: one highlight per cell size,
+        # one label per body count
+        self._cell_highlight: Optional[pygame.Surface] = None
+        self._count_labels: Dict[int, pygame.Surface] = {}
     
     def render_physics_body_debug(self, screen: pygame.Surface, body):
         """Render debug information for a physics body"""
         pos = body.position
+        caps = body_caps(body)
         
         # Velocity vector
         if self.show_velocity_vectors and body.velocity.magnitude() > 1:
-            vel_end = pos + body.velocity.normalize() * 30
+            dir_x, dir_y = body.velocity.normalize_xy()
+            vel_end = Vector2D(pos.x + dir_x * 30, pos.y + dir_y * 30)
             pygame.draw.line(screen, self.velocity_color, 
                            pos.to_int_tuple(), vel_end.to_int_tuple(), 2)
-            # Arrow head
-            arrow_angle = body.velocity.angle()
-            for offset in [-0.5, 0.5]:
-                arrow_tip = vel_end + Vector2D(
-                    math.cos(arrow_angle + math.pi + offset) * 8,
-                    math.sin(arrow_angle + math.pi + offset) * 8
+            # Arrow head, rotating the direction by the precomputed barb angles
+            for cos_r, sin_r in _ARROW_BARB_ROTATIONS:
+                arrow_tip = Vector2D(
+                    vel_end.x + (dir_x * cos_r - dir_y * sin_r) * 8,
+                    vel_end.y + (dir_x * sin_r + dir_y * cos_r) * 8
                 )
                 pygame.draw.line(screen, self.velocity_color,
                                vel_end.to_int_tuple(), arrow_tip.to_int_tuple(), 2)
         
         # Force vectors
-        if self.show_force_vectors and hasattr(body, 'accumulated_force'):
+        if self.show_force_vectors and caps & BODY_HAS_FORCE:
             if body.accumulated_force.magnitude() > 10:
                 force_scale = min(50, body.accumulated_force.magnitude() / 100)
                 force_end = pos + body.accumulated_force.normalize() * force_scale
@@ -311,7 +628,7 @@ class DebugRenderer:
         
         # Bounding box
         if self.show_bounding_boxes:
-            if hasattr(body, 'get_bounding_box'):
+            if caps & BODY_HAS_BBOX:
                 bbox = body.get_bounding_box()
                 pygame.draw.rect(screen, self.bbox_color, 
                                (bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1]), 1)
@@ -358,21 +675,45 @@ class DebugRenderer:
         for y in range(0, screen.get_height(), int(cell_size)):
             pygame.draw.line(screen, (50, 50, 50), (0, y), (screen.get_width(), y))
         
-        # Highlight occupied cells
-        for cell_key, objects in spatial_hash.cells.items():
-            if objects:
-                cell_x, cell_y = cell_key
-                screen_x = cell_x * cell_size
-                screen_y = cell_y * cell_size
-                
-                # Draw filled rectangle with transparency
-                cell_surface = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
-                cell_surface.fill((255, 255, 0, 50))
-                screen.blit(cell_surface, (screen_x, screen_y))
-                
-                # Draw object count
-                count_text = self.small_font.render(str(len(objects)), True, (255, 255, 255))
-                screen.blit(count_text, (screen_x + 2, screen_y + 2))
+        # Count bodies in the occupied cells on screen, from the hash's
+        # bodies so this works whichever path filled its storage
+        if not spatial_hash.bodies:
+            return
+        min_cx, min_cy, max_cx, max_cy = spatial_hash.get_cell_ranges(list(spatial_hash.bodies))
+        last_cx = int(screen.get_width() // cell_size)
+        last_cy = int(screen.get_height() // cell_size)
+        min_cx = np.maximum(min_cx, 0)
+        min_cy = np.maximum(min_cy, 0)
+        max_cx = np.minimum(max_cx, last_cx)
+        max_cy = np.minimum(max_cy, last_cy)
+        on_screen = np.flatnonzero((min_cx <= max_cx) & (min_cy <= max_cy))
+        
+        counts: Dict[Tuple[int, int], int] = {}
+        for x0, y0, x1, y1 in zip(min_cx[on_screen].tolist(), min_cy[on_screen].tolist(),
+                                  max_cx[on_screen].tolist(), max_cy[on_screen].tolist()):
+            for cell_x in range(x0, x1 + 1):
+                for cell_y in range(y0, y1 + 1):
+                    counts[(cell_x, cell_y)] = counts.get((cell_x, cell_y), 0) + 1
+        
+        # Highlight occupied cells with one shared translucent surface
+        highlight = self._cell_highlight
+        if highlight is None or highlight.get_width() != int(cell_size):
+            highlight = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
+            highlight.fill((255, 255, 0, 50))
+            self._cell_highlight = highlight
+        
+        corners = [(cell_x * cell_size, cell_y * cell_size) for cell_x, cell_y in counts]
+        screen.blits([(highlight, corner) for corner in corners], doreturn=False)
+        
+        # Draw object counts
+        labels = []
+        for corner, count in zip(corners, counts.values()):
+            label = self._count_labels.get(count)
+            if label is None:
+                label = self.small_font.render(str(count), True, (255, 255, 255))
+                self._count_labels[count] = label
+            labels.append((label, (corner[0] + 2, corner[1] + 2)))
+        screen.blits(labels, doreturn=False)
     
     def render_performance_graph(self, screen: pygame.Surface, profiler: PerformanceProfiler):
         """Render performance graph"""
@@ -386,19 +727,18 @@ class DebugRenderer:
         pygame.draw.rect(screen, (255, 255, 255), (graph_x, graph_y, graph_width, graph_height), 1)
         
         # Draw frame time graph
-        if profiler.frame_times:
-            max_time = max(profiler.frame_times)
-            min_time = min(profiler.frame_times)
-            time_range = max_time - min_time if max_time > min_time else 0.001
-            
-            points = []
-            for i, frame_time in enumerate(profiler.frame_times):
-                x = graph_x + (i / len(profiler.frame_times)) * graph_width
-                y = graph_y + graph_height - ((frame_time - min_time) / time_range) * graph_height
-                points.append((x, y))
+        if len(profiler.frame_times) > 1:
+            frame_times = profiler.frame_times.ordered()
+            min_time = frame_times.min()
+            time_range = frame_times.max() - min_time
+            if time_range <= 0:
+                time_range = 0.001
             
-            if len(points) > 1:
-                pygame.draw.lines(screen, (0, 255, 0), False, points)
+            # Place every sample at once
+            points = np.empty((len(frame_times), 2))
+            points[:, 0] = graph_x + np.arange(len(frame_times)) * (graph_width / len(frame_times))
+            points[:, 1] = graph_y + graph_height - (frame_times - min_time) * (graph_height / time_range)
+            pygame.draw.lines(screen, (0, 255, 0), False, points.tolist())
         
         # Labels
         fps_text = self.small_font.render(f"FPS: {profiler.get_fps():.1f}", True, (255, 255, 255))
@@ -500,26 +840,33 @@ def optimize_physics_bodies(bodies: List, camera_pos: Vector2D, screen_size: Tup
     """
     Optimize physics bodies based on visibility and distance from camera
     """
-    visible_bodies = []
+    # Work on squared distances and speeds so no test below needs a sqrt
+    positions = gather_positions(bodies)
+    offset_x = positions[:, 0] - camera_pos.x
+    offset_y = positions[:, 1] - camera_pos.y
+    
+    # Frustum culling, the same bounds as is_in_screen_bounds
+    margin = 100
+    half_width = screen_size[0] // 2 + margin
+    half_height = screen_size[1] // 2 + margin
+    visible = (np.abs(offset_x) <= half_width) & (np.abs(offset_y) <= half_height)
+    distant = ~visible & (offset_x * offset_x + offset_y * offset_y > 500 * 500)
+    
+    visible_bodies = [bodies[i] for i in np.flatnonzero(visible)]
     sleeping_bodies = []
     
-    for body in bodies:
-        # Distance-based optimization
-        distance = (body.position - camera_pos).magnitude()
-        
-        # Frustum culling
-        if is_in_screen_bounds(body.position, camera_pos, screen_size):
-            visible_bodies.append(body)
-            
-            # Wake up if in view
-            if hasattr(body, 'is_sleeping'):
-                body.is_sleeping = False
-        else:
-            # Put distant bodies to sleep
-            if hasattr(body, 'is_sleeping') and distance > 500:
-                if body.velocity.magnitude() < PERFORMANCE_SETTINGS['velocity_threshold_for_sleep']:
-                    body.is_sleeping = True
-                    sleeping_bodies.append(body)
+    for body in visible_bodies:
+        # Wake up if in view
+        if body_caps(body) & BODY_HAS_SLEEP:
+            body.is_sleeping = False
+    
+    # Put distant bodies to sleep
+    sleep_speed_squared = PERFORMANCE_SETTINGS['velocity_threshold_for_sleep'] ** 2
+    for i in np.flatnonzero(distant):
+        body = bodies[i]
+        if body_caps(body) & BODY_HAS_SLEEP and body.velocity.magnitude_squared() < sleep_speed_squared:
+            body.is_sleeping = True
+            sleeping_bodies.append(body)
     
     return visible_bodies, sleeping_bodies
 